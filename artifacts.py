@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Traces de diagnostic des exécutions en échec (data/artifacts)
+Capture d'écran, DOM et trace Playwright regroupés dans une archive par échec;
+l'écriture et la compression se font hors de la boucle asyncio, la rétention
+est bornée en nombre et en taille totale
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+from colorama import init, Fore, Style
+
+from vote_result import SUCCESS, ALREADY_VOTED, BUSY
+
+init()
+
+DEFAULT_ARTIFACTS_DIR = Path("data/artifacts")
+
+# Trace Playwright: "off", "next_run" (seulement l'exécution qui suit un échec) ou "always"
+TRACE_MODES = ("off", "next_run", "always")
+MAX_BUNDLES = 20
+MAX_TOTAL_MB = 100
+# Pages capturées au plus par échec et délai par capture (secondes)
+MAX_PAGES = 3
+CAPTURE_TIMEOUT = 5
+
+_ARMED_FILE = ".trace_next_run"
+
+
+def is_failure(result):
+    """Faut-il garder des traces de ce résultat ? (None: exécution interrompue)"""
+    return result is None or result.outcome not in (SUCCESS, ALREADY_VOTED, BUSY)
+
+
+class FailureArtifacts:
+    """Captures sur échec et trace Playwright armée après un échec"""
+
+    def __init__(self, directory=DEFAULT_ARTIFACTS_DIR, trace_mode="next_run",
+                 max_bundles=MAX_BUNDLES, max_total_mb=MAX_TOTAL_MB):
+        if trace_mode not in TRACE_MODES:
+            raise ValueError(f"Mode de trace inconnu: {trace_mode} (attendu: {', '.join(TRACE_MODES)})")
+        self.directory = Path(directory)
+        self.trace_mode = trace_mode
+        self.max_bundles = max_bundles
+        self.max_total_mb = max_total_mb
+        self.logger = logging.getLogger(__name__)
+        self.tracing = False
+        self._pending = set()
+
+    @property
+    def armed(self):
+        return (self.directory / _ARMED_FILE).exists()
+
+    def _set_armed(self, armed):
+        path = self.directory / _ARMED_FILE
+        try:
+            if armed:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                path.touch()
+            elif path.exists():
+                path.unlink()
+        except OSError as e:
+            self.logger.warning(f"Impossible de modifier {path}: {e}")
+
+    async def start_trace(self, context):
+        """Démarre la trace Playwright si le mode le demande (après un échec en mode next_run)"""
+        self.tracing = False
+        if self.trace_mode == "always" or (self.trace_mode == "next_run" and self.armed):
+            try:
+                await context.tracing.start(screenshots=True, snapshots=True)
+                self.tracing = True
+                self.logger.info("Trace Playwright activée pour cette exécution")
+            except Exception as e:
+                self.logger.warning(f"Trace Playwright indisponible: {e}")
+
+    async def finish(self, context, result, metrics=None):
+        """Fin d'exécution: capture et archive sur échec, sinon abandon de la trace en cours"""
+        failed = is_failure(result)
+        if not failed:
+            await self._stop_trace(context, None)
+            if self.tracing:
+                self._set_armed(False)
+            self.tracing = False
+            return
+
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        outcome = result.outcome if result is not None else "interrupted"
+        captures = await self._capture_pages(context)
+        trace_path = None
+        if self.tracing:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            trace_path = self.directory / f"{stamp}.trace.tmp"
+            if not await self._stop_trace(context, trace_path):
+                trace_path = None
+        self.tracing = False
+        # Échec sans trace: tracer l'exécution suivante
+        if self.trace_mode == "next_run":
+            self._set_armed(True)
+
+        info = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "outcome": outcome,
+            "pages": [{"url": url} for url, _, _ in captures],
+        }
+        if metrics is not None:
+            info.update({"phases": metrics.phases, "timeout": metrics.timeout, "error": metrics.error})
+
+        # Écriture, compression et rétention dans un thread: l'exécution n'attend pas
+        future = asyncio.get_running_loop().run_in_executor(
+            None, self._write_bundle, f"{stamp}_{outcome}", info, captures, trace_path
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._written)
+
+    async def _capture_pages(self, context):
+        """(URL, PNG, HTML) des pages ouvertes, en mémoire"""
+        captures = []
+        try:
+            pages = [page for page in context.pages if page.url != "about:blank"][-MAX_PAGES:]
+        except Exception:
+            return captures
+        for page in pages:
+            screenshot = html = None
+            try:
+                screenshot = await asyncio.wait_for(page.screenshot(full_page=True), timeout=CAPTURE_TIMEOUT)
+            except Exception as e:
+                self.logger.debug(f"Capture d'écran impossible ({page.url}): {e}")
+            try:
+                html = await asyncio.wait_for(page.content(), timeout=CAPTURE_TIMEOUT)
+            except Exception as e:
+                self.logger.debug(f"DOM indisponible ({page.url}): {e}")
+            captures.append((page.url, screenshot, html))
+        return captures
+
+    async def _stop_trace(self, context, path):
+        if not self.tracing:
+            return False
+        try:
+            if path is None:
+                await asyncio.wait_for(context.tracing.stop(), timeout=CAPTURE_TIMEOUT * 2)
+            else:
+                await asyncio.wait_for(context.tracing.stop(path=str(path)), timeout=CAPTURE_TIMEOUT * 2)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Arrêt de la trace Playwright impossible: {e}")
+            return False
+
+    def _write_bundle(self, name, info, captures, trace_path):
+        """Archive zip d'un échec puis application de la rétention (thread)"""
+        path = self.directory / f"{name}.zip"
+        tmp_path = path.with_suffix(".tmp")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr("info.json", json.dumps(info, ensure_ascii=False, indent=2))
+            for index, (_, screenshot, html) in enumerate(captures, 1):
+                if screenshot:
+                    # Déjà compressé: stocké tel quel
+                    bundle.writestr(f"page{index}.png", screenshot, compress_type=zipfile.ZIP_STORED)
+                if html:
+                    bundle.writestr(f"page{index}.html", html)
+            if trace_path is not None and trace_path.exists():
+                bundle.write(trace_path, "trace.zip", compress_type=zipfile.ZIP_STORED)
+        os.replace(tmp_path, path)
+        if trace_path is not None and trace_path.exists():
+            trace_path.unlink()
+        self.prune()
+        return path
+
+    def _written(self, future):
+        self._pending.discard(future)
+        try:
+            path = future.result()
+            self.logger.info(f"Traces de l'échec enregistrées: {path}")
+        except Exception as e:
+            self.logger.error(f"Impossible d'enregistrer les traces de l'échec: {e}")
+
+    async def drain(self):
+        """Attend la fin des écritures en cours"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def bundles(self):
+        """Archives existantes, de la plus ancienne à la plus récente"""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob("*.zip"), key=lambda path: path.stat().st_mtime)
+
+    def prune(self):
+        """Supprime les archives les plus anciennes au-delà du nombre et de la taille maximale"""
+        bundles = self.bundles()
+        sizes = {path: path.stat().st_size for path in bundles}
+        total = sum(sizes.values())
+        budget = self.max_total_mb * 1024 * 1024
+        removed = 0
+        while bundles and (len(bundles) > self.max_bundles or total > budget):
+            oldest = bundles.pop(0)
+            try:
+                oldest.unlink()
+            except OSError:
+                continue
+            total -= sizes[oldest]
+            removed += 1
+        return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Traces des exécutions en échec")
+    parser.add_argument("--dir", default=str(DEFAULT_ARTIFACTS_DIR), help="dossier des archives")
+    args = parser.parse_args()
+
+    artifacts = FailureArtifacts(args.dir)
+    bundles = artifacts.bundles()
+    if not bundles:
+        print(f"{Fore.YELLOW}Aucune trace d'échec dans {args.dir}{Style.RESET_ALL}")
+        return
+    total = sum(path.stat().st_size for path in bundles)
+    print(f"{Fore.CYAN}🗂️  {len(bundles)} archives, {total / (1024 * 1024):.1f} Mo{Style.RESET_ALL}")
+    for path in bundles:
+        print(f"   {path.name}  ({path.stat().st_size / 1024:.0f} Ko)")
+    if artifacts.armed:
+        print(f"{Fore.YELLOW}Trace Playwright armée pour la prochaine exécution{Style.RESET_ALL}")
+    print("Afficher une trace: unzip -p <archive> trace.zip > trace.zip && playwright show-trace trace.zip")
+
+
+if __name__ == "__main__":
+    main()
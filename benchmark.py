@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Banc de mesure hors ligne du bot de vote Vanadia
+Exécute run_vote_process N fois en mode headless contre le site local (standin_site.py)
+ou en rejouant une capture HAR (har_capture.py),
+et affiche la durée totale, la latence par phase et la mémoire du navigateur
+"""
+
+import argparse
+import asyncio
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from colorama import init, Fore, Style
+
+from har_capture import HarCapture
+from launch_profiles import LAUNCH_PROFILES
+from log_setup import setup_logging
+from metrics import percentile, phase_stats
+from standin_site import MARKUP_VARIANTS, StandInConfig, StandInSite
+
+init()
+
+# Démarrage de `cli.py status` au-delà duquel --startup signale une régression
+STARTUP_BUDGET_MS = 300
+# Charge status sans rien afficher puis liste les modules lourds importés
+_STARTUP_PROBE = (
+    "import io, os, sys, contextlib, cli\n"
+    "with contextlib.redirect_stdout(io.StringIO()):\n"
+    "    cli.main(['status', '--file', os.devnull])\n"
+    "print(','.join(m for m in cli.HEAVY_MODULES if m in sys.modules))"
+)
+
+
+async def run_benchmark(runs, config, human_delay=0, data_dir=None, har_path=None, launch_profile="default"):
+    """Exécute le vote `runs` fois contre le site local (ou une capture HAR) et renvoie la liste des mesures"""
+    from vote_bot import VanadiaVoteBot
+
+    samples = []
+    with (nullcontext() if har_path else StandInSite(config)) as site:
+        for index in range(runs):
+            if har_path:
+                # Rejeu: profil vierge à chaque exécution, comme lors de la capture
+                bot = VanadiaVoteBot(data_dir=Path(data_dir) / f"run{index}")
+                bot.har = HarCapture("replay", har_path)
+            else:
+                bot = VanadiaVoteBot(base_url=site.base_url, data_dir=data_dir)
+            bot.human_delay = human_delay
+            bot.launch_profile = launch_profile
+            bot.preflight = False  # Mesurer le parcours navigateur complet à chaque exécution
+            bot.metrics_path = None  # Ne pas mélanger les mesures du banc avec les vraies exécutions
+            bot.history = None
+            bot.artifacts = None
+
+            start = time.monotonic()
+            result = await bot.run_vote_process(headless=True)
+            wall_ms = int((time.monotonic() - start) * 1000)
+
+            # Pic de RSS et CPU du navigateur: mesurés par le bot pour chaque exécution
+            record = dict(bot.metrics.record or {})
+            record["wall_ms"] = wall_ms
+            samples.append(record)
+            status = f"{Fore.GREEN}✅" if result else f"{Fore.RED}❌"
+            print(f"{status} Exécution {index + 1}/{runs}: {wall_ms} ms, "
+                  f"{record['peak_rss_mb']} Mo, issue {result.outcome}{Style.RESET_ALL}")
+    return samples
+
+
+def print_summary(samples):
+    """Affiche p50/p95 de la durée totale, des phases et du pic de RSS"""
+    if not samples:
+        return
+
+    def row(name, values, unit):
+        print(f"{name:<24}{percentile(values, 0.5):>12.0f}{percentile(values, 0.95):>12.0f}  {unit}")
+
+    print()
+    print(f"{Fore.CYAN}📊 {len(samples)} exécutions{Style.RESET_ALL}")
+    print(f"{Fore.WHITE}{'Mesure':<24}{'p50':>12}{'p95':>12}{Style.RESET_ALL}")
+    row("durée totale", [s["wall_ms"] for s in samples], "ms")
+    for phase, stats in phase_stats(samples).items():
+        if phase != "total":
+            print(f"{phase:<24}{stats['p50']:>12.0f}{stats['p95']:>12.0f}  ms")
+    row("pic RSS navigateur", [s["peak_rss_mb"] for s in samples], "Mo")
+    row("CPU navigateur", [s["cpu_seconds"] for s in samples], "s")
+
+
+def _time_python(code, runs):
+    """Durées (ms) de `python -c code` et sortie de la dernière exécution"""
+    timings, output = [], ""
+    for _ in range(runs):
+        start = time.monotonic()
+        completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                   cwd=Path(__file__).resolve().parent)
+        timings.append((time.monotonic() - start) * 1000)
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+        output = completed.stdout.strip()
+    return timings, output
+
+
+def check_startup(runs=5, budget_ms=STARTUP_BUDGET_MS):
+    """Mesure le démarrage de la CLI (commande status); False en cas de régression"""
+    timings, heavy = _time_python(_STARTUP_PROBE, runs)
+    bot_timings, _ = _time_python("import vote_bot", runs)
+    median = percentile(timings, 0.5)
+
+    print(f"{Fore.CYAN}🚀 Démarrage sur {runs} essais (p50){Style.RESET_ALL}")
+    print(f"{'cli.py status':<24}{median:>12.0f}  ms (budget {budget_ms} ms)")
+    print(f"{'import vote_bot':<24}{percentile(bot_timings, 0.5):>12.0f}  ms (référence)")
+
+    ok = True
+    if heavy:
+        print(f"{Fore.RED}❌ Modules lourds chargés par status: {heavy}{Style.RESET_ALL}")
+        ok = False
+    if median > budget_ms:
+        print(f"{Fore.RED}❌ Démarrage trop lent: {median:.0f} ms > {budget_ms} ms{Style.RESET_ALL}")
+        ok = False
+    if ok:
+        print(f"{Fore.GREEN}✅ Démarrage dans le budget{Style.RESET_ALL}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc de mesure hors ligne du bot de vote")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="nombre d'exécutions")
+    parser.add_argument("--variant", choices=sorted(MARKUP_VARIANTS), default="classic")
+    parser.add_argument("--latency", type=int, default=0, help="latence ajoutée par requête (ms)")
+    parser.add_argument("--jitter", type=int, default=0, help="latence aléatoire supplémentaire (ms)")
+    parser.add_argument("--no-captcha", action="store_true", help="pas de captcha sur serveur-prive")
+    parser.add_argument("--padding", type=int, default=0, help="taille de remplissage des pages (Ko)")
+    parser.add_argument("--har", help="rejouer cette capture HAR au lieu du site local")
+    parser.add_argument("--launch-profile", choices=sorted(LAUNCH_PROFILES), default="default",
+                        help="profil de lancement de Chromium à mesurer")
+    parser.add_argument("--startup", action="store_true",
+                        help="mesurer le démarrage de la CLI et échouer en cas de régression")
+    parser.add_argument("--human-delay", type=float, default=0, help="simulation humaine à la connexion (s)")
+    args = parser.parse_args()
+
+    if args.startup:
+        sys.exit(0 if check_startup(args.runs) else 1)
+
+    setup_logging(level=logging.WARNING)
+
+    config = StandInConfig(args.variant, args.latency, args.jitter,
+                           captcha=not args.no_captcha, padding_kb=args.padding)
+    # Profil et cache jetables: le banc ne touche pas à data/
+    data_dir = Path(tempfile.mkdtemp(prefix="vanadia-bench-"))
+    try:
+        samples = asyncio.run(run_benchmark(args.runs, config, args.human_delay, data_dir, args.har,
+                                              args.launch_profile))
+        print_summary(samples)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
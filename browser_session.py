@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Navigateur longue durée pour le bot de vote Vanadia (mode démon)
+Garde un pilote Playwright et un Chromium ouverts entre les votes planifiés
+"""
+
+import asyncio
+import logging
+import time
+
+from playwright.async_api import async_playwright
+
+from proc_stats import descendants, kill_processes
+
+
+class BrowserSession:
+    """Pilote Playwright + contexte persistant réutilisés d'une exécution à l'autre"""
+
+    def __init__(self, bot, headless=False, health_timeout=5.0):
+        self.bot = bot
+        self.headless = headless
+        self.health_timeout = health_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self.playwright = None
+        self.context = None
+        self.keepalive_page = None  # Page vierge gardée ouverte entre les votes
+        self.router = None  # Filtrage des requêtes installé sur ce contexte
+        self.launches = 0
+        self.browser_pids = []  # Processus Chromium, terminés de force s'ils survivent à la fermeture
+        self._closed = True
+
+    async def start(self):
+        """Démarre le pilote Playwright et lance le navigateur (ProfileBusy si le profil est pris)"""
+        start = time.monotonic()
+        # Verrou gardé tant que le navigateur tourne
+        self.bot.profile_lock.acquire()
+        try:
+            self.playwright = await async_playwright().start()
+            existing_pids = set(descendants())
+            try:
+                self.context = await self.bot.launch_context(self.playwright, headless=self.headless)
+            finally:
+                self.browser_pids = [pid for pid in descendants() if pid not in existing_pids]
+            await self.bot.prepare_context(self.context)
+            self.router = self.bot.router
+            self._closed = False
+            self.context.on("close", lambda _: self._mark_closed())
+
+            self.keepalive_page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+        except BaseException:
+            # Lancement échoué ou annulé: pilote arrêté, Chromium terminé et verrou libéré
+            await self._teardown()
+            raise
+        self.launches += 1
+        self.logger.info(
+            f"Navigateur démarré en {int((time.monotonic() - start) * 1000)} ms "
+            f"(lancement n°{self.launches})"
+        )
+
+    def _mark_closed(self):
+        self._closed = True
+
+    async def is_healthy(self):
+        """Vérifie que le navigateur répond encore"""
+        if self.context is None or self._closed:
+            return False
+        try:
+            if self.keepalive_page.is_closed():
+                self.keepalive_page = await self.context.new_page()
+            await asyncio.wait_for(self.keepalive_page.evaluate("1"), timeout=self.health_timeout)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Navigateur ne répond pas: {e}")
+            return False
+
+    async def ensure(self):
+        """Relance le navigateur s'il n'est pas démarré ou s'il a planté"""
+        if await self.is_healthy():
+            return
+        if self.context is not None:
+            self.logger.warning("Navigateur indisponible, relance...")
+        await self._teardown()
+        await self.start()
+
+    async def new_page(self):
+        """Ouvre une page neuve pour un vote, en relançant le navigateur si besoin"""
+        await self.ensure()
+        return await self.context.new_page()
+
+    async def release_pages(self):
+        """Ferme toutes les pages d'une exécution sauf la page de maintien"""
+        if self.context is None or self._closed:
+            return
+        for page in list(self.context.pages):
+            if page is self.keepalive_page:
+                continue
+            try:
+                await page.close()
+            except Exception as e:
+                self.logger.debug(f"Erreur fermeture de page: {e}")
+
+    async def _teardown(self):
+        """Ferme le contexte et arrête le pilote, en ignorant les erreurs d'un navigateur déjà mort"""
+        if self.context is not None:
+            try:
+                await asyncio.wait_for(self.context.close(), timeout=10)
+            except Exception as e:
+                self.logger.debug(f"Erreur fermeture du contexte: {e}")
+        if self.playwright is not None:
+            try:
+                await asyncio.wait_for(self.playwright.stop(), timeout=10)
+            except Exception as e:
+                self.logger.debug(f"Erreur arrêt de Playwright: {e}")
+        killed = await kill_processes(self.browser_pids)
+        if killed:
+            self.logger.warning(f"{killed} processus du navigateur terminés de force")
+        self.browser_pids = []
+        self.bot.profile_lock.release()
+        self.context = None
+        self.playwright = None
+        self.keepalive_page = None
+        self.router = None
+        self._closed = True
+
+    async def discard(self):
+        """Abandonne un navigateur bloqué; il sera relancé au prochain vote"""
+        if self.context is None and self.playwright is None:
+            return
+        self.logger.warning("Navigateur abandonné après une exécution bloquée")
+        await self._teardown()
+
+    async def close(self):
+        """Arrête définitivement le navigateur"""
+        await self._teardown()
+        self.logger.info("Navigateur arrêté")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Point d'entrée unique du bot de vote Vanadia
+vote, schedule, status, report, maintain: Playwright et plyer ne sont chargés que par les commandes qui votent
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from launch_profiles import LAUNCH_PROFILES
+from metrics import DEFAULT_METRICS_PATH
+from profile_maintenance import DEFAULT_BUDGET_MB
+
+# Modules lourds qui ne doivent pas être importés par status/report (vérifié par benchmark.py --startup)
+HEAVY_MODULES = ("playwright", "plyer")
+
+
+def cmd_vote(args):
+    import asyncio
+    from vote_bot import VanadiaVoteBot
+
+    bot = VanadiaVoteBot(data_dir=args.data_dir)
+    bot.launch_profile = args.launch_profile
+    result = asyncio.run(bot.main(headless=args.headless))
+    return 0 if result else 1
+
+
+def cmd_schedule(args):
+    from scheduler import VoteScheduler
+
+    scheduler = VoteScheduler(daemon=args.daemon, missed_run_policy=args.missed_runs,
+                              launch_profile=args.launch_profile, status_port=args.status_port,
+                              data_dir=args.data_dir)
+    scheduler.start_scheduler()
+    return 0
+
+
+def cmd_status(args):
+    from colorama import Fore, Style
+    from metrics import load_records
+    from profile_lock import ProfileLock
+    from proc_stats import is_alive
+
+    lock = ProfileLock(Path(args.data_dir) / "browser_profile")
+    runner, holder = lock.runner(), lock.holder()
+    if runner and is_alive(runner):
+        print(f"{Fore.YELLOW}🔒 Vote en cours (PID {runner}){Style.RESET_ALL}")
+    elif holder and is_alive(holder):
+        # Planificateur en mode démon: navigateur ouvert entre deux votes
+        print(f"{Fore.GREEN}💤 Aucun vote en cours (navigateur du planificateur ouvert, PID {holder}){Style.RESET_ALL}")
+    else:
+        print(f"{Fore.GREEN}💤 Aucun vote en cours{Style.RESET_ALL}")
+
+    records = load_records(args.file, last=10)
+    if not records:
+        print(f"{Fore.YELLOW}Aucune exécution enregistrée dans {args.file}{Style.RESET_ALL}")
+        return 0
+
+    last = records[-1]
+    started = datetime.fromisoformat(last["started_at"])
+    print(f"{Fore.CYAN}Dernière exécution: {started.strftime('%d/%m %H:%M:%S')} - {last.get('outcome')} "
+          f"en {last.get('total_ms', 0) / 1000:.1f}s{Style.RESET_ALL}")
+    if last.get("timeout"):
+        print(f"{Fore.YELLOW}   Budget dépassé: {last['timeout'].get('phase')}{Style.RESET_ALL}")
+    if last.get("cooldown_s"):
+        ready = started + timedelta(milliseconds=last.get("total_ms", 0), seconds=last["cooldown_s"])
+        print(f"{Fore.BLUE}⏰ Prochain vote possible vers {ready.strftime('%H:%M')}{Style.RESET_ALL}")
+
+    successes = sum(1 for record in records if record.get("success"))
+    print(f"   {successes}/{len(records)} réussites sur les dernières exécutions")
+    return 0
+
+
+def cmd_report(args):
+    if args.jsonl:
+        from metrics import print_report
+        print_report(args.file, args.last)
+        return 0
+
+    from history import parse_window, print_report
+    try:
+        since, until = parse_window(args.since), parse_window(args.until)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    print_report(Path(args.data_dir) / "history.db", since, until)
+    return 0
+
+
+def cmd_maintain(args):
+    import profile_maintenance
+
+    profile_maintenance.run(Path(args.data_dir) / "browser_profile", args.budget, args.measure, args.history)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="vanadia", description="Bot de vote automatique pour Vanadia.fr")
+    parser.add_argument("--data-dir", default="data", help="dossier du profil navigateur et du cache")
+    # Aussi accepté après la commande (vanadia vote --data-dir ..., vanadia-vote --data-dir ...)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data-dir", default=argparse.SUPPRESS, help="dossier du profil navigateur et du cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    vote = sub.add_parser("vote", parents=[common], help="voter maintenant")
+    vote.add_argument("--headless", action="store_true", help="navigateur invisible")
+    vote.add_argument("--launch-profile", choices=sorted(LAUNCH_PROFILES), default="default",
+                      help="profil de lancement de Chromium (lean: mémoire réduite)")
+    vote.set_defaults(handler=cmd_vote)
+
+    schedule = sub.add_parser("schedule", parents=[common], help="voter toutes les 1h30")
+    schedule.add_argument("--daemon", action="store_true",
+                          help="garder le navigateur ouvert entre les votes planifiés")
+    schedule.add_argument("--missed-runs", choices=["run_once", "skip"], default="run_once",
+                          help="votes manqués pendant une mise en veille: voter au réveil ou attendre le prochain créneau")
+    schedule.add_argument("--launch-profile", choices=sorted(LAUNCH_PROFILES), default="default",
+                          help="profil de lancement de Chromium (lean: mémoire réduite)")
+    schedule.add_argument("--status-port", type=int, metavar="PORT",
+                          help="exposer /metrics (Prometheus) et /status (JSON) sur 127.0.0.1:PORT")
+    schedule.set_defaults(handler=cmd_schedule)
+
+    status = sub.add_parser("status", parents=[common], help="vote en cours, dernière exécution, prochain vote")
+    status.add_argument("--file", default=str(DEFAULT_METRICS_PATH), help="fichier JSONL des mesures")
+    status.set_defaults(handler=cmd_status)
+
+    report = sub.add_parser("report", parents=[common], help="réussite, captchas et durées p50/p95 sur une fenêtre")
+    report.add_argument("--since", default="7d", help="début de la fenêtre (ex: 24h, 7d, 2024-05-01, all)")
+    report.add_argument("--until", help="fin de la fenêtre (même format)")
+    report.add_argument("--jsonl", action="store_true",
+                        help="rapport détaillé depuis logs/metrics.jsonl (mémoire par profil de lancement)")
+    report.add_argument("--last", type=int, default=50, help="avec --jsonl: nombre d'exécutions à analyser")
+    report.add_argument("--file", default=str(DEFAULT_METRICS_PATH), help="avec --jsonl: fichier JSONL des mesures")
+    report.set_defaults(handler=cmd_report)
+
+    maintain = sub.add_parser("maintain", parents=[common], help="compacter le profil navigateur")
+    maintain.add_argument("--budget", type=int, default=DEFAULT_BUDGET_MB, help="taille maximale du profil (Mo)")
+    maintain.add_argument("--measure", action="store_true", help="chronométrer le lancement avant/après")
+    maintain.add_argument("--history", action="store_true", help="gain observé sur les exécutions réelles")
+    maintain.set_defaults(handler=cmd_maintain)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+def vote_main():
+    """Point d'entrée vanadia-vote (équivalent à: vanadia vote)"""
+    return main(["vote"] + sys.argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Extraction du délai avant le prochain vote affiché par le site
+Ex: "Vous pourrez voter à nouveau dans 1h 23min", "Prochain vote dans 1h30",
+"Prochain vote dans 00:45:12"; un compte à rebours dédié se lit sans mot-clé ("59:59")
+"""
+
+import re
+from datetime import datetime, timedelta
+
+# Mots qui introduisent un temps restant
+_KEYWORDS = r"(?:dans|encore|restant(?:e|s|es)?|attendre|prochain vote|reviens|revenez)"
+_AFTER_KEYWORD = _KEYWORDS + r"[^0-9]{0,40}?"
+
+# "01:23:45", "59:59" (pas au milieu d'un nombre ou d'une heure plus longue)
+_CLOCK = r"(?<![\d:])(\d{1,2}):(\d{2})(?::(\d{2}))?(?![\d:])"
+
+# "1h 23min", "1h30", "1 h 30", "45 min", "90s": unité non suivie d'une lettre
+_END = r"(?![a-zà-ÿ])"
+_HOURS = r"(\d+)\s*h(?:eures?)?" + _END
+_MINUTES = r"(\d+)\s*(?:minutes?|mins?|mn|m)" + _END
+_SECONDS = r"(\d+)\s*(?:secondes?|secs?|s)" + _END
+_SEP = r"\s*(?:et\s*|,\s*)?"
+_DURATION = (
+    # Heures, puis minutes avec ou sans unité ("1h30"), puis secondes
+    rf"(?:{_HOURS}{_SEP}(?:{_MINUTES}|(\d{{1,2}})(?![\d:]))?{_SEP}(?:{_SECONDS})?"
+    rf"|{_MINUTES}{_SEP}(?:{_SECONDS})?"
+    rf"|{_SECONDS})"
+)
+
+_CLOCK_RE = re.compile(_AFTER_KEYWORD + _CLOCK)
+_UNITS_RE = re.compile(_AFTER_KEYWORD + _DURATION)
+_BARE_CLOCK_RE = re.compile(_CLOCK)
+_BARE_UNITS_RE = re.compile(_DURATION)
+
+# "Vous pourrez voter à 14h35" / "à partir de 14:35"
+_ABSOLUTE_RE = re.compile(r"voter[^0-9]{0,40}?\bà(?: partir de)?\s*(\d{1,2})\s*[h:]\s*(\d{2})")
+
+# Formulations propres au délai de vote (texte hors des compteurs dédiés)
+_VOTE_PHRASE_RE = re.compile(
+    r"voter à nouveau|prochain vote|(?:pourrez|pouvez|pourras|peux) (?:re)?voter|avant de (?:re)?voter|revoter"
+)
+
+
+def _from_clock(match, countdown):
+    first, second, third = match.groups()
+    first, second = int(first), int(second)
+    if third is not None:
+        return timedelta(hours=first, minutes=second, seconds=int(third))
+    # Deux champs: mm:ss pour un compte à rebours ou si le premier ne peut pas être une heure
+    if countdown or first >= 24:
+        return timedelta(minutes=first, seconds=second)
+    # "dans 01:23" se lit heures:minutes
+    return timedelta(hours=first, minutes=second)
+
+
+def _from_units(match):
+    hours, minutes, bare_minutes, seconds, minutes_only, seconds_after_minutes, seconds_only = match.groups()
+    return (int(hours or 0) * 3600
+            + int(minutes or bare_minutes or minutes_only or 0) * 60
+            + int(seconds or seconds_after_minutes or seconds_only or 0))
+
+
+def parse_cooldown(text, now=None, countdown=False):
+    """
+    Renvoie le temps restant avant le prochain vote (timedelta), ou None s'il n'est pas affiché.
+    countdown=True: texte d'un compte à rebours dédié, lu sans mot-clé ("01:23:45", "45 min")
+    """
+    if not text:
+        return None
+    text = " ".join(text.lower().split())
+
+    match = _ABSOLUTE_RE.search(text)
+    if match:
+        now = now or datetime.now()
+        hours, minutes = int(match.group(1)), int(match.group(2))
+        if hours < 24 and minutes < 60:
+            target = now.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+            if target <= now:
+                target += timedelta(days=1)
+            return target - now
+
+    clock_re, units_re = (_BARE_CLOCK_RE, _BARE_UNITS_RE) if countdown else (_CLOCK_RE, _UNITS_RE)
+    match = clock_re.search(text)
+    if match:
+        return _from_clock(match, countdown)
+
+    match = units_re.search(text)
+    if match:
+        seconds = _from_units(match)
+        if seconds > 0:
+            return timedelta(seconds=seconds)
+
+    return None
+
+
+def parse_vote_cooldown(text, now=None):
+    """Comme parse_cooldown, seulement si le texte parle explicitement du prochain vote"""
+    if not text or not _VOTE_PHRASE_RE.search(" ".join(text.lower().split())):
+        return None
+    return parse_cooldown(text, now)
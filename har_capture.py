@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Enregistrement et rejeu HAR du trafic du bot de vote Vanadia
+Une exécution réelle est capturée une fois, puis rejouée depuis le disque sans réseau
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from colorama import init, Fore, Style
+
+init()
+
+DEFAULT_HAR_PATH = Path("data/captures/vanadia.har")
+
+HAR_MODES = ("record", "replay")
+
+
+class HarCapture:
+    """Branche un fichier HAR sur un contexte Playwright, en enregistrement ou en rejeu"""
+
+    def __init__(self, mode, path=DEFAULT_HAR_PATH):
+        if mode not in HAR_MODES:
+            raise ValueError(f"Mode HAR inconnu: {mode} (attendu: {', '.join(HAR_MODES)})")
+        self.mode = mode
+        self.path = Path(path)
+        if mode == "replay" and not self.path.exists():
+            raise FileNotFoundError(f"Capture HAR introuvable: {self.path}")
+
+    async def install(self, context):
+        """Active l'enregistrement ou le rejeu sur toutes les pages du contexte"""
+        if self.mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Le fichier est écrit à la fermeture du contexte, contenus inclus
+            await context.route_from_har(self.path, update=True, update_content="embed")
+        else:
+            # Requête absente de la capture: échec immédiat plutôt qu'un accès réseau
+            await context.route_from_har(self.path, not_found="abort")
+
+    def describe(self):
+        return f"HAR {'enregistrement' if self.mode == 'record' else 'rejeu'} ({self.path})"
+
+
+def har_entries(path=DEFAULT_HAR_PATH):
+    """(méthode, statut, taille, URL) de chaque entrée d'un fichier HAR"""
+    with open(path, encoding="utf-8") as f:
+        log = json.load(f).get("log", {})
+    entries = []
+    for entry in log.get("entries", []):
+        request = entry.get("request", {})
+        response = entry.get("response", {})
+        size = response.get("content", {}).get("size") or max(response.get("bodySize", 0), 0)
+        entries.append((request.get("method"), response.get("status"), size, request.get("url")))
+    return entries
+
+
+def print_entries(path=DEFAULT_HAR_PATH):
+    """Affiche le contenu d'une capture"""
+    try:
+        entries = har_entries(path)
+    except FileNotFoundError:
+        print(f"{Fore.YELLOW}Aucune capture dans {path}{Style.RESET_ALL}")
+        return
+
+    total = sum(size for _, _, size, _ in entries)
+    print(f"{Fore.CYAN}📼 {len(entries)} requêtes, {total / 1024:.0f} Ko ({path}){Style.RESET_ALL}")
+    for method, status, size, url in entries:
+        print(f"   {method:<6}{status!s:>5}{size / 1024:>9.1f} Ko  {url}")
+
+
+async def record(path=DEFAULT_HAR_PATH, headless=False):
+    """Exécute un vote réel en enregistrant tout le trafic"""
+    from vote_bot import VanadiaVoteBot
+
+    # Profil vierge pour que la connexion fasse partie de la capture
+    data_dir = Path(tempfile.mkdtemp(prefix="vanadia-record-"))
+    try:
+        bot = VanadiaVoteBot(data_dir=data_dir)
+        bot.har = HarCapture("record", path)
+        result = await bot.main(headless=headless)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    print(f"{Fore.GREEN}📼 Capture enregistrée dans {path}{Style.RESET_ALL}")
+    return result
+
+
+async def replay(path=DEFAULT_HAR_PATH, runs=1):
+    """Rejoue la capture avec un profil jetable (aucun accès réseau)"""
+    from vote_bot import VanadiaVoteBot
+
+    results = []
+    for _ in range(runs):
+        # Profil vierge à chaque rejeu: la séquence de requêtes doit être celle de la capture
+        data_dir = Path(tempfile.mkdtemp(prefix="vanadia-replay-"))
+        try:
+            bot = VanadiaVoteBot(data_dir=data_dir)
+            bot.har = HarCapture("replay", path)
+            bot.human_delay = 0
+            bot.metrics_path = None
+            results.append(await bot.main(headless=True))
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture et rejeu HAR du bot de vote")
+    parser.add_argument("command", choices=["record", "replay", "show"])
+    parser.add_argument("--file", default=str(DEFAULT_HAR_PATH), help="fichier HAR")
+    parser.add_argument("--headless", action="store_true", help="enregistrer en mode invisible")
+    parser.add_argument("-n", "--runs", type=int, default=1, help="nombre de rejeux")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(record(args.file, args.headless))
+    elif args.command == "replay":
+        asyncio.run(replay(args.file, args.runs))
+    else:
+        print_entries(args.file)
+
+
+if __name__ == "__main__":
+    main()
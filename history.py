@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Historique des exécutions du bot de vote Vanadia (SQLite, data/history.db)
+Une ligne par exécution, indexée par date et par issue: rapports sur une fenêtre
+quelconque et reprise de l'état du planificateur au redémarrage
+"""
+
+import argparse
+import json
+import logging
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from colorama import init, Fore, Style
+
+from metrics import percentile, retry_stats
+
+init()
+
+DEFAULT_HISTORY_PATH = Path("data/history.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    outcome TEXT,
+    success INTEGER NOT NULL,
+    total_ms INTEGER,
+    cooldown_s INTEGER,
+    captcha INTEGER,
+    error TEXT,
+    timeout_phase TEXT,
+    launch_profile TEXT,
+    preflight TEXT,
+    peak_rss_mb REAL,
+    phases TEXT,
+    attempts TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+CREATE INDEX IF NOT EXISTS runs_outcome ON runs (outcome, started_at);
+"""
+
+_COLUMNS = ("started_at", "ended_at", "outcome", "success", "total_ms", "cooldown_s", "captcha",
+            "error", "timeout_phase", "launch_profile", "preflight", "peak_rss_mb", "phases", "attempts")
+
+# Colonnes ajoutées après la création de la table: (nom, type)
+_MIGRATIONS = [("attempts", "TEXT")]
+
+_DURATION = re.compile(r"^(\d+)\s*([mhdw])$")
+_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_window(value, now=None):
+    """Borne de fenêtre: durée relative ("90m", "24h", "7d", "2w"), date ISO ou "all" (None)"""
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if value == "all":
+        return None
+    match = _DURATION.match(value)
+    if match:
+        return (now or datetime.now()) - timedelta(**{_UNITS[match.group(2)]: int(match.group(1))})
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Fenêtre invalide: {value} (ex: 24h, 7d, 2024-05-01, all)")
+
+
+def _iso(moment):
+    return moment.isoformat(timespec="seconds") if moment else None
+
+
+class RunHistory:
+    """Historique SQLite des exécutions; une connexion courte par opération"""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+        self._ready = False
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        if not self._ready:
+            conn.executescript(_SCHEMA)
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(runs)")}
+            for column, column_type in _MIGRATIONS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE runs ADD COLUMN {column} {column_type}")
+            self._ready = True
+        return conn
+
+    def add(self, record):
+        """Ajoute un enregistrement de RunMetrics.finish(); n'interrompt jamais l'exécution"""
+        row = {
+            "started_at": record.get("started_at"),
+            "ended_at": record.get("ended_at"),
+            "outcome": record.get("outcome"),
+            "success": int(bool(record.get("success"))),
+            "total_ms": record.get("total_ms"),
+            "cooldown_s": record.get("cooldown_s"),
+            "captcha": None if record.get("captcha") is None else int(record["captcha"]),
+            "error": record.get("error"),
+            "timeout_phase": (record.get("timeout") or {}).get("phase"),
+            "launch_profile": record.get("launch_profile"),
+            "preflight": record.get("preflight"),
+            "peak_rss_mb": record.get("peak_rss_mb"),
+            "phases": json.dumps(record.get("phases") or {}),
+            "attempts": json.dumps(record.get("attempts") or {}),
+        }
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(f"INSERT INTO runs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                             [row[column] for column in _COLUMNS])
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"Impossible d'écrire l'historique: {e}")
+
+    def runs(self, since=None, until=None, outcome=None):
+        """Exécutions de la fenêtre [since, until[, de la plus ancienne à la plus récente"""
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(_iso(since))
+        if until is not None:
+            clauses.append("started_at < ?")
+            params.append(_iso(until))
+        if outcome is not None:
+            clauses.append("outcome = ?")
+            params.append(outcome)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT * FROM runs {where} ORDER BY started_at", params).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def last_run(self, success=None):
+        """Exécution la plus récente (réussie seulement si success=True), None si aucune"""
+        where = "WHERE success = 1" if success else ""
+        with closing(self._connect()) as conn:
+            row = conn.execute(f"SELECT * FROM runs {where} ORDER BY started_at DESC LIMIT 1").fetchone()
+        return self._decode(row) if row else None
+
+    @staticmethod
+    def _decode(row):
+        run = dict(row)
+        run["phases"] = json.loads(run["phases"] or "{}")
+        run["attempts"] = json.loads(run["attempts"] or "{}")
+        run["success"] = bool(run["success"])
+        if run["captcha"] is not None:
+            run["captcha"] = bool(run["captcha"])
+        return run
+
+
+def summarize(runs):
+    """Taux de réussite, issues, fréquence des captchas et p50/p95 par phase"""
+    outcomes, errors, durations = {}, {}, {}
+    for run in runs:
+        outcomes[run["outcome"]] = outcomes.get(run["outcome"], 0) + 1
+        if run["error"]:
+            errors[run["error"]] = errors.get(run["error"], 0) + 1
+        for phase, ms in run["phases"].items():
+            durations.setdefault(phase, []).append(ms)
+        durations.setdefault("total", []).append(run["total_ms"] or 0)
+
+    # Les captchas ne comptent que parmi les exécutions arrivées jusqu'à serveur-prive.net
+    reached = [run for run in runs if run["captcha"] is not None]
+    rss = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"]]
+    return {
+        "runs": len(runs),
+        "success_rate": sum(run["success"] for run in runs) / len(runs) if runs else None,
+        "outcomes": outcomes,
+        "errors": errors,
+        "captcha_rate": sum(run["captcha"] for run in reached) / len(reached) if reached else None,
+        "captcha_runs": len(reached),
+        "rss_p50": percentile(rss, 0.5),
+        "retries": retry_stats(runs),
+        # Exécutions réussies malgré au moins une reprise d'étape
+        "recovered": sum(1 for run in runs if run["success"] and any(n > 1 for n in run["attempts"].values())),
+        "phases": {
+            phase: {"count": len(values), "p50": percentile(values, 0.5), "p95": percentile(values, 0.95)}
+            for phase, values in durations.items()
+        },
+    }
+
+
+def print_report(path=DEFAULT_HISTORY_PATH, since=None, until=None):
+    """Affiche le rapport de la fenêtre depuis l'historique SQLite"""
+    runs = RunHistory(path).runs(since, until)
+    window = f"depuis {since.strftime('%d/%m/%Y %H:%M')}" if since else "depuis le début"
+    if until:
+        window += f" jusqu'au {until.strftime('%d/%m/%Y %H:%M')}"
+    if not runs:
+        print(f"{Fore.YELLOW}Aucune exécution {window} dans {path}{Style.RESET_ALL}")
+        return
+
+    stats = summarize(runs)
+    print(f"{Fore.CYAN}📊 {stats['runs']} exécutions {window}{Style.RESET_ALL}")
+    print(f"   Réussite: {stats['success_rate']:.0%}  ("
+          + ", ".join(f"{outcome}: {count}" for outcome, count in sorted(stats["outcomes"].items(), key=str)) + ")")
+    if stats["captcha_rate"] is not None:
+        print(f"   Captcha: {stats['captcha_rate']:.0%} des {stats['captcha_runs']} passages sur serveur-prive.net")
+    if stats["errors"]:
+        print(f"{Fore.YELLOW}   Erreurs: " + ", ".join(
+            f"{error}: {count}" for error, count in sorted(stats["errors"].items())) + Style.RESET_ALL)
+    if stats["retries"]:
+        print("   Reprises d'étape: " + ", ".join(
+            f"{phase}: {count}" for phase, count in sorted(stats["retries"].items()))
+            + f" ({stats['recovered']} votes réussis grâce à une reprise)")
+    if stats["rss_p50"] is not None:
+        print(f"   Mémoire du navigateur (p50): {stats['rss_p50']:.0f} Mo")
+    print()
+    print(f"{Fore.WHITE}{'Phase':<24}{'n':>5}{'p50 (ms)':>12}{'p95 (ms)':>12}{Style.RESET_ALL}")
+    for phase, phase_stats in sorted(stats["phases"].items(), key=lambda item: item[0] == "total"):
+        print(f"{phase:<24}{phase_stats['count']:>5}{phase_stats['p50']:>12.0f}{phase_stats['p95']:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapport de l'historique des votes")
+    parser.add_argument("--since", default="7d", help="début de la fenêtre (ex: 24h, 7d, 2024-05-01, all)")
+    parser.add_argument("--until", help="fin de la fenêtre (même format)")
+    parser.add_argument("--file", default=str(DEFAULT_HISTORY_PATH), help="base SQLite de l'historique")
+    args = parser.parse_args()
+    try:
+        since, until = parse_window(args.since), parse_window(args.until)
+    except ValueError as e:
+        parser.error(str(e))
+    print_report(args.file, since, until)
+
+
+if __name__ == "__main__":
+    main()
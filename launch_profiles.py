@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Profils de lancement de Chromium pour le bot de vote Vanadia
+Arguments et taille de fenêtre; "lean" vise une machine modeste toujours allumée
+"""
+
+# User-Agent du navigateur, repris par les requêtes HTTP hors navigateur (preflight.py)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
+
+_BASE_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-setuid-sandbox',
+]
+LAUNCH_PROFILES = {
+    "default": {
+        "args": _BASE_ARGS,
+        "viewport": {'width': 1280, 'height': 720},
+    },
+    # Machine modeste toujours allumée: moins de processus, pas de GPU ni d'activité de fond
+    "lean": {
+        "args": _BASE_ARGS + [
+            '--renderer-process-limit=1',
+            '--disable-gpu',
+            '--disable-software-rasterizer',
+            '--disable-background-networking',
+            '--disable-component-update',
+            '--disable-default-apps',
+            '--disable-extensions',
+            '--disable-sync',
+            '--no-first-run',
+            '--disk-cache-size=8388608',
+            '--media-cache-size=1',
+            '--js-flags=--max-old-space-size=256',
+        ],
+        "viewport": {'width': 1024, 'height': 600},
+    },
+}
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Moteur de localisation "premier trouvé" pour le bot de vote Vanadia
+Attend tous les sélecteurs candidats en parallèle au lieu de les sonder un par un
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def _wait_candidate(page, selector, timeout, state):
+    """Attend un sélecteur candidat, renvoie None s'il n'apparaît pas"""
+    try:
+        return await page.wait_for_selector(selector, timeout=timeout, state=state)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        return None
+
+
+async def _preferred_match(page, selectors, winner_index, state):
+    """Privilégie un candidat mieux classé s'il est déjà présent sur la page"""
+    for selector in selectors[:winner_index]:
+        try:
+            element = await page.query_selector(selector)
+            if element and (state != "visible" or await element.is_visible()):
+                return element, selector
+        except Exception:
+            continue
+    return None
+
+
+async def first_match(page, selectors, timeout=5000, state="visible"):
+    """
+    Attend simultanément tous les sélecteurs et renvoie (élément, sélecteur)
+    du premier qui correspond, ou (None, None) si aucun n'apparaît avant le timeout.
+
+    Si plusieurs candidats sont présents en même temps, l'ordre de la liste
+    est respecté comme avec l'ancien parcours séquentiel.
+    """
+    selectors = list(selectors)
+    if not selectors:
+        return None, None
+
+    tasks = {
+        asyncio.ensure_future(_wait_candidate(page, selector, timeout, state)): index
+        for index, selector in enumerate(selectors)
+    }
+    pending = set(tasks)
+    winner = None
+
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Parmi les tâches terminées ensemble, garder la mieux classée
+            for task in sorted(done, key=tasks.get):
+                element = task.result()
+                if element:
+                    winner = (element, tasks[task])
+                    break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    if winner is None:
+        logger.debug(f"Aucun sélecteur trouvé parmi {len(selectors)} candidats")
+        return None, None
+
+    element, index = winner
+    preferred = await _preferred_match(page, selectors, index, state)
+    if preferred:
+        return preferred
+
+    return element, selectors[index]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Configuration des logs du bot de vote Vanadia
+Les écritures passent par une file: la boucle asyncio ne fait jamais d'E/S disque,
+un thread dédié écrit dans logs/vote_bot.log avec rotation par taille et par âge.
+Un seul processus à la fois fait tourner ce fichier (verrou logs/vote_bot.lock); les
+autres (vote manuel pendant le planificateur...) écrivent dans logs/vote_bot.<pid>.log
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from pathlib import Path
+
+from profile_lock import ProfileLock, ProfileBusy
+
+LOG_DIR = Path("logs")
+LOG_FILE = "vote_bot.log"
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Rotation: 5 Mo par fichier, 5 archives, rien de plus vieux que 30 jours
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+MAX_AGE_DAYS = 30
+
+_listener = None
+_log_lock = None
+
+
+def prune_logs(log_dir=LOG_DIR, max_age_days=MAX_AGE_DAYS):
+    """Supprime les journaux (archives de rotation et anciens fichiers datés) plus vieux que max_age_days"""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in Path(log_dir).glob("vote_bot*.log*"):
+        if path.name == LOG_FILE:
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+class _PruningFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotation par taille, suivie de la suppression des journaux trop anciens"""
+
+    def __init__(self, filename, max_age_days=MAX_AGE_DAYS, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.max_age_days = max_age_days
+
+    def doRollover(self):
+        super().doRollover()
+        prune_logs(Path(self.baseFilename).parent, self.max_age_days)
+
+
+def setup_logging(level=logging.INFO, log_dir=LOG_DIR, max_bytes=MAX_BYTES,
+                  backup_count=BACKUP_COUNT, max_age_days=MAX_AGE_DAYS):
+    """Configure les logs du processus; les appels suivants sont sans effet"""
+    global _listener, _log_lock
+    if _listener is not None:
+        return _listener
+
+    log_dir = Path(log_dir)
+    log_dir.mkdir(exist_ok=True)
+    removed = prune_logs(log_dir, max_age_days)
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    try:
+        # Deux processus qui font tourner le même fichier perdent ou écrasent des lignes
+        _log_lock = ProfileLock(log_dir / Path(LOG_FILE).stem).acquire()
+        file_handler = _PruningFileHandler(
+            log_dir / LOG_FILE, max_age_days=max_age_days,
+            maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+    except ProfileBusy:
+        file_handler = logging.FileHandler(
+            log_dir / f"{Path(LOG_FILE).stem}.{os.getpid()}.log", encoding="utf-8"
+        )
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    # File non bornée: un log ne bloque jamais l'appelant
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    # Vider la file avant la sortie du processus
+    atexit.register(shutdown_logging)
+
+    if removed:
+        logging.getLogger(__name__).info(f"{removed} anciens journaux supprimés")
+    return _listener
+
+
+def shutdown_logging():
+    """Écrit les messages en attente et arrête le thread d'écriture"""
+    global _listener, _log_lock
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    if _log_lock is not None:
+        _log_lock.release()
+        _log_lock = None
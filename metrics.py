@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Mesures par phase des exécutions du bot de vote Vanadia
+Chaque exécution ajoute un enregistrement JSON à logs/metrics.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from colorama import init, Fore, Style
+
+init()
+
+DEFAULT_METRICS_PATH = Path("logs/metrics.jsonl")
+
+
+class RunMetrics:
+    """Durées des phases, tentatives de sélecteurs et volume transféré d'une exécution"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._start = time.monotonic()
+        self.phases = {}
+        self.selector_attempts = []
+        self.captcha = None
+        self.launch_profile = None
+        self.preflight = None  # Issue de la vérification HTTP préalable (preflight.py)
+        self.browser = None  # {"peak_rss_mb", "cpu_seconds"} de l'arbre de processus du navigateur
+        self.timeout = None  # Phase qui a dépassé son budget (ou le délai global)
+        self.error = None  # Classe de la première exception ayant fait échouer l'exécution
+        self.attempts = {}  # Tentatives par phase reprise (voir retry.py)
+        self.cancelled_phase = None
+        self.record = None
+
+    @contextmanager
+    def span(self, name):
+        """Mesure la durée d'une phase (cumulée si la phase est exécutée plusieurs fois)"""
+        start = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            # La phase la plus interne voit l'annulation en premier
+            self.cancelled_phase = self.cancelled_phase or name
+            raise
+        finally:
+            elapsed_ms = int((time.monotonic() - start) * 1000)
+            self.phases[name] = self.phases.get(name, 0) + elapsed_ms
+
+    def record_selector(self, role, selector, candidates, elapsed_ms):
+        """Enregistre une recherche de sélecteur (selector=None si rien trouvé)"""
+        self.selector_attempts.append({
+            "role": role,
+            "selector": selector,
+            "candidates": candidates,
+            "ms": elapsed_ms,
+        })
+
+    def record_timeout(self, phase, budget_s, scope):
+        """Enregistre un dépassement de budget (scope: "phase" ou "run")"""
+        if self.timeout is None:
+            self.timeout = {"phase": phase, "budget_s": budget_s, "scope": scope}
+
+    def record_attempt(self, phase, number):
+        """Enregistre le numéro de la tentative en cours d'une phase reprise"""
+        self.attempts[phase] = number
+
+    def record_error(self, error):
+        """Enregistre la classe de l'exception qui a fait échouer l'exécution"""
+        if self.error is None:
+            self.error = type(error).__name__
+
+    def finish(self, result, router_stats=None):
+        """Clôt l'exécution et construit l'enregistrement"""
+        total_ms = int((time.monotonic() - self._start) * 1000)
+        self.record = {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "ended_at": (self.started_at + timedelta(milliseconds=total_ms)).isoformat(timespec="seconds"),
+            "total_ms": total_ms,
+            "outcome": getattr(result, "outcome", None),
+            "success": bool(result),
+            "cooldown_s": int(result.cooldown.total_seconds()) if getattr(result, "cooldown", None) else None,
+            "captcha": self.captcha,
+            "timeout": self.timeout,
+            "error": self.error,
+            "launch_profile": self.launch_profile,
+            "preflight": self.preflight,
+            "peak_rss_mb": self.browser["peak_rss_mb"] if self.browser else None,
+            "cpu_seconds": self.browser["cpu_seconds"] if self.browser else None,
+            "phases": self.phases,
+            "attempts": self.attempts,
+            "selector_attempts": self.selector_attempts,
+            "received_bytes": router_stats["received_bytes"] if router_stats else None,
+            "blocked_requests": router_stats["blocked_requests"] if router_stats else None,
+        }
+        return self.record
+
+    def write(self, path=DEFAULT_METRICS_PATH):
+        """Ajoute l'enregistrement au fichier JSONL"""
+        if self.record is None:
+            return
+        try:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.record, ensure_ascii=False) + "\n")
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Impossible d'écrire les métriques: {e}")
+
+
+def load_records(path=DEFAULT_METRICS_PATH, last=None):
+    """Charge les derniers enregistrements du fichier JSONL"""
+    records = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        return []
+    return records[-last:] if last else records
+
+
+def percentile(values, fraction):
+    """Percentile par interpolation linéaire (fraction entre 0 et 1)"""
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def phase_stats(records):
+    """p50/p95 par phase (et pour la durée totale) sur une liste d'enregistrements"""
+    durations = {}
+    for record in records:
+        for phase, ms in record.get("phases", {}).items():
+            durations.setdefault(phase, []).append(ms)
+        durations.setdefault("total", []).append(record.get("total_ms", 0))
+
+    return {
+        phase: {
+            "count": len(values),
+            "p50": percentile(values, 0.5),
+            "p95": percentile(values, 0.95),
+        }
+        for phase, values in durations.items()
+    }
+
+
+def retry_stats(records):
+    """Reprises (tentatives au-delà de la première) par phase"""
+    retries = {}
+    for record in records:
+        for phase, attempts in (record.get("attempts") or {}).items():
+            if attempts > 1:
+                retries[phase] = retries.get(phase, 0) + attempts - 1
+    return retries
+
+
+def browser_stats(records):
+    """Pic de RSS (Mo) et CPU (s) du navigateur, p50/p95 par profil de lancement"""
+    samples = {}
+    for record in records:
+        if record.get("peak_rss_mb") is None:
+            continue
+        profile = record.get("launch_profile") or "default"
+        samples.setdefault(profile, []).append(record)
+
+    return {
+        profile: {
+            "count": len(group),
+            "rss_p50": percentile([r["peak_rss_mb"] for r in group], 0.5),
+            "rss_p95": percentile([r["peak_rss_mb"] for r in group], 0.95),
+            "cpu_p50": percentile([r.get("cpu_seconds") or 0 for r in group], 0.5),
+        }
+        for profile, group in samples.items()
+    }
+
+
+def print_report(path=DEFAULT_METRICS_PATH, last=50):
+    """Affiche p50/p95 par phase sur les N dernières exécutions"""
+    records = load_records(path, last)
+    if not records:
+        print(f"{Fore.YELLOW}Aucune mesure dans {path}{Style.RESET_ALL}")
+        return
+
+    outcomes = {}
+    timeouts = {}
+    for record in records:
+        outcomes[record.get("outcome")] = outcomes.get(record.get("outcome"), 0) + 1
+        if record.get("timeout"):
+            phase = record["timeout"].get("phase")
+            timeouts[phase] = timeouts.get(phase, 0) + 1
+
+    print(f"{Fore.CYAN}📊 {len(records)} dernières exécutions{Style.RESET_ALL}")
+    print("   " + ", ".join(f"{outcome}: {count}" for outcome, count in sorted(outcomes.items(), key=str)))
+    retries = retry_stats(records)
+    if retries:
+        print("   Reprises d'étape: " + ", ".join(f"{phase}: {count}" for phase, count in sorted(retries.items())))
+    skipped = sum(1 for record in records if record.get("preflight") == "cooldown")
+    if skipped:
+        print(f"   Navigateur évité (délai lu en HTTP): {skipped}/{len(records)}")
+    if timeouts:
+        print(f"{Fore.YELLOW}   Budgets dépassés: " + ", ".join(
+            f"{phase}: {count}" for phase, count in sorted(timeouts.items(), key=str)) + Style.RESET_ALL)
+    print()
+    print(f"{Fore.WHITE}{'Phase':<24}{'n':>5}{'p50 (ms)':>12}{'p95 (ms)':>12}{Style.RESET_ALL}")
+    for phase, stats in sorted(phase_stats(records).items(), key=lambda item: item[0] == "total"):
+        print(f"{phase:<24}{stats['count']:>5}{stats['p50']:>12.0f}{stats['p95']:>12.0f}")
+
+    usage = browser_stats(records)
+    if usage:
+        print()
+        print(f"{Fore.WHITE}{'Profil de lancement':<24}{'n':>5}{'RSS p50':>12}{'RSS p95':>12}{'CPU p50':>12}{Style.RESET_ALL}")
+        for profile, stats in sorted(usage.items()):
+            print(f"{profile:<24}{stats['count']:>5}{stats['rss_p50']:>9.0f} Mo{stats['rss_p95']:>9.0f} Mo"
+                  f"{stats['cpu_p50']:>10.1f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapport des durées par phase du bot de vote")
+    parser.add_argument("--last", type=int, default=50, help="nombre d'exécutions à analyser")
+    parser.add_argument("--file", default=str(DEFAULT_METRICS_PATH), help="fichier JSONL des mesures")
+    args = parser.parse_args()
+    print_report(args.file, args.last)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Couche de navigation configurable pour le bot de vote Vanadia
+Chaque étape choisit son critère de fin (commit, domcontentloaded, élément ou réponse)
+et le temps réellement attendu est journalisé
+"""
+
+import asyncio
+import logging
+import time
+
+from readiness import wait_for_element, wait_for_response
+
+logger = logging.getLogger(__name__)
+
+LOAD_STATES = ("commit", "domcontentloaded", "load", "networkidle")
+
+
+class NavigationStrategy:
+    """Critère de fin d'une navigation"""
+
+    def __init__(self, wait_until="domcontentloaded", selector=None, response=None, timeout=30000):
+        if wait_until not in LOAD_STATES:
+            raise ValueError(f"wait_until invalide: {wait_until} (attendu: {', '.join(LOAD_STATES)})")
+        self.wait_until = wait_until
+        self.selector = selector  # Élément dont l'apparition termine la navigation
+        self.response = response  # Sous-chaîne d'URL ou prédicat sur la réponse attendue
+        self.timeout = timeout
+
+    def describe(self):
+        """Description courte du critère, pour les logs"""
+        parts = [self.wait_until]
+        if self.selector:
+            parts.append(f"élément {self.selector}")
+        if self.response:
+            parts.append(f"réponse {self.response if isinstance(self.response, str) else 'personnalisée'}")
+        return " + ".join(parts)
+
+    def response_predicate(self):
+        """Prédicat sur les réponses réseau, ou None si aucune réponse n'est attendue"""
+        if self.response is None:
+            return None
+        if callable(self.response):
+            return self.response
+        fragment = self.response
+        return lambda response: fragment in response.url and response.ok
+
+
+async def navigate(page, url, strategy=None, label=None):
+    """
+    Navigue vers url selon la stratégie donnée et renvoie (réponse, durée en ms).
+    Lève une exception si le critère principal (goto) échoue ; un élément ou une
+    réponse attendus mais absents sont seulement signalés dans les logs.
+    """
+    strategy = strategy or NavigationStrategy()
+    label = label or url
+    start = time.monotonic()
+
+    response_task = None
+    predicate = strategy.response_predicate()
+    if predicate:
+        response_task = asyncio.ensure_future(
+            wait_for_response(page, predicate, timeout=strategy.timeout)
+        )
+        await asyncio.sleep(0)  # Laisser l'écouteur s'enregistrer avant la navigation
+
+    try:
+        response = await page.goto(url, wait_until=strategy.wait_until, timeout=strategy.timeout)
+    except BaseException:
+        if response_task:
+            response_task.cancel()
+        raise
+    goto_ms = int((time.monotonic() - start) * 1000)
+
+    # Pour Playwright, timeout=0 signifie "sans limite": budget épuisé -> 1 ms
+    remaining = max(strategy.timeout - goto_ms, 1)
+    if strategy.selector:
+        element = await wait_for_element(page, strategy.selector, timeout=remaining)
+        if not element:
+            logger.warning(f"Navigation '{label}': élément {strategy.selector} non trouvé")
+
+    if response_task:
+        if not await response_task:
+            logger.warning(f"Navigation '{label}': réponse attendue non reçue")
+
+    elapsed_ms = int((time.monotonic() - start) * 1000)
+    logger.info(
+        f"Navigation '{label}' terminée en {elapsed_ms} ms "
+        f"(goto {goto_ms} ms, critère: {strategy.describe()})"
+    )
+    return response, elapsed_ms
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Notifications du bot de vote Vanadia
+Envoi asynchrone vers plusieurs canaux (bureau, bip terminal, webhook local, fichier),
+hors de la boucle asyncio, avec délai maximal et regroupement des rafales
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+from colorama import init, Fore, Back, Style
+
+from log_setup import setup_logging
+
+init()
+
+APP_NAME = "Vanadia Vote Bot"
+DEFAULT_DROP_DIR = Path("data/notifications")
+
+
+class DesktopBackend:
+    """Notification système via plyer"""
+
+    name = "desktop"
+
+    def send(self, title, message, timeout):
+        # Import tardif: plyer est lent à charger et absent sur certains serveurs
+        from plyer import notification
+        notification.notify(title=title, message=message, timeout=timeout, app_name=APP_NAME)
+
+
+class BellBackend:
+    """Bip du terminal"""
+
+    name = "bell"
+
+    def send(self, title, message, timeout):
+        sys.stdout.write("\a")
+        sys.stdout.flush()
+
+
+class ConsoleBackend:
+    """Encadré coloré dans la console (secours si aucun autre canal n'a fonctionné)"""
+
+    name = "console"
+
+    def send(self, title, message, timeout):
+        print(f"\n{Back.YELLOW}{Fore.BLACK} 🔔 NOTIFICATION {Style.RESET_ALL}")
+        print(f"{Fore.CYAN}{title}{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}{message}{Style.RESET_ALL}")
+        print(f"{Back.YELLOW}{Fore.BLACK} =============== {Style.RESET_ALL}\n")
+
+
+class WebhookBackend:
+    """POST JSON vers une URL (par exemple le récepteur local: python notifier.py serve)"""
+
+    name = "webhook"
+
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, title, message, timeout):
+        data = json.dumps({"app": APP_NAME, "title": title, "message": message}).encode("utf-8")
+        request = urllib.request.Request(self.url, data=data, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class FileDropBackend:
+    """Un fichier JSON par notification, à surveiller par un autre outil"""
+
+    name = "file"
+
+    def __init__(self, directory=DEFAULT_DROP_DIR):
+        self.directory = Path(directory)
+
+    def send(self, title, message, timeout):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        now = datetime.now()
+        path = self.directory / f"{now.strftime('%Y%m%d_%H%M%S_%f')}.json"
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"time": now.isoformat(timespec="seconds"), "title": title, "message": message},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def build_backends(spec):
+    """Canaux à partir d'une liste "desktop,bell,file=dossier,webhook=url" """
+    backends = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        if name == "desktop":
+            backends.append(DesktopBackend())
+        elif name == "bell":
+            backends.append(BellBackend())
+        elif name == "console":
+            backends.append(ConsoleBackend())
+        elif name == "file":
+            backends.append(FileDropBackend(value or DEFAULT_DROP_DIR))
+        elif name == "webhook":
+            if not value:
+                raise ValueError("Le canal webhook demande une URL: webhook=http://...")
+            backends.append(WebhookBackend(value))
+        else:
+            raise ValueError(f"Canal de notification inconnu: {name}")
+    return backends
+
+
+def _run_in_thread(function, *args):
+    """Exécute une fonction bloquante dans un thread démon; renvoie un futur asyncio"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def target():
+        try:
+            result, error = function(*args), None
+        except BaseException as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(_settle, future, result, error)
+        except RuntimeError:
+            pass  # Boucle fermée entre-temps (arrêt du bot): plus personne n'attend le résultat
+
+    # Thread démon: un canal bloqué ne retient ni la boucle ni la sortie du processus
+    threading.Thread(target=target, daemon=True).start()
+    return future
+
+
+def _settle(future, result, error):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class NotificationService:
+    """File de notifications envoyées en tâche de fond; notify() ne bloque jamais l'appelant"""
+
+    def __init__(self, backends=None, send_timeout=5.0, coalesce_window=1.0):
+        self.backends = list(backends) if backends is not None else [DesktopBackend()]
+        self.fallback = ConsoleBackend()
+        self.send_timeout = send_timeout
+        self.coalesce_window = coalesce_window
+        self.logger = logging.getLogger(__name__)
+        self._queue = None
+        self._worker = None
+        self._loop = None
+
+    def notify(self, title, message, timeout=10):
+        """Met une notification en file (envoi immédiat en tâche de fond)"""
+        item = (title, message, timeout)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Hors boucle asyncio (arrêt du planificateur): envoi direct, borné par send_timeout
+            asyncio.run(self._dispatch([item]))
+            return
+
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # Nouvelle boucle (un asyncio.run par vote): nouvelle file et nouveau consommateur
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._consume())
+        self._queue.put_nowait(item)
+
+    async def drain(self, timeout=None):
+        """Attend l'envoi des notifications en file (au plus `timeout` secondes)"""
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout or self.send_timeout + self.coalesce_window + 1)
+        except asyncio.TimeoutError:
+            self.logger.warning("Notifications encore en attente, abandon")
+
+    async def _consume(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Regrouper les notifications arrivées pendant la fenêtre en un seul envoi
+            deadline = time.monotonic() + self.coalesce_window
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._dispatch(batch)
+            except Exception as e:
+                self.logger.error(f"Erreur notification: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _merge(batch):
+        """Une seule notification pour une rafale: messages distincts, titre le plus récent"""
+        messages = []
+        for _, message, _ in batch:
+            if message not in messages:
+                messages.append(message)
+        timeouts = [timeout for _, _, timeout in batch]
+        # timeout=0 (notification persistante) l'emporte
+        timeout = 0 if 0 in timeouts else max(timeouts)
+        return batch[-1][0], "\n".join(messages), timeout
+
+    async def _send(self, backend, title, message, timeout):
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(_run_in_thread(backend.send, title, message, timeout), timeout=self.send_timeout)
+            self.logger.debug(f"Notification {backend.name} envoyée en {int((time.monotonic() - start) * 1000)} ms")
+            return True
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Notification {backend.name}: pas de réponse après {self.send_timeout}s")
+        except Exception as e:
+            self.logger.error(f"Erreur notification {backend.name}: {e}")
+        return False
+
+    async def _dispatch(self, batch):
+        title, message, timeout = self._merge(batch)
+        if len(batch) > 1:
+            self.logger.info(f"{len(batch)} notifications regroupées")
+        results = await asyncio.gather(*(self._send(b, title, message, timeout) for b in self.backends))
+        if not any(results):
+            await self._send(self.fallback, title, message, timeout)
+        else:
+            self.logger.info(f"Notification envoyée: {title} - {message}")
+
+
+class _WebhookReceiver(BaseHTTPRequestHandler):
+    """Récepteur local affichant les notifications reçues par le canal webhook"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            data = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            data = {}
+        print(f"{Fore.CYAN}🔔 [{datetime.now().strftime('%H:%M:%S')}] {data.get('title')}: "
+              f"{data.get('message')}{Style.RESET_ALL}")
+        self.send_response(204)
+        self.end_headers()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Notifications du bot de vote")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="récepteur webhook local")
+    serve.add_argument("--port", type=int, default=8766)
+    test = sub.add_parser("test", help="envoyer une notification de test")
+    test.add_argument("--backends", default="desktop,bell", help="ex: desktop,bell,file,webhook=http://127.0.0.1:8766/")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        server = HTTPServer(("127.0.0.1", args.port), _WebhookReceiver)
+        print(f"Récepteur de notifications sur http://127.0.0.1:{args.port}/ (Ctrl+C pour arrêter)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    else:
+        setup_logging()
+        service = NotificationService(build_backends(args.backends))
+
+        async def send_test():
+            service.notify(APP_NAME, "Notification de test")
+            await service.drain()
+
+        asyncio.run(send_test())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Vérification HTTP de la page de vote sans lancer de navigateur
+Réutilise les cookies exportés du navigateur (data/storage_state.json) pour savoir
+si un vote est possible ou si le site impose encore un délai
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+import urllib.error
+import urllib.request
+from datetime import timedelta
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlparse
+
+from cooldown import parse_cooldown, parse_vote_cooldown
+
+DEFAULT_STORAGE_STATE = Path("data/storage_state.json")
+
+# Issues de la vérification
+COOLDOWN = "cooldown"  # Délai affiché: inutile de lancer le navigateur
+AVAILABLE = "available"  # Page de vote sans délai: lancer le navigateur
+LOGIN_REQUIRED = "login_required"  # Session expirée ou absente
+UNAVAILABLE = "unavailable"  # Pas de cookies ou erreur réseau: comportement habituel
+UNKNOWN = "unknown"  # Délai affiché sans rapport clair avec le vote: lancer le navigateur
+
+# Conteneurs du formulaire de vote ou du compte à rebours (classe ou id)
+_VOTE_SCOPE_RE = re.compile(r"vote|countdown|cooldown|timer", re.IGNORECASE)
+# Comptes à rebours dédiés: texte lu sans mot-clé ("59:59")
+_COUNTDOWN_RE = re.compile(r"countdown|cooldown|timer", re.IGNORECASE)
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+              "param", "source", "track", "wbr"}
+
+
+class PreflightResult:
+    """Issue de la vérification HTTP"""
+
+    def __init__(self, status, cooldown=None, elapsed_ms=0, size=0):
+        self.status = status
+        self.cooldown = cooldown
+        self.elapsed_ms = elapsed_ms
+        self.size = size
+
+    def __repr__(self):
+        return f"PreflightResult(status={self.status}, cooldown={self.cooldown}, {self.elapsed_ms} ms, {self.size} octets)"
+
+
+class _VisibleText(HTMLParser):
+    """
+    Texte visible d'une page, texte du formulaire de vote ou du compte à rebours
+    et compte à rebours éventuel (attribut data-countdown, en secondes)
+    """
+
+    _HIDDEN = {"script", "style", "noscript", "template"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.scoped_parts = []
+        self.countdown_parts = []
+        self.countdown = None
+        self._hidden_depth = 0
+        self._stack = []  # (balise, ouvre une zone de vote, ouvre un compte à rebours)
+
+    @property
+    def _in_scope(self):
+        return any(scoped for _, scoped, _ in self._stack)
+
+    @property
+    def _in_countdown(self):
+        return any(countdown for _, _, countdown in self._stack)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._HIDDEN:
+            self._hidden_depth += 1
+        attrs = dict(attrs)
+        value = attrs.get("data-countdown")
+        if self.countdown is None and value and value.strip().isdigit():
+            self.countdown = int(value.strip())
+        if tag not in _VOID_TAGS:
+            names = f"{attrs.get('class') or ''} {attrs.get('id') or ''}"
+            countdown = "data-countdown" in attrs or bool(_COUNTDOWN_RE.search(names))
+            scoped = tag == "form" or countdown or bool(_VOTE_SCOPE_RE.search(names))
+            self._stack.append((tag, scoped, countdown))
+
+    def handle_endtag(self, tag):
+        if tag in self._HIDDEN and self._hidden_depth:
+            self._hidden_depth -= 1
+        # Balises non fermées: dépiler jusqu'à la balise correspondante
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                del self._stack[index:]
+                break
+
+    def handle_data(self, data):
+        if not self._hidden_depth:
+            self.parts.append(data)
+            if self._in_scope:
+                self.scoped_parts.append(data)
+            if self._in_countdown:
+                self.countdown_parts.append(data)
+
+    @property
+    def text(self):
+        return " ".join(self.parts)
+
+    @property
+    def scoped_text(self):
+        return " ".join(self.scoped_parts)
+
+    @property
+    def countdown_text(self):
+        return " ".join(self.countdown_parts)
+
+
+def _domain_matches(host, domain):
+    domain = domain.lstrip(".").lower()
+    return host == domain or host.endswith("." + domain)
+
+
+def cookie_header(url, storage_state_path=DEFAULT_STORAGE_STATE):
+    """En-tête Cookie pour une URL à partir d'un storage state Playwright (None si aucun cookie)"""
+    try:
+        with open(storage_state_path, encoding="utf-8") as f:
+            cookies = json.load(f).get("cookies", [])
+    except (OSError, ValueError):
+        return None
+
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    path = parsed.path or "/"
+    now = time.time()
+    pairs = []
+    for cookie in cookies:
+        if not _domain_matches(host, cookie.get("domain", "")):
+            continue
+        if not path.startswith(cookie.get("path") or "/"):
+            continue
+        if cookie.get("secure") and parsed.scheme != "https":
+            continue
+        expires = cookie.get("expires", -1)
+        if expires not in (None, -1) and expires < now:
+            continue
+        pairs.append(f"{cookie['name']}={cookie['value']}")
+    return "; ".join(pairs) or None
+
+
+def _fetch(url, headers, timeout):
+    """GET bloquant: (URL finale, statut, corps)"""
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.geturl(), response.status, response.read(512 * 1024)
+    except urllib.error.HTTPError as e:
+        return e.geturl(), e.code, b""
+
+
+async def check_vote_status(vote_url, storage_state_path=DEFAULT_STORAGE_STATE, user_agent=None, timeout=10):
+    """Interroge la page de vote avec les cookies du navigateur; ne lève jamais d'exception"""
+    logger = logging.getLogger(__name__)
+    cookies = cookie_header(vote_url, storage_state_path)
+    if not cookies:
+        return PreflightResult(UNAVAILABLE)
+
+    headers = {"Cookie": cookies, "Accept": "text/html", "Accept-Language": "fr-FR,fr;q=0.9"}
+    if user_agent:
+        headers["User-Agent"] = user_agent
+
+    start = time.monotonic()
+    try:
+        # urllib est bloquant: exécuté hors de la boucle asyncio
+        final_url, status, body = await asyncio.get_running_loop().run_in_executor(
+            None, _fetch, vote_url, headers, timeout
+        )
+    except Exception as e:
+        logger.info(f"Vérification HTTP impossible: {e}")
+        return PreflightResult(UNAVAILABLE, elapsed_ms=int((time.monotonic() - start) * 1000))
+    elapsed_ms = int((time.monotonic() - start) * 1000)
+
+    if status in (401, 403) or "login" in urlparse(final_url).path.lower():
+        return PreflightResult(LOGIN_REQUIRED, elapsed_ms=elapsed_ms, size=len(body))
+    if status >= 400:
+        return PreflightResult(UNAVAILABLE, elapsed_ms=elapsed_ms, size=len(body))
+
+    parser = _VisibleText()
+    try:
+        parser.feed(body.decode("utf-8", errors="replace"))
+    except Exception:
+        pass
+    # Délai lu dans l'attribut data-countdown, le compte à rebours, le formulaire de vote
+    # ou une phrase sur le prochain vote
+    if parser.countdown:
+        cooldown = timedelta(seconds=parser.countdown)
+    else:
+        cooldown = (parse_cooldown(parser.countdown_text, countdown=True)
+                    or parse_cooldown(parser.scoped_text)
+                    or parse_vote_cooldown(parser.text))
+    if cooldown:
+        return PreflightResult(COOLDOWN, cooldown=cooldown, elapsed_ms=elapsed_ms, size=len(body))
+    # Un délai ailleurs sur la page (événement, maintenance...) ne permet pas de conclure
+    if parse_cooldown(parser.text):
+        return PreflightResult(UNKNOWN, elapsed_ms=elapsed_ms, size=len(body))
+    return PreflightResult(AVAILABLE, elapsed_ms=elapsed_ms, size=len(body))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Mémoire, CPU et arrêt forcé de l'arbre de processus du navigateur
+Utilise psutil (dépendance du projet), sinon /proc (Linux); seuls les processus Chromium
+sont mesurés (ni le pilote Playwright ni les autres enfants de Python)
+"""
+
+import asyncio
+import logging
+import os
+import re
+import signal
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_warned = False
+
+
+def has_backend():
+    """psutil ou /proc disponibles ? Sinon avertit une fois: mesures et arrêt forcé désactivés"""
+    global _warned
+    available = psutil is not None or os.path.isdir("/proc")
+    if not available and not _warned:
+        _warned = True
+        logging.getLogger(__name__).warning(
+            "Ni psutil ni /proc disponibles: mémoire du navigateur non mesurée et processus "
+            "orphelins non terminés (pip install psutil)"
+        )
+    return available
+
+
+# Noms des processus du navigateur (chrome, chromium, headless_shell, chrome_crashpad_handler...)
+_BROWSER_NAME_RE = re.compile(r"chrom|headless_shell", re.IGNORECASE)
+
+
+def _proc_stat(pid):
+    """(ppid, utime+stime en ticks, rss en pages) depuis /proc/<pid>/stat"""
+    with open(f"/proc/{pid}/stat") as f:
+        data = f.read()
+    # Le nom du processus peut contenir des espaces: repartir après la dernière parenthèse
+    fields = data[data.rindex(")") + 2:].split()
+    return int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21])
+
+
+def descendants(pid=None):
+    """PIDs de tous les descendants d'un processus (par défaut le processus courant)"""
+    pid = pid or os.getpid()
+    if psutil is not None:
+        try:
+            return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+
+    if not has_backend():
+        return []
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            ppid = _proc_stat(int(entry))[0]
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    result, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            result.append(child)
+            stack.append(child)
+    return result
+
+
+def process_name(pid):
+    """Nom court du processus ("" s'il a disparu)"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).name()
+        except psutil.Error:
+            return ""
+    try:
+        with open(f"/proc/{pid}/comm") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def browser_processes(pid=None):
+    """PIDs des processus Chromium parmi les descendants d'un processus"""
+    return [child for child in descendants(pid) if _BROWSER_NAME_RE.search(process_name(child))]
+
+
+def tree_usage(pid=None):
+    """(RSS total en octets, temps CPU total en secondes) des processus Chromium descendants"""
+    rss, cpu = 0, 0.0
+    for child in browser_processes(pid):
+        try:
+            if psutil is not None:
+                process = psutil.Process(child)
+                rss += process.memory_info().rss
+                times = process.cpu_times()
+                cpu += times.user + times.system
+            else:
+                _, ticks, pages = _proc_stat(child)
+                rss += pages * _PAGE_SIZE
+                cpu += ticks / _CLOCK_TICKS
+        except Exception:
+            continue
+    return rss, cpu
+
+
+def is_alive(pid):
+    """Le processus existe-t-il encore (hors zombie) ?"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+    if not has_backend():
+        return False
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            data = f.read()
+        return data[data.rindex(")") + 2] != "Z"
+    except (OSError, ValueError, IndexError):
+        return False
+
+
+async def kill_processes(pids, grace=3.0):
+    """SIGTERM puis, après `grace` secondes, SIGKILL aux processus encore vivants; renvoie le nombre visé"""
+    survivors = [pid for pid in pids if is_alive(pid)]
+    if not survivors:
+        return 0
+
+    for pid in survivors:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+
+    deadline = asyncio.get_event_loop().time() + grace
+    while asyncio.get_event_loop().time() < deadline:
+        if not any(is_alive(pid) for pid in survivors):
+            return len(survivors)
+        await asyncio.sleep(0.1)
+
+    for pid in survivors:
+        try:
+            os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError:
+            pass
+    return len(survivors)
+
+
+class ProcessTreeSampler:
+    """Échantillonne en tâche de fond le pic de RSS et le CPU consommé par le navigateur"""
+
+    def __init__(self, interval=0.5, pid=None):
+        self.interval = interval
+        self.pid = pid
+        self.peak_rss = 0
+        self.cpu_seconds = 0.0
+        self._cpu_start = None
+        self._task = None
+
+    def _record(self, rss, cpu):
+        self.peak_rss = max(self.peak_rss, rss)
+        if self._cpu_start is None:
+            self._cpu_start = cpu
+        # Le CPU des processus déjà terminés n'est plus visible: garder le maximum observé
+        self.cpu_seconds = max(self.cpu_seconds, cpu - self._cpu_start)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Parcours de psutil ou de /proc dans un thread: la boucle asyncio n'attend pas
+            self._record(*await loop.run_in_executor(None, tree_usage, self.pid))
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return self.summary()
+
+    def summary(self):
+        return {
+            "peak_rss_mb": round(self.peak_rss / (1024 * 1024), 1),
+            "cpu_seconds": round(self.cpu_seconds, 2),
+        }
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Verrou d'instance unique sur le profil navigateur du bot de vote Vanadia
+et nettoyage des processus Chromium orphelins liés à ce profil
+"""
+
+import logging
+import os
+from pathlib import Path
+
+from proc_stats import descendants, is_alive, kill_processes
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Fichiers laissés par Chromium dans le profil et qui bloquent un nouveau lancement
+SINGLETON_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie")
+
+
+class ProfileBusy(Exception):
+    """Le profil est déjà utilisé par une autre instance du bot"""
+
+    def __init__(self, profile_dir, holder=None):
+        owner = f" (PID {holder})" if holder else ""
+        super().__init__(f"profil {profile_dir} déjà utilisé par une autre instance{owner}")
+        self.profile_dir = profile_dir
+        self.holder = holder
+
+
+class ProfileLock:
+    """Verrou exclusif non bloquant posé sur <profil>.lock, libéré automatiquement si le processus meurt"""
+
+    def __init__(self, profile_dir):
+        self.profile_dir = Path(profile_dir)
+        self.path = self.profile_dir.with_name(self.profile_dir.name + ".lock")
+        self._file = None
+
+    @property
+    def locked(self):
+        return self._file is not None
+
+    def holder(self):
+        """PID inscrit par l'instance qui détient le verrou (None si inconnu)"""
+        try:
+            return int(self.path.read_text().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    @property
+    def running_path(self):
+        """Marqueur d'un vote en cours (<profil>.running): en mode démon le verrou reste pris entre les votes"""
+        return self.profile_dir.with_name(self.profile_dir.name + ".running")
+
+    def set_running(self, running):
+        """Inscrit (ou efface) le PID du processus qui exécute un vote"""
+        try:
+            if running:
+                self.running_path.parent.mkdir(parents=True, exist_ok=True)
+                self.running_path.write_text(str(os.getpid()))
+            elif self.running_path.exists():
+                self.running_path.unlink()
+        except OSError:
+            pass
+
+    def runner(self):
+        """PID du processus qui exécute un vote (None si aucun)"""
+        try:
+            return int(self.running_path.read_text().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def acquire(self):
+        """Prend le verrou; lève ProfileBusy s'il est détenu par un autre processus"""
+        if self._file is not None:
+            return self
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(self.path, "a+")
+        try:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            raise ProfileBusy(self.profile_dir, self.holder()) from None
+
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        self._file = f
+        return self
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            # Effacer le PID: `vanadia status` ne doit plus voir d'instance en cours
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.flush()
+            if os.name == "nt":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _cmdline(pid):
+    """Ligne de commande d'un processus (liste vide si inaccessible)"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).cmdline()
+        except psutil.Error:
+            return []
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return [arg.decode(errors="replace") for arg in f.read().split(b"\0") if arg]
+    except OSError:
+        return []
+
+
+def _all_pids():
+    if psutil is not None:
+        return psutil.pids()
+    if not os.path.isdir("/proc"):
+        return []
+    return [int(entry) for entry in os.listdir("/proc") if entry.isdigit()]
+
+
+def profile_processes(profile_dir):
+    """PIDs des navigateurs lancés avec --user-data-dir=<profil>, et de leurs descendants"""
+    target = Path(profile_dir).resolve()
+    browsers = []
+    for pid in _all_pids():
+        if pid == os.getpid():
+            continue
+        for arg in _cmdline(pid):
+            if not arg.startswith("--user-data-dir="):
+                continue
+            try:
+                if Path(arg.split("=", 1)[1]).resolve() == target:
+                    browsers.append(pid)
+            except (OSError, ValueError):
+                pass
+            break
+
+    pids = set(browsers)
+    for pid in browsers:
+        pids.update(descendants(pid))
+    return sorted(pid for pid in pids if is_alive(pid))
+
+
+async def reap_orphans(profile_dir):
+    """
+    Termine les navigateurs restés attachés au profil et supprime ses fichiers de verrou Chromium.
+    À appeler en détenant ProfileLock: aucun de ces processus n'appartient alors à une instance vivante.
+    """
+    logger = logging.getLogger(__name__)
+    pids = profile_processes(profile_dir)
+    killed = await kill_processes(pids) if pids else 0
+    if killed:
+        logger.warning(f"{killed} processus Chromium orphelins terminés (profil {profile_dir})")
+
+    for name in SINGLETON_FILES:
+        path = Path(profile_dir) / name
+        if os.path.lexists(path):
+            try:
+                path.unlink()
+                logger.info(f"Verrou Chromium obsolète supprimé: {path}")
+            except OSError as e:
+                logger.warning(f"Impossible de supprimer {path}: {e}")
+    return killed
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Entretien du profil navigateur du bot de vote Vanadia
+Mesure data/browser_profile et supprime les caches au-delà d'un budget,
+sans toucher aux cookies ni au stockage local qui portent la session
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+
+from colorama import init, Fore, Style
+
+from metrics import DEFAULT_METRICS_PATH, load_records, percentile
+from profile_lock import ProfileBusy, ProfileLock
+
+init()
+
+DEFAULT_PROFILE_DIR = Path("data/browser_profile")
+DEFAULT_BUDGET_MB = 150
+MAINTENANCE_LOG = Path("logs/maintenance.jsonl")
+
+# Caches et historiques que Chromium reconstruit seul. Jamais: Cookies, Network/Cookies,
+# Local Storage, IndexedDB, Session Storage, Preferences, Login Data
+PRUNABLE = [
+    "Default/Cache",
+    "Default/Code Cache",
+    "Default/GPUCache",
+    "Default/DawnCache",
+    "Default/DawnGraphiteCache",
+    "Default/Service Worker/CacheStorage",
+    "Default/Service Worker/ScriptCache",
+    "Default/History",
+    "Default/History-journal",
+    "Default/Visited Links",
+    "Default/Top Sites",
+    "Default/Top Sites-journal",
+    "Default/Favicons",
+    "Default/Favicons-journal",
+    "Default/Shortcuts",
+    "Default/Network Action Predictor",
+    "GrShaderCache",
+    "ShaderCache",
+    "GraphiteDawnCache",
+    "component_crx_cache",
+    "Crashpad/completed",
+]
+
+
+def path_size(path):
+    """Taille d'un fichier ou d'un dossier en octets (0 s'il n'existe pas)"""
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    for child in path.rglob("*"):
+        try:
+            if child.is_file() and not child.is_symlink():
+                total += child.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def measure(profile_dir=DEFAULT_PROFILE_DIR):
+    """Taille totale du profil et taille de chaque cache supprimable"""
+    profile_dir = Path(profile_dir)
+    prunable = {}
+    for relative in PRUNABLE:
+        size = path_size(profile_dir / relative)
+        if size:
+            prunable[relative] = size
+    return {"total": path_size(profile_dir), "prunable": prunable}
+
+
+def prune(profile_dir=DEFAULT_PROFILE_DIR, budget_mb=DEFAULT_BUDGET_MB):
+    """Supprime les plus gros caches jusqu'à repasser sous le budget; le navigateur doit être fermé"""
+    logger = logging.getLogger(__name__)
+    profile_dir = Path(profile_dir)
+    sizes = measure(profile_dir)
+    budget = budget_mb * 1024 * 1024
+    total = sizes["total"]
+    removed = []
+
+    for relative, size in sorted(sizes["prunable"].items(), key=lambda item: item[1], reverse=True):
+        if total <= budget:
+            break
+        path = profile_dir / relative
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+        except OSError as e:
+            logger.warning(f"Impossible de supprimer {path}: {e}")
+            continue
+        total -= size
+        removed.append(relative)
+
+    return {
+        "before_mb": round(sizes["total"] / (1024 * 1024), 1),
+        "after_mb": round(path_size(profile_dir) / (1024 * 1024), 1),
+        "budget_mb": budget_mb,
+        "removed": removed,
+    }
+
+
+async def measure_launch(bot):
+    """Durée (ms) d'un lancement + fermeture du navigateur invisible sur le profil du bot"""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        start = time.monotonic()
+        context = await bot.launch_context(p, headless=True)
+        elapsed = int((time.monotonic() - start) * 1000)
+        await context.close()
+    return elapsed
+
+
+async def run_maintenance(profile_dir=DEFAULT_PROFILE_DIR, budget_mb=DEFAULT_BUDGET_MB,
+                          lock=None, bot=None, log_path=MAINTENANCE_LOG):
+    """
+    Entretien complet sous le verrou du profil. Avec un bot, mesure aussi le lancement
+    avant et après; renvoie le rapport (None si le profil est utilisé)
+    """
+    logger = logging.getLogger(__name__)
+    lock = lock or ProfileLock(profile_dir)
+    try:
+        lock.acquire()
+    except ProfileBusy as e:
+        logger.info(f"Entretien du profil reporté: {e}")
+        return None
+
+    try:
+        launch_before = await measure_launch(bot) if bot is not None else None
+        # Parcours et suppression du profil (milliers de fichiers) hors de la boucle asyncio
+        report = await asyncio.get_running_loop().run_in_executor(None, prune, profile_dir, budget_mb)
+        launch_after = await measure_launch(bot) if bot is not None and report["removed"] else launch_before
+    finally:
+        lock.release()
+
+    report["time"] = datetime.now().isoformat(timespec="seconds")
+    report["launch_before_ms"] = launch_before
+    report["launch_after_ms"] = launch_after
+    if report["removed"]:
+        logger.info(f"Profil compacté: {report['before_mb']} Mo -> {report['after_mb']} Mo "
+                    f"({', '.join(report['removed'])})")
+    else:
+        logger.info(f"Profil sous le budget: {report['before_mb']} Mo / {budget_mb} Mo")
+
+    if log_path:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, _append_log, Path(log_path), report)
+        except OSError as e:
+            logger.warning(f"Impossible d'écrire le journal d'entretien: {e}")
+    return report
+
+
+def _append_log(log_path, report):
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(report, ensure_ascii=False) + "\n")
+
+
+def launch_savings(maintenance, records, window=10):
+    """p50 de la phase launch sur les `window` exécutions avant et après un entretien (ms)"""
+    before, after = [], []
+    for record in records:
+        launch = record.get("phases", {}).get("launch")
+        if launch is None:
+            continue
+        (before if record.get("started_at", "") < maintenance["time"] else after).append(launch)
+    before, after = before[-window:], after[:window]
+    if not before or not after:
+        return None, None
+    return percentile(before, 0.5), percentile(after, 0.5)
+
+
+def print_report(report):
+    """Affiche le résultat d'un entretien"""
+    if report is None:
+        print(f"{Fore.YELLOW}🔒 Profil utilisé par une autre instance, entretien reporté{Style.RESET_ALL}")
+        return
+    print(f"{Fore.CYAN}🧹 Profil: {report['before_mb']} Mo -> {report['after_mb']} Mo "
+          f"(budget {report['budget_mb']} Mo){Style.RESET_ALL}")
+    for relative in report["removed"]:
+        print(f"   supprimé: {relative}")
+    if report.get("launch_before_ms") is not None:
+        saved = report["launch_before_ms"] - report["launch_after_ms"]
+        print(f"{Fore.GREEN}🚀 Lancement: {report['launch_before_ms']} ms -> {report['launch_after_ms']} ms "
+              f"({saved:+d} ms gagnés){Style.RESET_ALL}")
+
+
+def print_history(log_path=MAINTENANCE_LOG, metrics_path=DEFAULT_METRICS_PATH):
+    """Gain de temps de lancement observé sur les vraies exécutions autour de chaque entretien"""
+    events = [event for event in load_records(log_path) if event.get("removed")]
+    if not events:
+        print(f"{Fore.YELLOW}Aucun entretien ayant supprimé des caches dans {log_path}{Style.RESET_ALL}")
+        return
+    records = load_records(metrics_path)
+    print(f"{Fore.WHITE}{'Entretien':<22}{'Mo libérés':>12}{'launch avant':>14}{'après':>10}{Style.RESET_ALL}")
+    for event in events[-10:]:
+        before, after = launch_savings(event, records)
+        freed = event["before_mb"] - event["after_mb"]
+        timing = f"{before:>11.0f} ms{after:>7.0f} ms" if before is not None else f"{'-':>14}{'-':>10}"
+        print(f"{event['time']:<22}{freed:>12.1f}{timing}")
+
+
+def run(profile_dir, budget_mb, measure_launch_time=False, history=False):
+    """Point d'entrée partagé avec `cli.py maintain`"""
+    if history:
+        print_history()
+        return
+
+    bot = None
+    if measure_launch_time:
+        from vote_bot import VanadiaVoteBot
+        bot = VanadiaVoteBot(data_dir=Path(profile_dir).parent)
+        bot.profile_dir = Path(profile_dir)
+        # Le bot et l'entretien partagent le même verrou
+        bot.profile_lock = ProfileLock(profile_dir)
+    lock = bot.profile_lock if bot is not None else None
+    print_report(asyncio.run(run_maintenance(profile_dir, budget_mb, lock=lock, bot=bot)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entretien du profil navigateur du bot de vote")
+    parser.add_argument("--profile", default=str(DEFAULT_PROFILE_DIR), help="dossier du profil")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET_MB, help="taille maximale du profil (Mo)")
+    parser.add_argument("--measure", action="store_true", help="chronométrer le lancement avant/après")
+    parser.add_argument("--history", action="store_true", help="gain observé sur les exécutions réelles")
+    args = parser.parse_args()
+    run(args.profile, args.budget, args.measure, args.history)
+
+
+if __name__ == "__main__":
+    main()
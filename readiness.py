@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Attentes conditionnelles pour le bot de vote Vanadia
+Remplace les délais fixes par l'attente d'une condition concrète, bornée par un timeout
+"""
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _elapsed_ms(start):
+    return int((time.monotonic() - start) * 1000)
+
+
+async def wait_for_url_matching(page, predicate, timeout=10000):
+    """Attend une URL satisfaisant predicate(url), renvoie True si c'est le cas"""
+    start = time.monotonic()
+    if predicate(page.url):
+        return True
+    try:
+        await page.wait_for_url(predicate, wait_until="commit", timeout=timeout)
+        logger.debug(f"URL attendue atteinte en {_elapsed_ms(start)} ms: {page.url}")
+        return True
+    except Exception:
+        logger.debug(f"URL attendue non atteinte après {_elapsed_ms(start)} ms")
+        return False
+
+
+async def wait_for_element_state(element, state, timeout=10000):
+    """Attend un état d'élément (visible, enabled, stable...), renvoie True si atteint"""
+    start = time.monotonic()
+    try:
+        await element.wait_for_element_state(state, timeout=timeout)
+        logger.debug(f"Élément '{state}' en {_elapsed_ms(start)} ms")
+        return True
+    except Exception:
+        logger.debug(f"Élément pas '{state}' après {_elapsed_ms(start)} ms")
+        return False
+
+
+async def wait_for_element(page, selector, state="visible", timeout=10000):
+    """Attend qu'un élément atteigne un état (visible, attached...), renvoie l'élément ou None"""
+    start = time.monotonic()
+    try:
+        element = await page.wait_for_selector(selector, state=state, timeout=timeout)
+        logger.debug(f"Élément {selector} '{state}' en {_elapsed_ms(start)} ms")
+        return element
+    except Exception:
+        logger.debug(f"Élément {selector} pas '{state}' après {_elapsed_ms(start)} ms")
+        return None
+
+
+async def wait_for_load(page, state="load", timeout=10000):
+    """Attend un état de chargement de la page, renvoie True si atteint"""
+    start = time.monotonic()
+    try:
+        await page.wait_for_load_state(state, timeout=timeout)
+        logger.debug(f"Page '{state}' en {_elapsed_ms(start)} ms")
+        return True
+    except Exception:
+        logger.debug(f"Page pas '{state}' après {_elapsed_ms(start)} ms")
+        return False
+
+
+async def wait_for_response(page, predicate, timeout=10000):
+    """Attend une réponse réseau satisfaisant predicate(response), renvoie la réponse ou None"""
+    start = time.monotonic()
+    try:
+        response = await page.wait_for_event("response", predicate=predicate, timeout=timeout)
+        logger.debug(f"Réponse reçue en {_elapsed_ms(start)} ms: {response.status} {response.url}")
+        return response
+    except Exception:
+        logger.debug(f"Aucune réponse attendue après {_elapsed_ms(start)} ms")
+        return None
+
+
+async def wait_for_any(conditions, timeout=10000):
+    """
+    Attend en parallèle plusieurs conditions {nom: coroutine} et renvoie
+    (nom, valeur) de la première qui aboutit avec une valeur vraie,
+    ou (None, None) si aucune n'aboutit avant le timeout.
+    """
+    start = time.monotonic()
+    tasks = {asyncio.ensure_future(coro): name for name, coro in conditions.items()}
+    pending = set(tasks)
+    result = (None, None)
+
+    try:
+        deadline = start + timeout / 1000
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            winner = next((t for t in done if not t.exception() and t.result()), None)
+            if winner:
+                result = (tasks[winner], winner.result())
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    logger.debug(f"Condition '{result[0]}' après {_elapsed_ms(start)} ms")
+    return result
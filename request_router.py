@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Routeur de requêtes pour le bot de vote Vanadia
+Bloque les ressources inutiles (images, polices, médias, traqueurs) sans toucher aux captchas
+"""
+
+import logging
+from urllib.parse import urlparse
+
+DEFAULT_BLOCKED_TYPES = {"image", "font", "media"}
+
+DEFAULT_DENY_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "adservice.google.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "clarity.ms",
+    "cloudflareinsights.com",
+    "matomo.cloud",
+]
+
+# Fournisseurs de captcha: jamais bloqués, quel que soit le type de ressource
+CAPTCHA_EXCEPTIONS = [
+    ("google.com", "/recaptcha"),
+    ("gstatic.com", "/recaptcha"),
+    ("recaptcha.net", ""),
+    ("hcaptcha.com", ""),
+    ("challenges.cloudflare.com", ""),
+]
+
+
+def _host_matches(host, domain):
+    return host == domain or host.endswith("." + domain)
+
+
+class ResourceRouter:
+    """Filtre les requêtes d'un contexte Playwright et compte ce qui est bloqué"""
+
+    def __init__(self, blocked_types=None, deny_domains=None, allow_domains=None):
+        self.blocked_types = set(DEFAULT_BLOCKED_TYPES if blocked_types is None else blocked_types)
+        self.deny_domains = list(DEFAULT_DENY_DOMAINS if deny_domains is None else deny_domains)
+        # Si renseignée, seuls ces domaines (et les captchas) sont autorisés
+        self.allow_domains = list(allow_domains) if allow_domains else None
+        self.logger = logging.getLogger(__name__)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Remet les compteurs à zéro (un jeu de compteurs par exécution)"""
+        self.stats = {
+            "allowed_requests": 0,
+            "blocked_requests": 0,
+            "blocked_by_reason": {},
+            "received_bytes": 0,
+        }
+
+    @staticmethod
+    def is_captcha(url):
+        """Vrai si l'URL appartient à un fournisseur de captcha ou désigne une image de captcha"""
+        parsed = urlparse(url)
+        host = parsed.hostname or ""
+        for domain, path_prefix in CAPTCHA_EXCEPTIONS:
+            if _host_matches(host, domain) and parsed.path.startswith(path_prefix):
+                return True
+        return "captcha" in url.lower()
+
+    def block_reason(self, url, resource_type):
+        """Raison du blocage d'une requête, ou None si elle doit passer"""
+        if self.is_captcha(url):
+            return None
+
+        host = urlparse(url).hostname or ""
+        if any(_host_matches(host, domain) for domain in self.deny_domains):
+            return "domaine refusé"
+        if self.allow_domains is not None and resource_type != "document":
+            if not any(_host_matches(host, domain) for domain in self.allow_domains):
+                return "domaine non autorisé"
+        if resource_type in self.blocked_types:
+            return f"type {resource_type}"
+        return None
+
+    async def _handle(self, route):
+        request = route.request
+        reason = self.block_reason(request.url, request.resource_type)
+        if reason is None:
+            self.stats["allowed_requests"] += 1
+            await route.fallback()  # Réseau, ou capture HAR si elle est installée
+            return
+
+        self.stats["blocked_requests"] += 1
+        self.stats["blocked_by_reason"][reason] = self.stats["blocked_by_reason"].get(reason, 0) + 1
+        self.logger.debug(f"Requête bloquée ({reason}): {request.url}")
+        await route.abort("blockedbyclient")
+
+    def _on_response(self, response):
+        try:
+            length = response.headers.get("content-length")
+            if length:
+                self.stats["received_bytes"] += int(length)
+        except Exception:
+            pass
+
+    async def install(self, context):
+        """Active le filtrage sur toutes les pages du contexte"""
+        await context.route("**/*", self._handle)
+        context.on("response", self._on_response)
+
+    def summary(self):
+        """Résumé lisible des compteurs de l'exécution"""
+        reasons = ", ".join(f"{reason}: {count}" for reason, count in
+                            sorted(self.stats["blocked_by_reason"].items())) or "aucune"
+        return (f"{self.stats['blocked_requests']} requêtes bloquées ({reasons}), "
+                f"{self.stats['allowed_requests']} autorisées, "
+                f"{self.stats['received_bytes'] / 1024:.0f} Ko reçus")
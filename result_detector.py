@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Détection ciblée du résultat d'un vote
+Écoute la réponse réseau de la soumission et les éléments de confirmation,
+sans sérialiser tout le DOM
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+
+from locators import first_match
+from readiness import wait_for_any, wait_for_response
+from vote_result import SUCCESS, ALREADY_VOTED, ERROR, UNKNOWN
+
+# Éléments de confirmation, par issue (sélecteurs CSS de Playwright, voir _fresh)
+OUTCOME_SELECTORS = {
+    ALREADY_VOTED: [
+        ':text-matches("déjà voté", "i")',
+        ':text-matches("already voted", "i")',
+    ],
+    SUCCESS: [
+        '.alert-success',
+        '.toast-success',
+        '.swal2-icon-success',
+        ':text-matches("vote (réussi|enregistré|validé|pris en compte)", "i")',
+        ':text-matches("merci pour (votre|ton) vote", "i")',
+    ],
+    ERROR: [
+        '.alert-danger',
+        '.toast-error',
+        '.swal2-icon-error',
+    ],
+}
+
+# Attribut posé par arm() sur les éléments déjà présents avant le clic
+SEEN_ATTRIBUTE = "data-vote-seen"
+
+# Le succès d'abord: "Vote enregistré ! Prochain vote dans 1h30" est un succès
+_MESSAGE_PATTERNS = [
+    (SUCCESS, re.compile(r"vote (réussi|enregistré|validé|pris en compte)|merci pour (votre|ton) vote|\bsuccess\b", re.I)),
+    (ALREADY_VOTED, re.compile(r"déjà voté|already voted|voter à nouveau|vous devez attendre", re.I)),
+    (ERROR, re.compile(r"erreur|error|échec|invalide", re.I)),
+]
+
+
+def classify_message(text):
+    """Issue correspondant à un message court du site"""
+    for outcome, pattern in _MESSAGE_PATTERNS:
+        if pattern.search(text or ""):
+            return outcome
+    return UNKNOWN
+
+
+def outcome_from_json(data):
+    """Issue d'une réponse JSON {"success": bool, "message": "..."}; le booléen prime sur le texte"""
+    message = " ".join(str(data.get(key, "")) for key in ("message", "error", "status"))
+    success = data.get("success")
+    if success is True:
+        return SUCCESS
+    if success is False:
+        return ALREADY_VOTED if classify_message(message) == ALREADY_VOTED else ERROR
+    return classify_message(message)
+
+
+def _fresh(selector):
+    """Sélecteur restreint aux éléments apparus après arm()"""
+    return f"{selector}:not([{SEEN_ATTRIBUTE}])"
+
+
+class ResultDetector:
+    """Attend le premier signal fiable du résultat d'un vote"""
+
+    def __init__(self, page, timeout=10000):
+        self.page = page
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self._response_task = None
+        self._armed_at = None
+
+    @staticmethod
+    def _is_submission(response):
+        request = response.request
+        return request.method == "POST" and request.resource_type in ("xhr", "fetch", "document")
+
+    async def arm(self):
+        """Commence à écouter la soumission et marque les messages déjà affichés; à appeler avant le clic"""
+        self._armed_at = time.monotonic()
+        self._response_task = asyncio.ensure_future(
+            wait_for_response(self.page, self._is_submission, timeout=self.timeout)
+        )
+        for group in OUTCOME_SELECTORS.values():
+            for selector in group:
+                try:
+                    await self.page.locator(selector).evaluate_all(
+                        f"elements => elements.forEach(e => e.setAttribute('{SEEN_ATTRIBUTE}', ''))"
+                    )
+                except Exception as e:
+                    self.logger.debug(f"Marquage impossible ({selector}): {e}")
+
+    async def _outcome_from_response(self):
+        response = await self._response_task
+        if response is None:
+            return None
+
+        if response.status == 429:
+            return ALREADY_VOTED
+        if response.status >= 400:
+            return ERROR
+
+        # Réponse JSON d'un appel AJAX: {"success": true, "message": "..."}
+        content_type = response.headers.get("content-type", "")
+        if "json" not in content_type:
+            return None  # Soumission de formulaire classique: la page de confirmation tranchera
+        try:
+            data = json.loads(await response.text())
+        except Exception:
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        outcome = outcome_from_json(data)
+        return outcome if outcome != UNKNOWN else None
+
+    async def _outcome_from_element(self):
+        outcome_by_selector = {}
+        for outcome, group in OUTCOME_SELECTORS.items():
+            for selector in group:
+                outcome_by_selector[_fresh(selector)] = outcome
+
+        # L'issue est celle du sélecteur: le texte d'un bandeau ne la remplace pas
+        element, selector = await first_match(self.page, list(outcome_by_selector), timeout=self.timeout)
+        if not element:
+            return None
+        return outcome_by_selector[selector]
+
+    async def wait(self):
+        """Renvoie l'issue du vote dès qu'un signal arrive (UNKNOWN si rien avant le timeout)"""
+        if self._response_task is None:
+            await self.arm()
+
+        source, outcome = await wait_for_any({
+            "réponse": self._outcome_from_response(),
+            "élément": self._outcome_from_element(),
+        }, timeout=self.timeout)
+
+        if not self._response_task.done():
+            self._response_task.cancel()
+
+        elapsed = int((time.monotonic() - self._armed_at) * 1000)
+        if outcome is None:
+            self.logger.info(f"Résultat du vote indéterminé après {elapsed} ms")
+            return UNKNOWN
+
+        self.logger.info(f"Résultat du vote: {outcome} (signal: {source}, {elapsed} ms)")
+        return outcome
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Reprise des étapes du bot de vote Vanadia après une erreur passagère
+Une politique par phase (tentatives, attente exponentielle, aléa, erreurs reprises);
+seule l'étape en échec est rejouée, sur le même navigateur
+"""
+
+import asyncio
+import logging
+import random
+
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+# Erreurs passagères: délai Playwright dépassé, connexion coupée, erreur réseau de Chromium
+DEFAULT_RETRY_ON = (PlaywrightTimeoutError, ConnectionError)
+TRANSIENT_MARKERS = ("net::ERR_", "ECONNRESET", "ECONNREFUSED", "socket hang up")
+
+
+def is_transient(error, retry_on=DEFAULT_RETRY_ON, markers=TRANSIENT_MARKERS):
+    """L'erreur vient-elle du réseau ou d'un délai, plutôt que du site lui-même ?"""
+    if isinstance(error, retry_on):
+        return True
+    return isinstance(error, PlaywrightError) and any(marker in str(error) for marker in markers)
+
+
+class RetryPolicy:
+    """Nombre de tentatives et attente entre elles pour une phase"""
+
+    def __init__(self, attempts=3, backoff=2.0, factor=2.0, max_backoff=30.0, jitter=0.25,
+                 retry_on=DEFAULT_RETRY_ON, markers=TRANSIENT_MARKERS):
+        if attempts < 1:
+            raise ValueError(f"attempts doit valoir au moins 1: {attempts}")
+        self.attempts = attempts
+        self.backoff = backoff  # Attente avant la 2e tentative (secondes)
+        self.factor = factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter  # Aléa relatif (0.25: ±25 %)
+        self.retry_on = retry_on
+        self.markers = markers
+
+    def delay(self, attempt):
+        """Attente après la tentative n° attempt (1 pour la première)"""
+        base = min(self.max_backoff, self.backoff * self.factor ** (attempt - 1))
+        return max(0.0, base * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def is_retryable(self, error):
+        return is_transient(error, self.retry_on, self.markers)
+
+    def __repr__(self):
+        return f"RetryPolicy(attempts={self.attempts}, backoff={self.backoff}s, jitter={self.jitter})"
+
+
+async def run_with_retry(name, attempt, policy, on_attempt=None):
+    """
+    Exécute attempt() (une coroutine neuve par tentative) jusqu'à réussite ou épuisement
+    de la politique; les erreurs non reprises et la dernière erreur sont propagées
+    """
+    logger = logging.getLogger(__name__)
+    for number in range(1, policy.attempts + 1):
+        if on_attempt is not None:
+            on_attempt(number)
+        try:
+            result = await attempt()
+        except Exception as e:
+            if number >= policy.attempts or not policy.is_retryable(e):
+                raise
+            delay = policy.delay(number)
+            message = str(e).splitlines()[0] if str(e) else ""
+            logger.warning(f"Étape {name}: erreur passagère ({type(e).__name__}: {message}), "
+                           f"tentative {number + 1}/{policy.attempts} dans {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+        if number > 1:
+            logger.info(f"Étape {name} réussie à la tentative {number}/{policy.attempts}")
+        return result
@@ -1,42 +1,118 @@
 #!/usr/bin/env python3
 """
 Planificateur pour le bot de vote Vanadia
-Exécute le bot toutes les 1H30
+Exécute le bot toutes les 1H30 sur une boucle asyncio unique
 """
 
+import argparse
 import asyncio
-import schedule
 import time
 import logging
 from datetime import datetime, timedelta
-from vote_bot import VanadiaVoteBot
+from pathlib import Path
+from history import RunHistory
+from launch_profiles import LAUNCH_PROFILES
+from log_setup import prune_logs
+from profile_lock import ProfileBusy, reap_orphans
+from profile_maintenance import DEFAULT_BUDGET_MB, run_maintenance
+from vote_result import VoteResult, BUSY
 from colorama import init, Fore, Back, Style
 
 init()
 
+# Intervalle entre deux votes
+VOTE_INTERVAL = timedelta(hours=1, minutes=30)
+# Réveils périodiques pendant l'attente (affichage du statut, santé du navigateur)
+STATUS_INTERVAL = 600
+HEALTH_CHECK_INTERVAL = 300
+# Écart entre horloge murale et horloge monotone au-delà duquel on considère une mise en veille
+SUSPEND_THRESHOLD = 60
+# Marge ajoutée au délai annoncé par le site avant de retenter
+COOLDOWN_MARGIN = 30
+# Nouvelle tentative quand une autre instance utilise le profil navigateur
+BUSY_RETRY = 300
+# Entretien du profil navigateur (caches au-delà du budget)
+MAINTENANCE_INTERVAL = 24 * 3600
+
 class VoteScheduler:
-    def __init__(self):
-        self.bot = VanadiaVoteBot()
+    def __init__(self, daemon=False, missed_run_policy="run_once", launch_profile="default", status_port=None,
+                 data_dir="data"):
+        self._bot = None  # Créé au premier besoin (Playwright, logs, cache de sélecteurs)
+        # Profil navigateur, cookies, historique et traces du bot
+        self.data_dir = Path(data_dir)
         self.last_vote_time = None
         self.next_vote_time = None
+        self.deadline = None  # Échéance du prochain vote sur l'horloge monotone
+        # Même échéance en secondes epoch (UTC): insensible aux changements d'heure, sert à détecter la veille
+        self.wall_deadline = None
+
+        # Mode démon: un seul navigateur pour toutes les exécutions
+        self.daemon = daemon
+        self.session = None
+
+        # Votes manqués pendant une mise en veille: "run_once" (voter dès le réveil)
+        # ou "skip" (attendre le prochain créneau de la cadence d'origine)
+        if missed_run_policy not in ("run_once", "skip"):
+            raise ValueError(f"Politique de rattrapage invalide: {missed_run_policy}")
+        self.missed_run_policy = missed_run_policy
+
+        # Profil de lancement de Chromium ("lean" pour une machine modeste)
+        self.launch_profile = launch_profile
+
+        # Entretien quotidien du profil navigateur (taille maximale en Mo)
+        self.maintenance_budget_mb = DEFAULT_BUDGET_MB
+        self.last_maintenance = None
+
+        # Historique des exécutions: dernier vote et prochaine échéance repris au redémarrage
+        self.history = RunHistory(self.data_dir / "history.db")
+
+        # Supervision locale (/metrics, /status) sur ce port, None pour désactiver
+        self.status_port = status_port
+        self.status_server = None
+        self.voting = False
 
-        # Configuration logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def bot(self):
+        """Bot de vote, construit au premier accès (configure aussi les logs)"""
+        if self._bot is None:
+            from vote_bot import VanadiaVoteBot
+            self._bot = VanadiaVoteBot(data_dir=self.data_dir)
+            self._bot.launch_profile = self.launch_profile
+        return self._bot
+
     async def run_scheduled_vote(self):
         """Exécute un vote planifié"""
         try:
             print(f"\n{Back.BLUE}{Fore.WHITE} 🕒 VOTE PLANIFIÉ - {datetime.now().strftime('%H:%M:%S')} {Style.RESET_ALL}")
 
-            success = await self.bot.main()
+            session = None
+            if self.daemon:
+                if self.session is None:
+                    from browser_session import BrowserSession
+                    self.session = BrowserSession(self.bot, headless=False)
+                session = self.session
+
+            self.voting = True
+            try:
+                result = await self.bot.main(session=session)
+            finally:
+                self.voting = False
+            if self.status_server is not None:
+                self.status_server.stats.observe(self.bot.metrics.record)
 
-            if success:
+            # Le site indique le temps restant: viser exactement ce moment plutôt que 1h30
+            if result.cooldown:
+                self._set_deadline(time.monotonic() + result.cooldown.total_seconds() + COOLDOWN_MARGIN)
+                self.logger.info(f"Prochain vote calé sur le délai indiqué par le site: {result.cooldown}")
+
+            # Profil pris par une exécution manuelle: réessayer bientôt plutôt qu'au prochain créneau
+            if result.outcome == BUSY:
+                self._set_deadline(time.monotonic() + BUSY_RETRY)
+
+            if result:
                 self.last_vote_time = datetime.now()
-                self.next_vote_time = self.last_vote_time + timedelta(hours=1, minutes=30)
 
                 print(f"{Fore.GREEN}✅ Vote planifié réussi!{Style.RESET_ALL}")
                 print(f"{Fore.CYAN}Prochain vote: {self.next_vote_time.strftime('%H:%M:%S')}{Style.RESET_ALL}")
@@ -45,6 +121,12 @@ class VoteScheduler:
                     "Vanadia Vote Bot - Planifié",
                     f"Vote réussi! Prochain: {self.next_vote_time.strftime('%H:%M')}"
                 )
+            elif result.cooldown:
+                print(f"{Fore.YELLOW}⏳ Vote pas encore disponible, nouvelle tentative à "
+                      f"{self.next_vote_time.strftime('%H:%M:%S')}{Style.RESET_ALL}")
+            elif result.outcome == BUSY:
+                print(f"{Fore.YELLOW}🔒 Navigateur occupé par une autre instance, nouvelle tentative à "
+                      f"{self.next_vote_time.strftime('%H:%M:%S')}{Style.RESET_ALL}")
             else:
                 print(f"{Fore.RED}❌ Échec du vote planifié{Style.RESET_ALL}")
                 self.bot.show_notification(
@@ -52,53 +134,211 @@ class VoteScheduler:
                     "Échec du vote planifié. Vérifiez les logs."
                 )
 
+            return result
+
         except Exception as e:
             self.logger.error(f"Erreur vote planifié: {e}")
+            return VoteResult(False)
 
-    def schedule_job_wrapper(self):
-        """Wrapper pour permettre l'exécution asynchrone avec schedule"""
-        asyncio.run(self.run_scheduled_vote())
+    def _set_deadline(self, deadline):
+        """Fixe l'échéance monotone du prochain vote, son équivalent epoch et l'heure locale affichée"""
+        self.deadline = deadline
+        self.wall_deadline = time.time() + (deadline - time.monotonic())
+        # Heure locale: affichage uniquement
+        self.next_vote_time = datetime.fromtimestamp(self.wall_deadline)
 
-    def start_scheduler(self):
-        """Démarre le planificateur"""
-        print(f"{Fore.CYAN}🕒 Planificateur Vanadia Vote Bot{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}Intervalle: 1 heure 30 minutes{Style.RESET_ALL}")
+    def _show_status(self):
+        """Affiche le temps restant avant le prochain vote"""
+        remaining = self.wall_deadline - time.time()
+        if remaining > 0:
+            hours, remainder = divmod(int(remaining), 3600)
+            minutes, _ = divmod(remainder, 60)
+            print(f"{Fore.BLUE}⏰ Prochain vote dans: {hours}h {minutes}m{Style.RESET_ALL}")
 
-        # Exécuter un vote immédiatement au démarrage
-        print(f"{Fore.GREEN}🚀 Exécution du premier vote immédiatement...{Style.RESET_ALL}")
-        self.schedule_job_wrapper()
+    async def _sleep_until(self, deadline):
+        """
+        Dort jusqu'à l'échéance monotone, en se réveillant seulement pour le statut
+        et la santé du navigateur. Renvoie True si une mise en veille du système a été détectée.
+        """
+        last_status = time.monotonic()
+        while True:
+            now = time.monotonic()
+            remaining = deadline - now
+            if remaining <= 0:
+                return False
 
-        # Programmer l'exécution toutes les 1h30
-        schedule.every(90).minutes.do(self.schedule_job_wrapper)
+            # L'horloge monotone ne compte pas la veille: si l'horloge epoch a pris de l'avance,
+            # le système a été suspendu (un changement d'heure ne modifie pas l'epoch)
+            wall_remaining = self.wall_deadline - time.time()
+            if wall_remaining < remaining - SUSPEND_THRESHOLD:
+                return True
 
-        print(f"{Fore.GREEN}✅ Planificateur démarré!{Style.RESET_ALL}")
-        if self.next_vote_time:
-            print(f"{Fore.CYAN}Prochain vote: {self.next_vote_time.strftime('%H:%M:%S')}{Style.RESET_ALL}")
-        print(f"{Fore.MAGENTA}Appuyez sur Ctrl+C pour arrêter{Style.RESET_ALL}")
+            if now - last_status >= STATUS_INTERVAL:
+                self._show_status()
+                last_status = now
 
-        # Notification de démarrage
-        if self.next_vote_time:
-            self.bot.show_notification(
-                "Vanadia Vote Bot",
-                f"Planificateur démarré! Prochain vote: {self.next_vote_time.strftime('%H:%M')}"
-            )
+            wakeup = STATUS_INTERVAL
+            if self.daemon and self.session is not None:
+                wakeup = HEALTH_CHECK_INTERVAL
+            await asyncio.sleep(min(remaining, wakeup))
+
+            if self.daemon and self.session is not None and deadline - time.monotonic() > 0:
+                try:
+                    await self.session.ensure()
+                except Exception as e:
+                    self.logger.error(f"Erreur relance du navigateur: {e}")
+
+    def _deadline_after_suspend(self):
+        """Recalcule l'échéance après une mise en veille selon la politique de rattrapage"""
+        interval = VOTE_INTERVAL.total_seconds()
+        overdue = time.time() - self.wall_deadline
+
+        if overdue <= 0:
+            # Réveil avant l'échéance: recaler l'horloge monotone sur l'heure murale
+            self.logger.info("Mise en veille détectée, échéance recalée sur l'heure réelle")
+            return time.monotonic() - overdue
+
+        missed = int(overdue // interval) + 1
+        self.logger.warning(f"Mise en veille détectée: {missed} vote(s) manqué(s)")
+        print(f"{Fore.YELLOW}💤 Sortie de veille: {missed} vote(s) manqué(s){Style.RESET_ALL}")
+
+        if self.missed_run_policy == "run_once":
+            return time.monotonic()
+        return time.monotonic() + (interval - overdue % interval)
+
+    def restore_state(self):
+        """Reprend le dernier vote depuis l'historique; renvoie l'heure du prochain vote (None: voter tout de suite)"""
+        try:
+            last = self.history.last_run()
+            last_success = last if last and last["success"] else self.history.last_run(success=True)
+        except Exception as e:
+            self.logger.error(f"Erreur lecture de l'historique: {e}")
+            return None
+
+        if last_success:
+            self.last_vote_time = datetime.fromisoformat(last_success["ended_at"] or last_success["started_at"])
+        if last is None:
+            return None
+
+        if last["cooldown_s"]:
+            # Délai annoncé par le site lors de la dernière exécution
+            ended = datetime.fromisoformat(last["ended_at"] or last["started_at"])
+            resume_at = ended + timedelta(seconds=last["cooldown_s"] + COOLDOWN_MARGIN)
+        elif last["success"]:
+            resume_at = datetime.fromisoformat(last["started_at"]) + VOTE_INTERVAL
+        else:
+            return None
+        return resume_at if resume_at.timestamp() > time.time() else None
+
+    async def cleanup_profile(self):
+        """Termine les navigateurs orphelins d'une exécution précédente plantée"""
+        try:
+            with self.bot.profile_lock:
+                await reap_orphans(self.bot.profile_dir)
+        except ProfileBusy as e:
+            # Une instance vivante utilise le profil: ses processus ne sont pas orphelins
+            self.logger.info(f"Nettoyage du profil ignoré: {e}")
+        except Exception as e:
+            self.logger.error(f"Erreur nettoyage du profil: {e}")
+
+    async def maintain_profile(self):
+        """Supprime les vieux journaux et compacte le profil navigateur si le dernier entretien date de plus de 24h"""
+        now = time.monotonic()
+        if self.last_maintenance is not None and now - self.last_maintenance < MAINTENANCE_INTERVAL:
+            return
+        try:
+            # Journaux des votes manuels (un fichier par processus) et archives de plus de 30 jours
+            removed = await asyncio.get_running_loop().run_in_executor(None, prune_logs)
+            if removed:
+                self.logger.info(f"{removed} anciens journaux supprimés")
+        except Exception as e:
+            self.logger.error(f"Erreur suppression des anciens journaux: {e}")
+        try:
+            if self.session is not None:
+                # Le navigateur doit être fermé; il sera relancé au prochain vote
+                await self.session.close()
+                self.session = None
+            report = await run_maintenance(self.bot.profile_dir, self.maintenance_budget_mb,
+                                           lock=self.bot.profile_lock)
+            if report is not None:
+                self.last_maintenance = now
+        except Exception as e:
+            self.logger.error(f"Erreur entretien du profil: {e}")
+
+    async def run_forever(self):
+        """Boucle du planificateur: dort jusqu'à chaque échéance sur une seule boucle asyncio"""
+        interval = VOTE_INTERVAL.total_seconds()
+        if self.status_port is not None:
+            from status_server import StatusServer
+            try:
+                self.status_server = await StatusServer(self, port=self.status_port).start()
+                print(f"{Fore.CYAN}📈 Supervision: http://127.0.0.1:{self.status_server.port}/metrics "
+                      f"et /status{Style.RESET_ALL}")
+            except OSError as e:
+                self.logger.error(f"Supervision indisponible sur le port {self.status_port}: {e}")
+        await self.cleanup_profile()
+        await self.maintain_profile()
+
+        resume_at = self.restore_state()
+        if resume_at:
+            # Dates de l'historique en heure locale: timestamp() tient compte du changement d'heure
+            self._set_deadline(time.monotonic() + (resume_at.timestamp() - time.time()))
+            print(f"{Fore.GREEN}📜 Dernier vote réussi: "
+                  f"{self.last_vote_time.strftime('%d/%m %H:%M') if self.last_vote_time else 'aucun'}, "
+                  f"reprise à {self.next_vote_time.strftime('%H:%M:%S')}{Style.RESET_ALL}")
+        else:
+            # Le premier vote est exécuté immédiatement au démarrage
+            print(f"{Fore.GREEN}🚀 Exécution du premier vote immédiatement...{Style.RESET_ALL}")
+            self._set_deadline(time.monotonic())
+        first_run = True
 
-        # Boucle principale
         try:
             while True:
-                schedule.run_pending()
+                if await self._sleep_until(self.deadline):
+                    self._set_deadline(self._deadline_after_suspend())
+                    continue
+
+                # Échéance ancrée sur l'heure prévue, pas sur la fin de l'exécution: pas de dérive.
+                # Un délai annoncé par le site pendant le vote remplace cette échéance.
+                self._set_deadline(self.deadline + interval)
+                await self.run_scheduled_vote()
+                await self.maintain_profile()
+
+                # Exécution plus longue que l'intervalle: sauter les créneaux dépassés
+                now = time.monotonic()
+                if self.deadline <= now:
+                    skipped = int((now - self.deadline) // interval) + 1
+                    self.logger.warning(f"Exécution trop longue, {skipped} créneau(x) sauté(s)")
+                    self._set_deadline(self.deadline + skipped * interval)
+
+                if first_run:
+                    first_run = False
+                    print(f"{Fore.GREEN}✅ Planificateur démarré!{Style.RESET_ALL}")
+                    print(f"{Fore.CYAN}Prochain vote: {self.next_vote_time.strftime('%H:%M:%S')}{Style.RESET_ALL}")
+                    print(f"{Fore.MAGENTA}Appuyez sur Ctrl+C pour arrêter{Style.RESET_ALL}")
 
-                # Afficher le statut toutes les 10 minutes
-                now = datetime.now()
-                if self.next_vote_time and now.minute % 10 == 0 and now.second < 10:
-                    remaining = self.next_vote_time - now
-                    if remaining.total_seconds() > 0:
-                        hours, remainder = divmod(remaining.seconds, 3600)
-                        minutes, _ = divmod(remainder, 60)
-                        print(f"{Fore.BLUE}⏰ Prochain vote dans: {hours}h {minutes}m{Style.RESET_ALL}")
+                    # Notification de démarrage
+                    self.bot.show_notification(
+                        "Vanadia Vote Bot",
+                        f"Planificateur démarré! Prochain vote: {self.next_vote_time.strftime('%H:%M')}"
+                    )
+        finally:
+            if self.session is not None:
+                await self.session.close()
+                self.session = None
+            if self.status_server is not None:
+                await self.status_server.close()
+                self.status_server = None
 
-                time.sleep(1)
+    def start_scheduler(self):
+        """Démarre le planificateur"""
+        print(f"{Fore.CYAN}🕒 Planificateur Vanadia Vote Bot{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}Intervalle: 1 heure 30 minutes{Style.RESET_ALL}")
+        if self.daemon:
+            print(f"{Fore.YELLOW}Mode démon: navigateur conservé entre les votes{Style.RESET_ALL}")
 
+        try:
+            asyncio.run(self.run_forever())
         except KeyboardInterrupt:
             print(f"\n{Fore.YELLOW}🛑 Arrêt du planificateur demandé{Style.RESET_ALL}")
             self.bot.show_notification(
@@ -113,7 +353,21 @@ class VoteScheduler:
 
 def main():
     """Menu principal"""
-    scheduler = VoteScheduler()
+    parser = argparse.ArgumentParser(description="Planificateur Vanadia Vote Bot")
+    parser.add_argument("--daemon", action="store_true",
+                        help="garder le navigateur ouvert entre les votes planifiés")
+    parser.add_argument("--missed-runs", choices=["run_once", "skip"], default="run_once",
+                        help="votes manqués pendant une mise en veille: voter au réveil ou attendre le prochain créneau")
+    parser.add_argument("--launch-profile", choices=sorted(LAUNCH_PROFILES), default="default",
+                        help="profil de lancement de Chromium (lean: mémoire réduite)")
+    parser.add_argument("--status-port", type=int, metavar="PORT",
+                        help="exposer /metrics (Prometheus) et /status (JSON) sur 127.0.0.1:PORT")
+    parser.add_argument("--data-dir", default="data", help="dossier du profil navigateur et du cache")
+    args = parser.parse_args()
+
+    scheduler = VoteScheduler(daemon=args.daemon, missed_run_policy=args.missed_runs,
+                              launch_profile=args.launch_profile, status_port=args.status_port,
+                              data_dir=args.data_dir)
 
     print(f"{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}  🤖 VANADIA VOTE BOT - PLANIFICATEUR{Style.RESET_ALL}")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Cache persistant des sélecteurs gagnants pour le bot de vote Vanadia
+Mémorise, par motif d'URL et par rôle, le dernier sélecteur qui a fonctionné
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+from colorama import init, Fore, Style
+
+init()
+
+DEFAULT_CACHE_PATH = Path("data/selector_cache.json")
+
+
+def url_pattern(url):
+    """Réduit une URL à un motif stable: hôte + chemin, segments numériques remplacés par *"""
+    parsed = urlparse(url or "")
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = re.sub(r"/\d+(?=/|$)", "/*", parsed.path.rstrip("/"))
+    return f"{host}{path}" or "about:blank"
+
+
+class SelectorCache:
+    """Cache sur disque des sélecteurs gagnants, avec compteurs de réussite/échec"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+        self.entries = self._load()
+        self.dirty = False  # Modifications pas encore écrites (voir flush)
+
+    def _load(self):
+        """Charge le cache depuis le disque (vide si absent ou illisible)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"Cache de sélecteurs illisible, réinitialisation: {e}")
+            return {}
+
+    def save(self):
+        """Écrit le cache de façon atomique"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": self.entries}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.warning(f"Impossible d'enregistrer le cache de sélecteurs: {e}")
+
+    def flush(self):
+        """Écrit le cache s'il a changé depuis la dernière écriture; une fois par exécution"""
+        if not self.dirty:
+            return False
+        self.dirty = False
+        self.save()
+        return True
+
+    @staticmethod
+    def key(url, role):
+        """Clé du cache pour une page et un rôle (ex: champ utilisateur)"""
+        return f"{url_pattern(url)}|{role}"
+
+    def ordered(self, key, selectors):
+        """Renvoie la liste des sélecteurs avec le dernier gagnant en tête"""
+        selectors = list(selectors)
+        learned = self.entries.get(key, {}).get("last")
+        if learned in selectors:
+            selectors.remove(learned)
+            selectors.insert(0, learned)
+        return selectors
+
+    def record(self, key, selectors, winner):
+        """Enregistre le résultat d'une recherche (winner=None si rien trouvé), en mémoire jusqu'à flush()"""
+        entry = self.entries.setdefault(key, {
+            "last": None,
+            "hits": 0,
+            "misses": 0,
+            "not_found": 0,
+            "wins": {},
+        })
+        learned = entry.get("last")
+
+        if learned is not None:
+            if winner == learned:
+                entry["hits"] += 1
+            else:
+                entry["misses"] += 1
+
+        if winner is None:
+            entry["not_found"] += 1
+        else:
+            entry["last"] = winner
+            entry["wins"][winner] = entry["wins"].get(winner, 0) + 1
+
+        entry["candidates"] = list(selectors)
+        entry["updated"] = datetime.now().isoformat(timespec="seconds")
+        self.dirty = True
+
+    def stats(self):
+        """Statistiques par clé: taux de réussite et sélecteurs jamais gagnants"""
+        rows = []
+        for key, entry in sorted(self.entries.items()):
+            attempts = entry["hits"] + entry["misses"]
+            hit_rate = entry["hits"] / attempts if attempts else None
+            never_won = [s for s in entry.get("candidates", []) if s not in entry["wins"]]
+            rows.append({
+                "key": key,
+                "last": entry["last"],
+                "hits": entry["hits"],
+                "misses": entry["misses"],
+                "not_found": entry["not_found"],
+                "hit_rate": hit_rate,
+                "never_won": never_won,
+            })
+        return rows
+
+
+def print_stats(path=DEFAULT_CACHE_PATH):
+    """Affiche les statistiques du cache de sélecteurs"""
+    rows = SelectorCache(path).stats()
+    if not rows:
+        print(f"{Fore.YELLOW}Cache de sélecteurs vide ({path}){Style.RESET_ALL}")
+        return
+
+    for row in rows:
+        rate = f"{row['hit_rate']:.0%}" if row["hit_rate"] is not None else "n/a"
+        print(f"{Fore.CYAN}{row['key']}{Style.RESET_ALL}")
+        print(f"  Dernier gagnant: {row['last']}")
+        print(f"  Réussites: {row['hits']}  Échecs: {row['misses']}  "
+              f"Introuvable: {row['not_found']}  Taux: {rate}")
+        if row["never_won"]:
+            print(f"  {Fore.LIGHTBLACK_EX}Jamais utilisés: {', '.join(row['never_won'])}{Style.RESET_ALL}")
+
+
+if __name__ == "__main__":
+    print_stats()
@@ -146,13 +146,6 @@ def test_installation():
         print(f"{Fore.RED}❌ Erreur import Playwright: {e}{Style.RESET_ALL}")
         return False
 
-    try:
-        import schedule
-        print(f"{Fore.GREEN}✅ Schedule importé{Style.RESET_ALL}")
-    except ImportError as e:
-        print(f"{Fore.RED}❌ Erreur import Schedule: {e}{Style.RESET_ALL}")
-        return False
-
     try:
         import plyer
         print(f"{Fore.GREEN}✅ Plyer importé{Style.RESET_ALL}")
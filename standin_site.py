@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Site local imitant vanadia.fr et serveur-prive.net pour tester le bot hors ligne
+Formulaire de connexion, page /vote, lien serveur-prive, captcha et bouton de validation
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Variantes de balisage: noms des champs et forme du bouton de validation
+MARKUP_VARIANTS = {
+    "classic": {
+        "username": '<input type="text" name="name" placeholder="Pseudo">',
+        "password": '<input type="password" name="password">',
+        "submit": '<button type="submit" class="btn btn-primary">Connexion</button>',
+        "validate": '<form method="post" action="/vote/validate">'
+                    '<button type="submit" class="btn btn-success">Valider le vote</button></form>',
+    },
+    "alt": {
+        "username": '<input type="text" id="pseudo" autocomplete="username">',
+        "password": '<input type="password" id="password">',
+        "submit": '<input type="submit" value="Se connecter">',
+        "validate": '<form method="post" action="/vote/validate">'
+                    '<input type="submit" value="Confirmer le vote"></form>',
+    },
+    "ajax": {
+        "username": '<input type="text" name="pseudo">',
+        "password": '<input type="password" name="password">',
+        "submit": '<button type="submit">Se connecter</button>',
+        "validate": '<button id="validate-vote" class="btn-validate" onclick="validateVote()">Valider</button>'
+                    '<div id="result"></div>'
+                    '<script>function validateVote(){fetch("/vote/validate",{method:"POST",'
+                    'headers:{"Accept":"application/json"}}).then(r=>r.json()).then(d=>{'
+                    'document.getElementById("result").innerHTML='
+                    '\'<div class="alert alert-success">\'+d.message+\'</div>\';});}</script>',
+    },
+}
+
+_PAGE = """<!DOCTYPE html>
+<html lang="fr"><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<nav>{nav}</nav>
+<main>{body}</main>
+{padding}
+</body></html>"""
+
+
+class StandInConfig:
+    """Réglages du site local"""
+
+    def __init__(self, variant="classic", latency_ms=0, jitter_ms=0, captcha=True,
+                 show_cooldown=False, padding_kb=0):
+        if variant not in MARKUP_VARIANTS:
+            raise ValueError(f"Variante inconnue: {variant} (attendu: {', '.join(MARKUP_VARIANTS)})")
+        self.variant = variant
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.captcha = captcha
+        self.show_cooldown = show_cooldown
+        self.padding_kb = padding_kb  # Contenu de remplissage pour simuler des pages lourdes
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    config = StandInConfig()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _delay(self):
+        delay = self.config.latency_ms + random.uniform(0, self.config.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _logged_in(self):
+        return "session=ok" in (self.headers.get("Cookie") or "")
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location, headers=None):
+        headers = dict(headers or {})
+        headers["Location"] = location
+        self._send(302, "", headers=headers)
+
+    def _page(self, title, body):
+        nav = '<a href="/">Accueil</a> '
+        if self._logged_in():
+            nav += '<a href="/user/profile">Profil</a> <a href="/auth/logout">Déconnexion</a>'
+        else:
+            nav += '<a href="/auth/login">Connexion</a>'
+        padding = ""
+        if self.config.padding_kb:
+            padding = "<!-- " + "x" * (self.config.padding_kb * 1024) + " -->"
+        return _PAGE.format(title=title, nav=nav, body=body, padding=padding)
+
+    def do_GET(self):
+        self._delay()
+        parsed = urlparse(self.path)
+        markup = MARKUP_VARIANTS[self.config.variant]
+
+        if parsed.path == "/":
+            self._send(200, self._page("Vanadia", "<h1>Vanadia</h1>"))
+        elif parsed.path == "/auth/login":
+            body = (f'<form method="post" action="/auth/login">{markup["username"]}'
+                    f'{markup["password"]}{markup["submit"]}</form>')
+            self._send(200, self._page("Connexion", body))
+        elif parsed.path == "/auth/logout":
+            self._redirect("/", {"Set-Cookie": "session=; Path=/; Max-Age=0"})
+        elif parsed.path == "/vote":
+            if not self._logged_in():
+                self._redirect("/auth/login")
+                return
+            voted = "voted" in parse_qs(parsed.query)
+            body = "<h1>Voter pour Vanadia</h1>"
+            if voted:
+                body += '<div class="alert alert-success">Vote enregistré, merci !</div>'
+                if self.config.show_cooldown:
+                    body += '<div class="vote-timer">Prochain vote dans 1h 30min</div>'
+            body += ('<a href="/serveur-prive/vote" target="_blank" class="btn">Serveur privé</a>'
+                     + markup["validate"])
+            self._send(200, self._page("Vote", body))
+        elif parsed.path == "/serveur-prive/vote":
+            body = "<h1>serveur-prive.net</h1>"
+            if "voted" in parse_qs(parsed.query):
+                body += '<div class="alert alert-success">Vote enregistré, merci !</div>'
+            if self.config.captcha:
+                # Taille et contenu d'un vrai widget: Playwright ne voit pas un div vide comme visible
+                body += ('<div class="g-recaptcha" data-sitekey="stand-in" '
+                         'style="width:304px;height:78px;border:1px solid #d3d3d3">'
+                         '<label><input type="checkbox"> Je ne suis pas un robot</label></div>')
+            body += ('<form method="post" action="/serveur-prive/vote">'
+                     '<button type="submit" class="btn-vote">Voter</button></form>')
+            self._send(200, self._page("Serveur privé", body))
+        else:
+            self._send(404, self._page("Introuvable", "<h1>404</h1>"))
+
+    def do_POST(self):
+        self._delay()
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        parsed = urlparse(self.path)
+
+        if parsed.path == "/auth/login":
+            self._redirect("/", {"Set-Cookie": "session=ok; Path=/; HttpOnly"})
+        elif parsed.path == "/serveur-prive/vote":
+            self._redirect("/serveur-prive/vote?voted=1")
+        elif parsed.path == "/vote/validate":
+            if "json" in (self.headers.get("Accept") or ""):
+                self._send(200, json.dumps({"success": True, "message": "Vote enregistré, merci !"}),
+                           content_type="application/json")
+            else:
+                self._redirect("/vote?voted=1")
+        else:
+            self._send(404, self._page("Introuvable", "<h1>404</h1>"))
+
+
+class StandInSite:
+    """Serveur HTTP local lancé dans un thread"""
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        handler = type("ConfiguredStandInHandler", (StandInHandler,), {"config": config or StandInConfig()})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Site local imitant vanadia.fr pour tester le bot")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--variant", choices=sorted(MARKUP_VARIANTS), default="classic")
+    parser.add_argument("--latency", type=int, default=0, help="latence ajoutée par requête (ms)")
+    parser.add_argument("--jitter", type=int, default=0, help="latence aléatoire supplémentaire (ms)")
+    parser.add_argument("--no-captcha", action="store_true", help="pas de captcha sur serveur-prive")
+    parser.add_argument("--cooldown", action="store_true", help="afficher un délai après le vote")
+    args = parser.parse_args()
+
+    config = StandInConfig(args.variant, args.latency, args.jitter,
+                           captcha=not args.no_captcha, show_cooldown=args.cooldown)
+    site = StandInSite(config, port=args.port)
+    print(f"Site local sur {site.base_url} (Ctrl+C pour arrêter)")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
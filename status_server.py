@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Point d'accès local de supervision du planificateur
+/metrics au format texte Prometheus, /status en JSON; servi sur la boucle asyncio
+du planificateur, uniquement sur 127.0.0.1 par défaut
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+from proc_stats import tree_usage
+
+DEFAULT_PORT = 9108
+# Bornes (secondes) des histogrammes de durée par phase
+PHASE_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class RunStats:
+    """Compteurs par issue et histogrammes de durée par phase depuis le démarrage du processus"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.runs = {}
+        self.retries = {}
+        self.phases = {}  # phase -> {"buckets": [...], "sum": secondes, "count": n}
+        self.last_record = None
+        self.last_run_at = None
+        self.last_success_at = None
+
+    def observe(self, record):
+        """Prend en compte un enregistrement de RunMetrics.finish()"""
+        if not record:
+            return
+        outcome = record.get("outcome") or "unknown"
+        self.runs[outcome] = self.runs.get(outcome, 0) + 1
+        for phase, attempts in (record.get("attempts") or {}).items():
+            if attempts > 1:
+                self.retries[phase] = self.retries.get(phase, 0) + attempts - 1
+        phases = dict(record.get("phases") or {})
+        phases["total"] = record.get("total_ms") or 0
+        for phase, ms in phases.items():
+            seconds = ms / 1000
+            histogram = self.phases.setdefault(
+                phase, {"buckets": [0] * len(PHASE_BUCKETS), "sum": 0.0, "count": 0}
+            )
+            for index, bound in enumerate(PHASE_BUCKETS):
+                if seconds <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+        self.last_record = record
+        self.last_run_at = time.time()
+        if record.get("success"):
+            self.last_success_at = self.last_run_at
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+class StatusServer:
+    """Serveur HTTP minimal (GET /metrics, GET /status) adossé à un VoteScheduler"""
+
+    def __init__(self, scheduler, host="127.0.0.1", port=DEFAULT_PORT):
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port
+        self.stats = RunStats()
+        self.logger = logging.getLogger(__name__)
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info(f"Supervision sur http://{self.host}:{self.port}/metrics et /status")
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _next_vote_seconds(self):
+        wall_deadline = self.scheduler.wall_deadline
+        if wall_deadline is None:
+            return None
+        return round(max(0.0, wall_deadline - time.time()), 1)
+
+    def render_metrics(self, usage=(0, 0.0)):
+        """Exposition au format texte Prometheus; usage: (RSS, CPU) du navigateur, voir tree_usage"""
+        stats = self.stats
+        rss, cpu = usage
+        lines = [
+            "# HELP vanadia_runs_total Exécutions de vote par issue",
+            "# TYPE vanadia_runs_total counter",
+        ]
+        for outcome, count in sorted(stats.runs.items()):
+            lines.append(f"vanadia_runs_total{_labels(outcome=outcome)} {count}")
+
+        lines += [
+            "# HELP vanadia_step_retries_total Tentatives supplémentaires des étapes reprises",
+            "# TYPE vanadia_step_retries_total counter",
+        ]
+        for phase, count in sorted(stats.retries.items()):
+            lines.append(f"vanadia_step_retries_total{_labels(phase=phase)} {count}")
+
+        lines += [
+            "# HELP vanadia_phase_duration_seconds Durée des phases d'une exécution",
+            "# TYPE vanadia_phase_duration_seconds histogram",
+        ]
+        for phase, histogram in sorted(stats.phases.items()):
+            for bound, count in zip(PHASE_BUCKETS, histogram["buckets"]):
+                lines.append(f"vanadia_phase_duration_seconds_bucket{_labels(phase=phase, le=bound)} {count}")
+            lines.append(f"vanadia_phase_duration_seconds_bucket{_labels(phase=phase, le='+Inf')} {histogram['count']}")
+            lines.append(f"vanadia_phase_duration_seconds_sum{_labels(phase=phase)} {histogram['sum']:.3f}")
+            lines.append(f"vanadia_phase_duration_seconds_count{_labels(phase=phase)} {histogram['count']}")
+
+        gauges = [
+            ("vanadia_next_vote_seconds", "Secondes avant le prochain vote planifié", self._next_vote_seconds()),
+            ("vanadia_voting", "1 pendant une exécution de vote", int(self.scheduler.voting)),
+            ("vanadia_browser_rss_bytes", "Mémoire actuelle des processus du navigateur", rss),
+            ("vanadia_browser_cpu_seconds", "Temps CPU des processus du navigateur encore ouverts", round(cpu, 2)),
+            ("vanadia_last_run_peak_rss_bytes", "Pic de mémoire du navigateur pendant la dernière exécution",
+             int(stats.last_record["peak_rss_mb"] * 1024 * 1024)
+             if stats.last_record and stats.last_record.get("peak_rss_mb") is not None else None),
+            ("vanadia_last_run_timestamp_seconds", "Fin de la dernière exécution (epoch)", stats.last_run_at),
+            ("vanadia_last_success_timestamp_seconds", "Fin du dernier vote réussi (epoch)", stats.last_success_at),
+            ("vanadia_uptime_seconds", "Durée de fonctionnement du planificateur", round(time.time() - stats.started, 1)),
+        ]
+        for name, help_text, value in gauges:
+            if value is None:
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def status(self):
+        """État courant du planificateur pour /status"""
+        scheduler = self.scheduler
+        last = self.stats.last_record
+        return {
+            "voting": scheduler.voting,
+            "daemon": scheduler.daemon,
+            "launch_profile": scheduler.launch_profile,
+            "browser_open": scheduler.session is not None,
+            "last_vote_time": scheduler.last_vote_time.isoformat(timespec="seconds") if scheduler.last_vote_time else None,
+            "next_vote_time": scheduler.next_vote_time.isoformat(timespec="seconds") if scheduler.next_vote_time else None,
+            "next_vote_in_s": self._next_vote_seconds(),
+            "uptime_s": round(time.time() - self.stats.started, 1),
+            "runs": self.stats.runs,
+            "retries": self.stats.retries,
+            "last_run": {
+                key: last.get(key)
+                for key in ("started_at", "ended_at", "outcome", "total_ms", "cooldown_s", "error", "timeout",
+                            "attempts", "peak_rss_mb")
+            } if last else None,
+        }
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Ignorer les en-têtes jusqu'à la ligne vide
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            method, path = (parts[0], parts[1].split("?")[0]) if len(parts) >= 2 else ("", "")
+
+            if method != "GET":
+                status, content_type, body = "405 Method Not Allowed", "text/plain", "GET uniquement\n"
+            elif path == "/metrics":
+                # Parcours des processus hors de la boucle asyncio
+                usage = await asyncio.get_running_loop().run_in_executor(None, tree_usage)
+                status, content_type, body = "200 OK", "text/plain; version=0.0.4", self.render_metrics(usage)
+            elif path in ("/status", "/"):
+                status, content_type = "200 OK", "application/json"
+                body = json.dumps(self.status(), ensure_ascii=False, indent=2)
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", "Routes: /metrics, /status\n"
+
+            data = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        except Exception as e:
+            self.logger.error(f"Erreur supervision: {e}")
+        finally:
+            writer.close()
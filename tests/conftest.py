@@ -0,0 +1,17 @@
+"""Fixtures communes: bot de vote isolé dans un dossier temporaire"""
+
+import pytest
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # logs/ du bot dans le dossier temporaire
+    from vote_bot import VanadiaVoteBot
+
+    bot = VanadiaVoteBot(data_dir=tmp_path / "data")
+    bot.human_delay = 0
+    bot.preflight = False
+    bot.metrics_path = None
+    bot.history = None
+    bot.artifacts = None
+    return bot
@@ -0,0 +1,24 @@
+"""Commande status: vote en cours ou navigateur du planificateur au repos (cli)"""
+
+import os
+
+import cli
+from profile_lock import ProfileLock
+
+
+def status(tmp_path, capsys):
+    cli.main(["--data-dir", str(tmp_path), "status", "--file", os.devnull])
+    return capsys.readouterr().out
+
+
+def test_idle_daemon_is_not_reported_as_voting(tmp_path, capsys):
+    lock = ProfileLock(tmp_path / "browser_profile").acquire()
+    try:
+        assert "Aucun vote en cours (navigateur du planificateur ouvert" in status(tmp_path, capsys)
+        lock.set_running(True)
+        assert f"Vote en cours (PID {os.getpid()})" in status(tmp_path, capsys)
+        lock.set_running(False)
+        assert "Vote en cours" not in status(tmp_path, capsys)
+    finally:
+        lock.release()
+    assert "Aucun vote en cours" in status(tmp_path, capsys)
@@ -0,0 +1,46 @@
+"""Extraction du délai avant le prochain vote (cooldown)"""
+
+from datetime import timedelta
+
+from cooldown import parse_cooldown, parse_vote_cooldown
+
+
+def test_parse_cooldown_formats():
+    assert parse_cooldown("Vous pourrez voter à nouveau dans 1h 23min") == timedelta(hours=1, minutes=23)
+    assert parse_cooldown("Prochain vote dans 00:45:12") == timedelta(minutes=45, seconds=12)
+    assert parse_cooldown("Bienvenue sur Vanadia") is None
+
+
+def test_vote_cooldown_requires_vote_phrasing():
+    assert parse_vote_cooldown("Vous pourrez voter à nouveau dans 1h 30min") == timedelta(hours=1, minutes=30)
+    assert parse_vote_cooldown("Prochain vote dans 01:30") == timedelta(hours=1, minutes=30)
+    # Délais sans rapport avec le vote (événements, maintenance...)
+    assert parse_vote_cooldown("Maintenance prévue dans 2h") is None
+    assert parse_vote_cooldown("Event PvP: encore 45 min pour s'inscrire") is None
+
+
+def test_hours_followed_by_minutes():
+    assert parse_cooldown("Prochain vote dans 1h30") == timedelta(hours=1, minutes=30)
+    assert parse_cooldown("Prochain vote dans 1h30min") == timedelta(hours=1, minutes=30)
+    assert parse_cooldown("Prochain vote dans 1 h 30") == timedelta(hours=1, minutes=30)
+    assert parse_cooldown("Revenez dans 2 min 30 s") == timedelta(minutes=2, seconds=30)
+    # "m" de "mai" n'est pas une unité
+    assert parse_cooldown("Événement dans 30 mai") is None
+
+
+def test_two_part_clock():
+    # Premier champ >= 24: forcément mm:ss
+    assert parse_cooldown("Prochain vote dans 59:59") == timedelta(minutes=59, seconds=59)
+    assert parse_cooldown("Prochain vote dans 01:30") == timedelta(hours=1, minutes=30)
+    # Compte à rebours dédié: toujours mm:ss
+    assert parse_cooldown("01:30", countdown=True) == timedelta(minutes=1, seconds=30)
+
+
+def test_bare_countdowns():
+    assert parse_cooldown("01:23:45", countdown=True) == timedelta(hours=1, minutes=23, seconds=45)
+    assert parse_cooldown("45 min", countdown=True) == timedelta(minutes=45)
+    assert parse_cooldown("1h 23min", countdown=True) == timedelta(hours=1, minutes=23)
+    assert parse_cooldown("1h30", countdown=True) == timedelta(hours=1, minutes=30)
+    # Sans mot-clé hors d'un compte à rebours: pas de délai
+    assert parse_cooldown("01:23:45") is None
+    assert parse_cooldown("Terminé", countdown=True) is None
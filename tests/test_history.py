@@ -0,0 +1,58 @@
+"""Historique SQLite et reprise du planificateur (history, scheduler.restore_state)"""
+
+from datetime import datetime, timedelta
+
+from history import RunHistory, summarize
+from scheduler import COOLDOWN_MARGIN, VoteScheduler
+
+
+def record(ended_at, success=True, outcome="success", cooldown_s=None, captcha=None):
+    return {
+        "started_at": (ended_at - timedelta(seconds=20)).isoformat(timespec="seconds"),
+        "ended_at": ended_at.isoformat(timespec="seconds"),
+        "outcome": outcome,
+        "success": success,
+        "total_ms": 20000,
+        "cooldown_s": cooldown_s,
+        "captcha": captcha,
+        "phases": {"login": 1200},
+        "attempts": {"login": 2},
+    }
+
+
+def test_record_round_trips_through_restore_state(tmp_path):
+    scheduler = VoteScheduler(data_dir=tmp_path)
+    ended = datetime.now().replace(microsecond=0) - timedelta(minutes=10)
+    scheduler.history.add(record(ended, success=False, outcome="already_voted", cooldown_s=3600))
+
+    run = scheduler.history.last_run()
+    assert run["outcome"] == "already_voted" and run["attempts"] == {"login": 2}
+    assert run["captcha"] is None
+
+    resume_at = scheduler.restore_state()
+    assert resume_at == ended + timedelta(seconds=3600 + COOLDOWN_MARGIN)
+
+
+def test_restore_state_after_success(tmp_path):
+    scheduler = VoteScheduler(data_dir=tmp_path)
+    ended = datetime.now().replace(microsecond=0) - timedelta(minutes=10)
+    scheduler.history.add(record(ended))
+    assert scheduler.restore_state() is not None
+    assert scheduler.last_vote_time == ended
+
+
+def test_add_never_raises_when_the_directory_cannot_be_created(tmp_path):
+    blocker = tmp_path / "fichier"
+    blocker.write_text("")
+    # mkdir du dossier parent impossible: OSError avalée, pas d'exception
+    RunHistory(blocker / "history.db").add(record(datetime.now()))
+
+
+def test_captcha_rate_ignores_runs_without_detection(tmp_path):
+    history = RunHistory(tmp_path / "history.db")
+    now = datetime.now()
+    history.add(record(now, captcha=True))
+    history.add(record(now, captcha=False))
+    history.add(record(now, success=False, outcome="error"))
+    stats = summarize(history.runs())
+    assert stats["captcha_runs"] == 2 and stats["captcha_rate"] == 0.5
@@ -0,0 +1,38 @@
+"""Envoi des notifications hors de la boucle asyncio (notifier._run_in_thread)"""
+
+import asyncio
+import threading
+
+from notifier import _run_in_thread
+
+
+def test_result_after_loop_closed_is_dropped(monkeypatch):
+    release, finished = threading.Event(), threading.Event()
+    errors = []
+    monkeypatch.setattr(threading, "excepthook", lambda args: errors.append(args.exc_value))
+
+    def slow():
+        release.wait(5)
+        finished.set()
+        return "ok"
+
+    async def start():
+        _run_in_thread(slow)
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(start())
+    loop.close()
+
+    release.set()
+    assert finished.wait(5)
+    for thread in threading.enumerate():
+        if thread.daemon and thread is not threading.current_thread():
+            thread.join(1)
+    assert errors == []
+
+
+def test_result_reaches_the_loop():
+    async def main():
+        return await _run_in_thread(lambda a, b: a + b, 2, 3)
+
+    assert asyncio.run(main()) == 5
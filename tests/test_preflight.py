@@ -0,0 +1,66 @@
+"""Lecture du délai de vote dans la page récupérée en HTTP (preflight)"""
+
+import asyncio
+from datetime import timedelta
+
+import preflight
+from preflight import AVAILABLE, COOLDOWN, UNKNOWN, _VisibleText
+
+
+def parse(html):
+    parser = _VisibleText()
+    parser.feed(html)
+    return parser
+
+
+def test_scoped_text_keeps_only_vote_containers():
+    parser = parse(
+        '<div class="news">Event PvP: encore 45 min</div>'
+        '<div class="vote-box"><p>Prochain vote dans <b>01:30</b></p><br></div>'
+        '<footer>Maintenance dans 2h</footer>'
+    )
+    assert "Prochain vote dans" in parser.scoped_text
+    assert "45 min" not in parser.scoped_text
+    assert "Maintenance" not in parser.scoped_text
+    assert "Maintenance" in parser.text
+
+
+def test_countdown_attribute_opens_scope():
+    parser = parse('<span data-countdown="120">encore 2 min</span><p>hors zone</p>')
+    assert parser.countdown == 120
+    assert parser.scoped_text.strip() == "encore 2 min"
+
+
+def test_unclosed_tags_do_not_leak_scope():
+    parser = parse('<form><p>Voter<li>encore 3 min</form><div>dans 5 min</div>')
+    assert "encore 3 min" in parser.scoped_text
+    assert "dans 5 min" not in parser.scoped_text
+
+
+def check(monkeypatch, html):
+    monkeypatch.setattr(preflight, "cookie_header", lambda url, path: "session=1")
+    monkeypatch.setattr(preflight, "_fetch", lambda url, headers, timeout: (url, 200, html.encode()))
+    return asyncio.run(preflight.check_vote_status("https://vanadia.fr/vote"))
+
+
+def test_status_from_vote_container(monkeypatch):
+    result = check(monkeypatch, '<div id="vote">Vous pourrez voter à nouveau dans 1h 10min</div>')
+    assert result.status == COOLDOWN
+    assert result.cooldown == timedelta(hours=1, minutes=10)
+
+
+def test_unrelated_delay_is_unknown(monkeypatch):
+    result = check(monkeypatch, '<div class="vote"><button>Voter</button></div><p>Maintenance dans 2h</p>')
+    assert result.status == UNKNOWN
+
+
+def test_vote_page_without_delay_is_available(monkeypatch):
+    assert check(monkeypatch, '<form><button>Voter</button></form>').status == AVAILABLE
+
+
+def test_bare_countdown_and_attribute(monkeypatch):
+    result = check(monkeypatch, '<div class="vote"><span class="countdown">59:59</span></div>')
+    assert result.status == COOLDOWN
+    assert result.cooldown == timedelta(minutes=59, seconds=59)
+    result = check(monkeypatch, '<div data-countdown="300">05:00</div>')
+    assert result.cooldown == timedelta(seconds=300)
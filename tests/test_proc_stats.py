@@ -0,0 +1,40 @@
+"""Mesure des processus du navigateur hors de la boucle asyncio (proc_stats)"""
+
+import asyncio
+import threading
+
+import proc_stats
+from proc_stats import ProcessTreeSampler
+
+
+def test_sampler_scans_processes_off_the_event_loop(monkeypatch):
+    threads = []
+    usage = iter([(100, 1.0), (300, 1.5), (200, 2.5)])
+
+    def fake_tree_usage(pid=None):
+        threads.append(threading.current_thread())
+        return next(usage, (200, 2.5))
+
+    monkeypatch.setattr(proc_stats, "tree_usage", fake_tree_usage)
+
+    async def run():
+        sampler = ProcessTreeSampler(interval=0.01).start()
+        await asyncio.sleep(0.1)
+        return threading.current_thread(), await sampler.stop()
+
+    loop_thread, summary = asyncio.run(run())
+    assert threads and loop_thread not in threads
+    assert summary["cpu_seconds"] == 1.5
+    assert summary["peak_rss_mb"] == round(300 / (1024 * 1024), 1)
+
+
+def test_status_metrics_use_the_given_usage():
+    from status_server import StatusServer
+
+    class Scheduler:
+        wall_deadline = None
+        voting = False
+
+    text = StatusServer(Scheduler()).render_metrics((2048, 1.25))
+    assert "vanadia_browser_rss_bytes 2048" in text
+    assert "vanadia_browser_cpu_seconds 1.25" in text
@@ -0,0 +1,113 @@
+"""Classement des messages et réponses de vote (result_detector)"""
+
+import asyncio
+import json
+
+from result_detector import (
+    OUTCOME_SELECTORS,
+    SEEN_ATTRIBUTE,
+    ResultDetector,
+    classify_message,
+    outcome_from_json,
+)
+from vote_result import ALREADY_VOTED, ERROR, SUCCESS, UNKNOWN
+
+
+class FakeRequest:
+    method = "POST"
+    resource_type = "xhr"
+
+
+class FakeResponse:
+    def __init__(self, data, status=200):
+        self.status = status
+        self.headers = {"content-type": "application/json"}
+        self.request = FakeRequest()
+        self._body = json.dumps(data)
+
+    async def text(self):
+        return self._body
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    async def evaluate_all(self, script):
+        self.page.marked.append(self.selector)
+
+
+class FakePage:
+    def __init__(self):
+        self.marked = []
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+
+def response_outcome(data, status=200):
+    async def run():
+        detector = ResultDetector(FakePage())
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(FakeResponse(data, status))
+        detector._response_task = future
+        return await detector._outcome_from_response()
+
+    return asyncio.run(run())
+
+
+def test_success_message_mentioning_next_vote_is_success():
+    assert classify_message("Vote enregistré ! Prochain vote dans 1h30") == SUCCESS
+    assert classify_message("Merci pour votre vote, vous pourrez voter à nouveau dans 1h30") == SUCCESS
+
+
+def test_already_voted_messages():
+    assert classify_message("Vous avez déjà voté, revenez plus tard") == ALREADY_VOTED
+    assert classify_message("Vous devez attendre 1h 12min avant de voter à nouveau") == ALREADY_VOTED
+
+
+def test_error_and_unknown_messages():
+    assert classify_message("Erreur: captcha invalide") == ERROR
+    assert classify_message("Bienvenue sur Vanadia") == UNKNOWN
+
+
+def test_json_boolean_wins_over_message_text():
+    assert outcome_from_json({"success": True, "message": "Prochain vote dans 1h30"}) == SUCCESS
+    assert outcome_from_json({"success": True, "message": "Vous devez attendre"}) == SUCCESS
+    assert outcome_from_json({"success": False, "message": "Vote enregistré"}) == ERROR
+    assert outcome_from_json({"success": False, "message": "Vous avez déjà voté"}) == ALREADY_VOTED
+    assert outcome_from_json({"message": "Vote validé"}) == SUCCESS
+
+
+def test_response_outcome_uses_json_boolean():
+    assert response_outcome({"success": True, "message": "Prochain vote dans 1h30"}) == SUCCESS
+    assert response_outcome({"success": False, "message": "déjà voté"}) == ALREADY_VOTED
+    assert response_outcome({"message": "rien"}) is None
+    assert response_outcome({}, status=429) == ALREADY_VOTED
+
+
+def test_arm_marks_elements_already_on_the_page():
+    page = FakePage()
+
+    async def run():
+        detector = ResultDetector(page, timeout=10)
+        await detector.arm()
+        detector._response_task.cancel()
+
+    asyncio.run(run())
+    expected = [selector for group in OUTCOME_SELECTORS.values() for selector in group]
+    assert page.marked == expected
+
+
+def test_element_detection_ignores_marked_elements(monkeypatch):
+    seen = {}
+
+    async def fake_first_match(page, selectors, timeout=5000, state="visible"):
+        seen["selectors"] = selectors
+        return object(), selectors[0]
+
+    monkeypatch.setattr("result_detector.first_match", fake_first_match)
+    outcome = asyncio.run(ResultDetector(FakePage())._outcome_from_element())
+    assert outcome == ALREADY_VOTED
+    assert all(selector.endswith(f":not([{SEEN_ATTRIBUTE}])") for selector in seen["selectors"])
@@ -0,0 +1,80 @@
+"""Reprise des étapes sur erreur passagère (retry)"""
+
+import asyncio
+
+import pytest
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+import retry
+from retry import RetryPolicy, is_transient, run_with_retry
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Attentes demandées par run_with_retry, sans attendre réellement"""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(retry.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def test_transient_classification():
+    assert is_transient(PlaywrightTimeoutError("Timeout 30000ms exceeded"))
+    assert is_transient(ConnectionResetError())
+    assert is_transient(PlaywrightError("page.goto: net::ERR_CONNECTION_RESET"))
+    assert not is_transient(PlaywrightError("Element is not attached to the DOM"))
+    assert not is_transient(ValueError("net::ERR_ dans une autre erreur"))
+
+
+def test_exponential_backoff_is_capped():
+    policy = RetryPolicy(attempts=5, backoff=2, factor=2, max_backoff=5, jitter=0)
+    assert [policy.delay(n) for n in (1, 2, 3, 4)] == [2, 4, 5, 5]
+
+
+def test_jitter_stays_in_bounds():
+    policy = RetryPolicy(backoff=10, jitter=0.25)
+    assert all(7.5 <= policy.delay(1) <= 12.5 for _ in range(100))
+
+
+def test_invalid_attempts():
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
+
+
+def test_transient_errors_are_retried_until_success(sleeps):
+    calls, attempts = [], []
+
+    async def attempt():
+        calls.append(1)
+        if len(calls) < 3:
+            raise PlaywrightTimeoutError("Timeout")
+        return "ok"
+
+    policy = RetryPolicy(attempts=3, backoff=1, factor=2, jitter=0)
+    assert asyncio.run(run_with_retry("étape", attempt, policy, on_attempt=attempts.append)) == "ok"
+    assert attempts == [1, 2, 3]
+    assert sleeps == [1, 2]
+
+
+def test_last_error_is_raised_when_attempts_run_out(sleeps):
+    async def attempt():
+        raise ConnectionError("coupure")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run_with_retry("étape", attempt, RetryPolicy(attempts=2, jitter=0)))
+    assert len(sleeps) == 1
+
+
+def test_permanent_errors_are_not_retried(sleeps):
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        raise ValueError("sélecteur introuvable")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run_with_retry("étape", attempt, RetryPolicy(attempts=3)))
+    assert len(calls) == 1 and sleeps == []
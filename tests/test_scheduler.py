@@ -0,0 +1,71 @@
+"""Échéances du planificateur: veille, changement d'heure, reprise (scheduler)"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import scheduler
+from scheduler import VoteScheduler
+
+
+class FakeClock:
+    """Horloges monotone et epoch pilotées par le test; asyncio.sleep fait avancer les deux"""
+
+    def __init__(self):
+        self.monotonic_now = 1000.0
+        self.epoch_now = 1_700_000_000.0
+
+    def monotonic(self):
+        return self.monotonic_now
+
+    def time(self):
+        return self.epoch_now
+
+    async def sleep(self, seconds):
+        self.monotonic_now += seconds
+        self.epoch_now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(scheduler.time, "time", clock.time)
+    monkeypatch.setattr(scheduler.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+@pytest.fixture
+def vote_scheduler(tmp_path):
+    return VoteScheduler(data_dir=tmp_path)
+
+
+def test_dst_change_is_not_a_suspend(clock, vote_scheduler, monkeypatch):
+    vote_scheduler._set_deadline(clock.monotonic() + 3600)
+
+    # Passage à l'heure d'été: l'heure locale avance d'une heure, l'epoch non
+    class SpringForward(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(hours=1)
+
+    monkeypatch.setattr(scheduler, "datetime", SpringForward)
+    assert asyncio.run(vote_scheduler._sleep_until(vote_scheduler.deadline)) is False
+    assert clock.monotonic() == pytest.approx(vote_scheduler.deadline)
+
+
+def test_epoch_jump_is_detected_as_suspend(clock, vote_scheduler):
+    vote_scheduler._set_deadline(clock.monotonic() + 3600)
+    # Veille de deux heures: l'horloge monotone ne l'a pas comptée
+    clock.epoch_now += 7200
+    assert asyncio.run(vote_scheduler._sleep_until(vote_scheduler.deadline)) is True
+
+    vote_scheduler.missed_run_policy = "run_once"
+    assert vote_scheduler._deadline_after_suspend() == clock.monotonic()
+
+
+def test_early_wakeup_realigns_on_epoch(clock, vote_scheduler):
+    vote_scheduler._set_deadline(clock.monotonic() + 3600)
+    clock.epoch_now += 600  # 10 min de veille, échéance pas encore atteinte
+    assert vote_scheduler._deadline_after_suspend() == pytest.approx(clock.monotonic() + 3000)
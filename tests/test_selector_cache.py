@@ -0,0 +1,22 @@
+"""Cache des sélecteurs gagnants: écriture unique par exécution (selector_cache)"""
+
+from selector_cache import SelectorCache
+
+SELECTORS = ["#vote", "button.vote", "text=Voter"]
+
+
+def test_record_stays_in_memory_until_flush(tmp_path):
+    path = tmp_path / "selector_cache.json"
+    cache = SelectorCache(path)
+    key = SelectorCache.key("https://example.test/vote", "vote_button")
+
+    cache.record(key, SELECTORS, "button.vote")
+    cache.record(key, SELECTORS, "button.vote")
+    assert not path.exists()
+
+    assert cache.flush() is True
+    assert cache.flush() is False  # Rien de neuf: pas de réécriture
+
+    reloaded = SelectorCache(path)
+    assert reloaded.ordered(key, SELECTORS)[0] == "button.vote"
+    assert reloaded.entries[key]["hits"] == 1  # Le premier passage apprend, le second touche
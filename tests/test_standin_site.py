@@ -0,0 +1,53 @@
+"""Parcours complet du bot contre le site local (standin_site)"""
+
+import asyncio
+import os
+import urllib.request
+
+import pytest
+
+from standin_site import MARKUP_VARIANTS, StandInConfig, StandInSite
+from vote_result import SUCCESS
+
+
+def chromium_installed():
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return False
+    with sync_playwright() as p:
+        return os.path.exists(p.chromium.executable_path)
+
+
+def post(url):
+    request = urllib.request.Request(url, data=b"", method="POST")
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.geturl(), response.read().decode("utf-8")
+
+
+def test_serveur_prive_vote_redirects_back_with_confirmation():
+    with StandInSite(StandInConfig()) as site:
+        final_url, body = post(f"{site.base_url}/serveur-prive/vote")
+    assert final_url.endswith("/serveur-prive/vote?voted=1")
+    assert "alert-success" in body
+    # Captcha avec une taille réelle, sinon Playwright ne le voit jamais
+    assert 'class="g-recaptcha"' in body and "height:78px" in body
+
+
+@pytest.mark.skipif(not chromium_installed(), reason="Chromium de Playwright non installé")
+@pytest.mark.parametrize("captcha", [True, False], ids=["captcha", "sans-captcha"])
+@pytest.mark.parametrize("variant", sorted(MARKUP_VARIANTS))
+def test_full_run_reaches_success(tmp_path, monkeypatch, variant, captcha):
+    monkeypatch.chdir(tmp_path)  # logs/ du bot dans le dossier temporaire
+    from vote_bot import VanadiaVoteBot
+
+    with StandInSite(StandInConfig(variant, captcha=captcha)) as site:
+        bot = VanadiaVoteBot(base_url=site.base_url, data_dir=tmp_path / "data")
+        bot.human_delay = 0
+        bot.preflight = False
+        bot.metrics_path = None
+        bot.history = None
+        bot.artifacts = None
+        result = asyncio.run(bot.run_vote_process(headless=True))
+
+    assert result.outcome == SUCCESS
@@ -0,0 +1,206 @@
+"""Parcours du bot de vote sur des pages simulées (sans navigateur)"""
+
+import asyncio
+from datetime import timedelta
+
+
+class FakeElement:
+    def __init__(self, text="", attributes=None):
+        self.text = text
+        self.attributes = attributes or {}
+
+    async def inner_text(self):
+        return self.text
+
+    async def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class FakePage:
+    """Page dont query_selector_all renvoie les éléments déclarés par sélecteur"""
+
+    def __init__(self, elements=None, url="about:blank"):
+        self.elements = elements or {}
+        self.url = url
+
+    async def query_selector_all(self, selector):
+        return self.elements.get(selector, [])
+
+
+def test_read_cooldown_from_countdown_attribute(bot):
+    page = FakePage({'[data-countdown]': [FakeElement("05:00", {"data-countdown": "300"})]})
+    assert asyncio.run(bot.read_cooldown(page)) == timedelta(seconds=300)
+
+
+def test_read_cooldown_from_bare_countdown(bot):
+    page = FakePage({'[class*="countdown"]': [FakeElement("59:59")]})
+    assert asyncio.run(bot.read_cooldown(page)) == timedelta(minutes=59, seconds=59)
+
+
+def test_read_cooldown_ignores_unrelated_alerts(bot):
+    page = FakePage({'.alert': [FakeElement("Maintenance dans 2h")]})
+    assert asyncio.run(bot.read_cooldown(page)) is None
+    page = FakePage({'.alert': [FakeElement("Vote enregistré ! Prochain vote dans 1h30")]})
+    assert asyncio.run(bot.read_cooldown(page)) == timedelta(hours=1, minutes=30)
+
+
+class FakePopup:
+    """Onglet serveur-prive.net; le premier chargement peut dépasser son délai"""
+
+    def __init__(self, fail_load=False):
+        self.fail_load = fail_load
+        self.closed = False
+        self.url = "https://serveur-prive.net/vanadia/vote"
+
+    async def wait_for_load_state(self, state="load", timeout=None):
+        if self.fail_load:
+            from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+            raise PlaywrightTimeoutError("Timeout 30000ms exceeded")
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeLink:
+    def __init__(self):
+        self.clicks = 0
+
+    async def inner_text(self):
+        return "Serveur privé"
+
+    async def click(self):
+        self.clicks += 1
+
+
+class FakeContext:
+    def __init__(self, popups):
+        self.popups = list(popups)
+
+    async def wait_for_event(self, event, timeout=None):
+        await asyncio.sleep(0)
+        return self.popups.pop(0)
+
+
+def test_serverprive_retry_closes_the_first_tab(bot, monkeypatch):
+    import retry
+    from retry import RetryPolicy
+
+    link = FakeLink()
+
+    async def find_element(page, role, selectors, timeout=5000):
+        return link, selectors[0]
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(bot, "find_element", find_element)
+    monkeypatch.setattr(retry.asyncio, "sleep", no_sleep)
+    bot.retry_policies["serverprive_popup"] = RetryPolicy(attempts=2, jitter=0)
+
+    first, second = FakePopup(fail_load=True), FakePopup()
+    context = FakeContext([first, second])
+    vanadia_page = FakePage(url="https://vanadia.fr/vote")
+
+    page = asyncio.run(bot.step("serverprive_popup", lambda: bot.open_serverprive(context, vanadia_page)))
+
+    assert page is second
+    assert link.clicks == 2
+    assert first.closed and not second.closed
+
+
+class FakeSession:
+    """BrowserSession du mode démon, sans navigateur"""
+
+    headless = True
+    router = None
+
+    def __init__(self):
+        self.context = object()
+        self.released = self.discarded = False
+
+    async def new_page(self):
+        return FakePage()
+
+    async def release_pages(self):
+        self.released = True
+
+    async def discard(self):
+        self.discarded = True
+
+
+class BrokenArtifacts:
+    async def start_trace(self, context):
+        pass
+
+    async def finish(self, context, result, metrics=None):
+        raise OSError("disque plein")
+
+
+def test_failing_artifacts_do_not_skip_session_cleanup(bot, monkeypatch):
+    from vote_result import VoteResult
+
+    async def vote_flow(context, page, headless):
+        return VoteResult(False)
+
+    monkeypatch.setattr(bot, "vote_flow", vote_flow)
+    bot.artifacts = BrokenArtifacts()
+    session = FakeSession()
+
+    result = asyncio.run(bot.run_vote_in_session(session))
+
+    assert result.success is False
+    assert session.released and not session.discarded
+
+
+def test_preflight_only_run_does_not_report_previous_router_stats(bot, monkeypatch, tmp_path):
+    import json
+
+    class PreviousRouter:
+        stats = {"received_bytes": 123456, "blocked_requests": 42}
+
+    async def preflight_cooldown():
+        return timedelta(minutes=30)
+
+    monkeypatch.setattr(bot, "preflight_cooldown", preflight_cooldown)
+    bot.router = PreviousRouter()
+    bot.metrics_path = tmp_path / "metrics.jsonl"
+
+    result = asyncio.run(bot.run_vote_process())
+
+    assert result.cooldown == timedelta(minutes=30)
+    written = json.loads(bot.metrics_path.read_text(encoding="utf-8"))
+    assert written["received_bytes"] is None and written["blocked_requests"] is None
+
+
+def test_login_reuses_the_form_reached_by_the_session_check(bot, monkeypatch):
+    import retry
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    from retry import RetryPolicy
+
+    page = FakePage()
+    calls = []
+
+    async def check_session(page):
+        page.url = "https://vanadia.fr/auth/login"
+        return False
+
+    async def login(page, on_login_form=False):
+        calls.append(on_login_form)
+        if len(calls) == 1:
+            raise PlaywrightTimeoutError("Timeout 30000ms exceeded")
+        return False
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(bot, "check_session", check_session)
+    monkeypatch.setattr(bot, "login", login)
+    monkeypatch.setattr(bot, "show_notification", lambda *args, **kwargs: None)
+    monkeypatch.setattr(retry.asyncio, "sleep", no_sleep)
+    bot.retry_policies["login"] = RetryPolicy(attempts=2, jitter=0)
+
+    result = asyncio.run(bot.vote_flow(object(), page, headless=True))
+
+    assert not result.success
+    # Pas de second chargement du formulaire; la reprise, elle, repart d'une navigation
+    assert calls == [True, False]
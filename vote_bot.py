@@ -6,40 +6,179 @@ Automatise la navigation jusqu'au captcha, puis notifie l'utilisateur
 
 import asyncio
 import logging
-from datetime import datetime
+from datetime import timedelta
 from pathlib import Path
 import time
-import os
 import random
 
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
-from plyer import notification
 from colorama import init, Fore, Back, Style
 
+from artifacts import FailureArtifacts
+from cooldown import parse_cooldown, parse_vote_cooldown
+from launch_profiles import LAUNCH_PROFILES, USER_AGENT
+from locators import first_match
+from history import RunHistory
+from log_setup import setup_logging
+from metrics import RunMetrics, DEFAULT_METRICS_PATH
+from navigation import NavigationStrategy, navigate
+from preflight import COOLDOWN, check_vote_status
+from notifier import NotificationService
+from proc_stats import ProcessTreeSampler, descendants, kill_processes
+from profile_lock import ProfileLock, ProfileBusy
+from selector_cache import SelectorCache
+from request_router import ResourceRouter
+from result_detector import ResultDetector
+from retry import RetryPolicy, is_transient, run_with_retry
+from vote_result import VoteResult, SUCCESS, ALREADY_VOTED, ERROR, UNKNOWN, TIMEOUT, BUSY
+from readiness import (
+    wait_for_any,
+    wait_for_element,
+    wait_for_element_state,
+    wait_for_load,
+    wait_for_url_matching,
+)
+
 init()
 
+# Scripts injectés dans chaque page pour masquer l'automatisation
+STEALTH_INIT_SCRIPT = """
+    // Masquer webdriver
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+
+    // Masquer les propriétés de détection de bot
+    window.navigator.chrome = {
+        runtime: {}
+    };
+
+    // Override des permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+"""
+
+# Délai global d'une exécution et budget de chaque phase (secondes)
+RUN_TIMEOUT = 300
+PHASE_BUDGETS = {
+    "launch": 45,
+    "session_check": 45,
+    "login": 90,
+    "vote_navigation": 45,
+    "cooldown_check": 15,
+    "serverprive_popup": 45,
+    "captcha_detection": 30,
+    "validation": 45,
+}
+
+# Reprise des étapes sur erreur passagère (réseau, délai Playwright), sur le même navigateur.
+# Chaque tentative dispose du budget complet de sa phase
+RETRY_POLICIES = {
+    "login": RetryPolicy(attempts=2, backoff=5),
+    "vote_navigation": RetryPolicy(attempts=3, backoff=2),
+    "serverprive_popup": RetryPolicy(attempts=2, backoff=3),
+}
+
+
+class PhaseTimeout(Exception):
+    """Une phase a dépassé son budget"""
+
+    def __init__(self, phase, budget):
+        super().__init__(f"phase {phase} bloquée depuis plus de {budget}s")
+        self.phase = phase
+        self.budget = budget
+
+
 class VanadiaVoteBot:
-    def __init__(self):
+    def __init__(self, base_url="https://vanadia.fr", data_dir="data"):
         self.username = "Tenji"
         self.password = "Titi2006_7813"
-        self.base_url = "https://vanadia.fr"
+        self.base_url = base_url
         self.login_url = f"{self.base_url}/auth/login"
         self.vote_url = f"{self.base_url}/vote"
 
-        # Configuration des logs
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
-
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_dir / f"vote_bot_{datetime.now().strftime('%Y%m%d')}.log"),
-                logging.StreamHandler()
-            ]
-        )
+        # Configuration des logs (une seule fois par processus, écriture hors de la boucle asyncio)
+        setup_logging()
         self.logger = logging.getLogger(__name__)
 
+        # Critère de fin de navigation pour chaque étape
+        self.navigation_strategies = {
+            "login": NavigationStrategy("domcontentloaded", selector='input[type="password"]'),
+            "vote": NavigationStrategy("domcontentloaded"),
+            "session": NavigationStrategy("domcontentloaded"),
+        }
+
+        # Blocage des images, polices, médias et traqueurs (les captchas restent autorisés)
+        self.block_resources = True
+        self.router = None
+
+        # Capture HAR (har_capture.HarCapture): enregistrement ou rejeu hors ligne
+        self.har = None
+
+        # Délai global par exécution et budgets par phase (None pour désactiver)
+        self.run_timeout = RUN_TIMEOUT
+        self.phase_budgets = dict(PHASE_BUDGETS)
+        self.retry_policies = dict(RETRY_POLICIES)
+
+        # Profil de lancement de Chromium ("default" ou "lean", voir LAUNCH_PROFILES)
+        self.launch_profile = "default"
+
+        # Profil navigateur et données persistantes
+        self.data_dir = Path(data_dir)
+        self.profile_dir = self.data_dir / "browser_profile"
+        # Une seule instance à la fois sur le profil (exécution manuelle vs planifiée)
+        self.profile_lock = ProfileLock(self.profile_dir)
+
+        # Cookies exportés après chaque session valide: la vérification HTTP préalable
+        # lit le délai sur /vote sans lancer le navigateur (False pour toujours lancer)
+        self.storage_state_path = self.data_dir / "storage_state.json"
+        self.preflight = True
+
+        # Durée de la simulation de comportement humain avant la connexion (secondes)
+        self.human_delay = 10
+
+        # Cache des sélecteurs gagnants (data/selector_cache.json)
+        self.selector_cache = SelectorCache(self.data_dir / "selector_cache.json")
+
+        # Canaux de notification (voir notifier.build_backends: "desktop,bell,file,webhook=url")
+        self.notifier = NotificationService()
+
+        # Mesures de l'exécution en cours (écrites dans logs/metrics.jsonl, None pour désactiver)
+        self.metrics = RunMetrics()
+        self.metrics_path = DEFAULT_METRICS_PATH
+
+        # Capture d'écran, DOM et trace Playwright des exécutions en échec (data/artifacts, None pour désactiver)
+        self.artifacts = FailureArtifacts(self.data_dir / "artifacts")
+
+        # Historique SQLite des exécutions (data/history.db, None pour désactiver)
+        self.history = RunHistory(self.data_dir / "history.db")
+
+    async def phase(self, name, coro):
+        """Exécute une phase mesurée, annulée si elle dépasse son budget"""
+        budget = self.phase_budgets.get(name)
+        with self.metrics.span(name):
+            if not budget:
+                return await coro
+            try:
+                return await asyncio.wait_for(coro, timeout=budget)
+            except asyncio.TimeoutError:
+                self.metrics.record_timeout(name, budget, "phase")
+                raise PhaseTimeout(name, budget) from None
+
+    async def find_element(self, page, role, selectors, timeout=5000):
+        """Cherche un élément en essayant d'abord le dernier sélecteur gagnant pour ce rôle"""
+        key = self.selector_cache.key(page.url, role)
+        ordered = self.selector_cache.ordered(key, selectors)
+        start = time.monotonic()
+        element, selector = await first_match(page, ordered, timeout=timeout)
+        self.metrics.record_selector(role, selector, len(selectors), int((time.monotonic() - start) * 1000))
+        self.selector_cache.record(key, selectors, selector)
+        return element, selector
+
     async def simulate_human_behavior(self, page, duration=10):
         """Simule un comportement humain avec mouvements de souris aléatoires"""
         try:
@@ -50,10 +189,15 @@ class VanadiaVoteBot:
             num_moves = random.randint(5, 10)
             interval = duration / num_moves
 
+            # Bornes de la fenêtre réelle (1024x600 avec le profil lean), marge de 100 px
+            viewport = page.viewport_size or {"width": 1280, "height": 720}
+            max_x = max(viewport["width"] - 100, 100)
+            max_y = max(viewport["height"] - 100, 100)
+
             for i in range(num_moves):
                 # Coordonnées aléatoires dans la fenêtre
-                x = random.randint(100, 1180)
-                y = random.randint(100, 620)
+                x = random.randint(100, max_x)
+                y = random.randint(100, max_y)
 
                 # Déplacer la souris vers ces coordonnées
                 await page.mouse.move(x, y)
@@ -69,39 +213,35 @@ class VanadiaVoteBot:
             # En cas d'erreur, attendre quand même la durée complète
             await asyncio.sleep(duration)
 
+    async def step(self, name, factory):
+        """Phase rejouée sur erreur passagère selon retry_policies (factory crée la coroutine de chaque tentative)"""
+        policy = self.retry_policies.get(name)
+        if policy is None:
+            return await self.phase(name, factory())
+        return await run_with_retry(name, lambda: self.phase(name, factory()), policy,
+                                    on_attempt=lambda number: self.metrics.record_attempt(name, number))
+
     def show_notification(self, title, message, timeout=10):
-        """Affiche une notification système"""
-        try:
-            notification.notify(
-                title=title,
-                message=message,
-                timeout=timeout,
-                app_name="Vanadia Vote Bot"
-            )
-            self.logger.info(f"Notification envoyée: {title} - {message}")
-        except Exception as e:
-            self.logger.error(f"Erreur notification: {e}")
-            # Fallback: affichage console avec couleurs
-            print(f"\n{Back.YELLOW}{Fore.BLACK} 🔔 NOTIFICATION {Style.RESET_ALL}")
-            print(f"{Fore.CYAN}{title}{Style.RESET_ALL}")
-            print(f"{Fore.WHITE}{message}{Style.RESET_ALL}")
-            print(f"{Back.YELLOW}{Fore.BLACK} =============== {Style.RESET_ALL}\n")
+        """Affiche une notification système (envoyée en tâche de fond, sans attendre)"""
+        self.notifier.notify(title, message, timeout)
 
     async def wait_for_user_input(self, message="Appuyez sur Entrée pour continuer..."):
         """Attend une entrée utilisateur de manière asynchrone"""
         return await asyncio.get_event_loop().run_in_executor(None, input, f"{Fore.GREEN}{message}{Style.RESET_ALL}")
 
-    async def login(self, page):
-        """Se connecte au site Vanadia"""
+    async def login(self, page, on_login_form=False):
+        """Se connecte au site Vanadia (on_login_form: la page affiche déjà le formulaire)"""
         try:
-            self.logger.info("Navigation vers la page de connexion...")
-            await page.goto(self.login_url, wait_until="networkidle")
-
-            # Attendre que la page soit chargée
-            await page.wait_for_load_state("domcontentloaded")
+            if on_login_form:
+                self.logger.info("Déjà sur la page de connexion")
+            else:
+                self.logger.info("Navigation vers la page de connexion...")
+                with self.metrics.span("login.navigation"):
+                    await navigate(page, self.login_url, self.navigation_strategies["login"], label="login")
 
             # Simulation de comportement humain pour éviter le captcha invisible
-            await self.simulate_human_behavior(page, duration=10)
+            with self.metrics.span("login.human_delay"):
+                await self.simulate_human_behavior(page, duration=self.human_delay)
 
             # Rechercher les champs de connexion
             username_selectors = [
@@ -123,76 +263,61 @@ class VanadiaVoteBot:
                 '#password'
             ]
 
-            # Trouver le champ utilisateur
-            username_field = None
-            for selector in username_selectors:
-                try:
-                    username_field = await page.wait_for_selector(selector, timeout=2000)
-                    if username_field:
-                        break
-                except:
-                    continue
-
-            if not username_field:
-                raise Exception("Champ nom d'utilisateur non trouvé")
-
-            # Trouver le champ mot de passe
-            password_field = None
-            for selector in password_selectors:
-                try:
-                    password_field = await page.wait_for_selector(selector, timeout=2000)
-                    if password_field:
-                        break
-                except:
-                    continue
-
-            if not password_field:
-                raise Exception("Champ mot de passe non trouvé")
-
-            # Saisir les identifiants
-            self.logger.info("Saisie des identifiants...")
-            await username_field.fill(self.username)
-            await password_field.fill(self.password)
-
-            # Chercher le bouton de soumission
-            submit_selectors = [
-                'button[type="submit"]',
-                'input[type="submit"]',
-                'button:has-text("Connexion")',
-                'button:has-text("Se connecter")',
-                'button:has-text("Login")',
-                '.btn-primary',
-                '.submit-btn'
-            ]
-
-            submit_button = None
-            for selector in submit_selectors:
-                try:
-                    submit_button = await page.wait_for_selector(selector, timeout=2000)
-                    if submit_button:
-                        break
-                except:
-                    continue
-
-            if submit_button:
-                await submit_button.click()
-                self.logger.info("Formulaire de connexion soumis")
-            else:
-                # Essayer d'appuyer sur Entrée
-                await password_field.press("Enter")
-                self.logger.info("Connexion tentée avec Entrée")
+            with self.metrics.span("login.form"):
+                # Trouver le champ utilisateur
+                username_field, username_selector = await self.find_element(page, "username", username_selectors, timeout=5000)
+                if not username_field:
+                    raise Exception("Champ nom d'utilisateur non trouvé")
+                self.logger.debug(f"Champ utilisateur trouvé: {username_selector}")
+
+                # Trouver le champ mot de passe
+                password_field, password_selector = await self.find_element(page, "password", password_selectors, timeout=5000)
+                if not password_field:
+                    raise Exception("Champ mot de passe non trouvé")
+                self.logger.debug(f"Champ mot de passe trouvé: {password_selector}")
+
+                # Saisir les identifiants
+                self.logger.info("Saisie des identifiants...")
+                await username_field.fill(self.username)
+                await password_field.fill(self.password)
+
+                # Chercher le bouton de soumission
+                submit_selectors = [
+                    'button[type="submit"]',
+                    'input[type="submit"]',
+                    'button:has-text("Connexion")',
+                    'button:has-text("Se connecter")',
+                    'button:has-text("Login")',
+                    '.btn-primary',
+                    '.submit-btn'
+                ]
 
-            # Attendre le reCAPTCHA invisible
-            self.logger.info("Attente de la résolution du reCAPTCHA invisible...")
-            await asyncio.sleep(5)  # Délai pour le reCAPTCHA invisible
+                submit_button, _ = await self.find_element(page, "submit", submit_selectors, timeout=2000)
 
-            # Attendre la redirection ou le chargement
-            try:
-                await page.wait_for_load_state("networkidle", timeout=15000)
-            except PlaywrightTimeoutError:
-                self.logger.warning("Timeout lors de l'attente du chargement, on continue...")
+                if submit_button:
+                    await submit_button.click()
+                    self.logger.info("Formulaire de connexion soumis")
+                else:
+                    # Essayer d'appuyer sur Entrée
+                    await password_field.press("Enter")
+                    self.logger.info("Connexion tentée avec Entrée")
+
+            error_selectors = [
+                '.alert-danger',
+                '.error',
+                '.invalid-feedback',
+                '[class*="error"]'
+            ]
 
-            await asyncio.sleep(3)  # Délai supplémentaire pour s'assurer du chargement complet
+            # Attendre le reCAPTCHA invisible puis la redirection, ou un message d'erreur
+            self.logger.info("Attente de la résolution du reCAPTCHA invisible...")
+            with self.metrics.span("login.redirect"):
+                condition, _ = await wait_for_any({
+                    "redirection": wait_for_url_matching(page, lambda url: "login" not in url.lower(), timeout=20000),
+                    "erreur": wait_for_element(page, ", ".join(error_selectors[:3]), timeout=20000),
+                }, timeout=20000)
+            if condition is None:
+                self.logger.warning("Timeout lors de l'attente de la redirection, on continue...")
 
             # Vérifier si la connexion a réussi
             current_url = page.url
@@ -203,13 +328,6 @@ class VanadiaVoteBot:
                 return True
             else:
                 # Vérifier s'il y a des messages d'erreur visibles
-                error_selectors = [
-                    '.alert-danger',
-                    '.error',
-                    '.invalid-feedback',
-                    '[class*="error"]'
-                ]
-
                 error_found = False
                 for selector in error_selectors:
                     try:
@@ -235,20 +353,121 @@ class VanadiaVoteBot:
                     return False
 
         except Exception as e:
+            if is_transient(e):
+                # Erreur réseau ou délai: la politique de reprise décide
+                raise
             self.logger.error(f"Erreur lors de la connexion: {e}")
             return False
 
+    async def check_session(self, page):
+        """Va directement sur /vote et vérifie si la session persistée est encore valide"""
+        authenticated_selectors = [
+            'a[href*="logout"]',
+            'a[href*="deconnexion"]',
+            'form[action*="logout"]',
+            'a[href*="/profile"]'
+        ]
+        anonymous_selectors = [
+            'input[type="password"]',
+            'a[href*="/auth/login"]',
+            'a[href*="/login"]'
+        ]
+
+        try:
+            self.logger.info("Vérification de la session existante...")
+            await navigate(page, self.vote_url, self.navigation_strategies["session"], label="session")
+
+            if "login" in page.url.lower():
+                self.logger.info("Session expirée (redirection vers la connexion)")
+                return False
+
+            async def find(selectors):
+                element, _ = await first_match(page, selectors, timeout=5000, state="attached")
+                return element
+
+            state, _ = await wait_for_any({
+                "connecté": find(authenticated_selectors),
+                "anonyme": find(anonymous_selectors),
+            }, timeout=5000)
+
+            # Un formulaire ou lien de connexion l'emporte sur un marqueur de session
+            # (liens de profil présents dans le menu même sans être connecté)
+            if state == "connecté" and not await page.locator(", ".join(anonymous_selectors)).count():
+                self.logger.info("✅ Session encore valide, connexion inutile")
+                return True
+
+            self.logger.info("Session expirée ou inconnue, connexion nécessaire")
+            return False
+
+        except Exception as e:
+            self.logger.warning(f"Vérification de session impossible: {e}")
+            return False
+
     async def navigate_to_vote(self, page):
         """Navigation vers la page de vote"""
         try:
             self.logger.info("Navigation vers la page de vote...")
-            await page.goto(self.vote_url, wait_until="networkidle")
-            await page.wait_for_load_state("domcontentloaded")
+            await navigate(page, self.vote_url, self.navigation_strategies["vote"], label="vote")
             return True
         except Exception as e:
+            if is_transient(e):
+                raise
             self.logger.error(f"Erreur navigation vers vote: {e}")
             return False
 
+    async def read_cooldown(self, page):
+        """Lit le temps restant avant le prochain vote affiché sur la page (timedelta ou None)"""
+        # Compteurs dédiés au délai: leur texte est lu tel quel, sans mot-clé ("59:59" = mm:ss)
+        countdown_selectors = [
+            '[class*="cooldown"]',
+            '[class*="countdown"]',
+            '[class*="timer"]',
+            '[id*="timer"]',
+        ]
+        # Messages de retour: seulement s'ils parlent du prochain vote
+        feedback_selectors = ['.alert', '.toast', '.swal2-html-container']
+
+        try:
+            # Compte à rebours en secondes dans l'attribut, comme pour la vérification HTTP
+            for element in await page.query_selector_all('[data-countdown]'):
+                value = (await element.get_attribute("data-countdown") or "").strip()
+                if value.isdigit() and int(value) > 0:
+                    return timedelta(seconds=int(value))
+            for selector in countdown_selectors:
+                for element in await page.query_selector_all(selector):
+                    cooldown = parse_cooldown(await element.inner_text(), countdown=True)
+                    if cooldown:
+                        return cooldown
+            for selector in feedback_selectors:
+                for element in await page.query_selector_all(selector):
+                    cooldown = parse_vote_cooldown(await element.inner_text())
+                    if cooldown:
+                        return cooldown
+            return None
+        except Exception as e:
+            self.logger.debug(f"Lecture du délai avant le prochain vote impossible: {e}")
+            return None
+
+    async def build_result(self, page, outcome, success_message, uncertain_success):
+        """Construit le VoteResult d'une issue détectée, avec le délai avant le prochain vote"""
+        cooldown = await self.read_cooldown(page)
+
+        if outcome == SUCCESS:
+            self.logger.info("✅ Vote réussi!")
+            self.show_notification("Vanadia Vote Bot", success_message)
+            return VoteResult(True, cooldown=cooldown, outcome=SUCCESS)
+
+        if outcome == ALREADY_VOTED:
+            self.logger.info("Vote déjà effectué pour cette période")
+            return VoteResult(False, cooldown=cooldown, outcome=ALREADY_VOTED)
+
+        if outcome == ERROR:
+            self.logger.error("Le site a signalé une erreur lors du vote")
+            return VoteResult(False, cooldown=cooldown, outcome=ERROR)
+
+        self.logger.info("Vote effectué (vérification incertaine)")
+        return VoteResult(uncertain_success, cooldown=cooldown, outcome=UNKNOWN)
+
     async def detect_captcha_and_notify(self, page):
         """Détecte la présence d'un captcha et notifie l'utilisateur"""
         try:
@@ -265,30 +484,23 @@ class VanadiaVoteBot:
 
             self.logger.info("Recherche de captcha...")
 
-            for selector in captcha_selectors:
-                try:
-                    captcha_element = await page.wait_for_selector(selector, timeout=5000)
-                    if captcha_element:
-                        self.logger.info(f"🤖 Captcha détecté: {selector}")
+            captcha_element, selector = await first_match(page, captcha_selectors, timeout=5000)
+            if captcha_element:
+                self.logger.info(f"🤖 Captcha détecté: {selector}")
 
-                        # Notification
-                        self.show_notification(
-                            "Vanadia Vote Bot",
-                            "Captcha détecté! Veuillez le compléter manuellement.",
-                            timeout=0  # Notification persistante
-                        )
+                # Notification
+                self.show_notification(
+                    "Vanadia Vote Bot",
+                    "Captcha détecté! Veuillez le compléter manuellement.",
+                    timeout=0  # Notification persistante
+                )
 
-                        # Affichage console
-                        print(f"\n{Back.RED}{Fore.WHITE} 🚨 CAPTCHA DÉTECTÉ 🚨 {Style.RESET_ALL}")
-                        print(f"{Fore.YELLOW}Un captcha doit être complété manuellement.{Style.RESET_ALL}")
-                        print(f"{Fore.CYAN}Le navigateur va s'ouvrir en mode visible.{Style.RESET_ALL}")
+                # Affichage console
+                print(f"\n{Back.RED}{Fore.WHITE} 🚨 CAPTCHA DÉTECTÉ 🚨 {Style.RESET_ALL}")
+                print(f"{Fore.YELLOW}Un captcha doit être complété manuellement.{Style.RESET_ALL}")
+                print(f"{Fore.CYAN}Le navigateur va s'ouvrir en mode visible.{Style.RESET_ALL}")
 
-                        return True
-                except PlaywrightTimeoutError:
-                    continue
-                except Exception as e:
-                    self.logger.debug(f"Erreur lors de la recherche de captcha {selector}: {e}")
-                    continue
+                return True
 
             # Vérifier aussi les boutons de vote
             vote_selectors = [
@@ -300,36 +512,28 @@ class VanadiaVoteBot:
                 'a[href*="vote"]'
             ]
 
-            for selector in vote_selectors:
+            vote_element, selector = await first_match(page, vote_selectors, timeout=3000)
+            if vote_element:
+                self.logger.info(f"Bouton de vote trouvé: {selector}")
+
                 try:
-                    vote_element = await page.wait_for_selector(selector, timeout=3000)
-                    if vote_element:
-                        self.logger.info(f"Bouton de vote trouvé: {selector}")
-
-                        # Essayer de cliquer
-                        await vote_element.click()
-                        await asyncio.sleep(3)  # Attendre que le captcha apparaisse
-
-                        # Revérifier les captchas après le clic
-                        for captcha_selector in captcha_selectors:
-                            try:
-                                captcha_after_click = await page.wait_for_selector(captcha_selector, timeout=5000)
-                                if captcha_after_click:
-                                    self.logger.info("🤖 Captcha apparu après clic sur vote")
-
-                                    self.show_notification(
-                                        "Vanadia Vote Bot",
-                                        "Captcha apparu! Veuillez le compléter manuellement.",
-                                        timeout=0
-                                    )
-
-                                    return True
-                            except:
-                                continue
-
-                        break
-                except:
-                    continue
+                    # Essayer de cliquer
+                    await vote_element.click()
+
+                    # Revérifier les captchas après le clic (attente de leur apparition)
+                    captcha_after_click, _ = await first_match(page, captcha_selectors, timeout=8000)
+                    if captcha_after_click:
+                        self.logger.info("🤖 Captcha apparu après clic sur vote")
+
+                        self.show_notification(
+                            "Vanadia Vote Bot",
+                            "Captcha apparu! Veuillez le compléter manuellement.",
+                            timeout=0
+                        )
+
+                        return True
+                except Exception as e:
+                    self.logger.debug(f"Erreur avec le bouton de vote {selector}: {e}")
 
             self.logger.info("Aucun captcha détecté pour l'instant")
             return False
@@ -338,262 +542,465 @@ class VanadiaVoteBot:
             self.logger.error(f"Erreur lors de la détection de captcha: {e}")
             return False
 
-    async def run_vote_process(self, headless=True):
-        """Exécute le processus de vote complet"""
+    async def launch_context(self, playwright, headless=True):
+        """Lance Chromium avec le profil persistant et la configuration anti-détection"""
+        # Créer un dossier pour le profil utilisateur
+        user_data_dir = self.profile_dir
+        user_data_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.launch_profile not in LAUNCH_PROFILES:
+            raise ValueError(f"Profil de lancement inconnu: {self.launch_profile} (attendu: {', '.join(LAUNCH_PROFILES)})")
+        profile = LAUNCH_PROFILES[self.launch_profile]
+        self.logger.info(f"Profil de lancement: {self.launch_profile}")
+
+        # Lancement du navigateur avec profil persistant et configuration anti-détection
+        return await playwright.chromium.launch_persistent_context(
+            str(user_data_dir),
+            headless=headless,
+            args=profile["args"],
+            viewport=profile["viewport"],
+            user_agent=USER_AGENT,
+            locale='fr-FR',
+            timezone_id='Europe/Paris',
+            permissions=['geolocation', 'notifications']
+        )
+
+    async def prepare_context(self, context):
+        """Installe le filtrage des requêtes et les scripts de masquage sur un contexte"""
+        # Capture HAR en premier: le filtrage, installé ensuite, passe la main aux requêtes autorisées
+        if self.har is not None:
+            await self.har.install(context)
+            self.logger.info(self.har.describe())
+
+        # Filtrage des requêtes inutiles pour alléger le chargement
+        self.router = None
+        if self.block_resources:
+            self.router = ResourceRouter()
+            await self.router.install(context)
+
+        # Injecter des scripts pour masquer l'automatisation (toutes les pages du contexte)
+        await context.add_init_script(STEALTH_INIT_SCRIPT)
+
+    async def run_vote_process(self, headless=True, session=None):
+        """Exécute le processus de vote complet et renvoie un VoteResult (succès, délai avant le prochain vote)"""
+        self.metrics = RunMetrics()
+        self.metrics.launch_profile = self.launch_profile
+        # Filtrage de l'exécution précédente: ses octets ne doivent pas être attribués à celle-ci
+        self.router = None
+        # Pic de mémoire et CPU de l'arbre de processus du navigateur pendant l'exécution
+        sampler = ProcessTreeSampler().start()
+        result = VoteResult(False)
+        # Vu par `vanadia status`: le verrou du profil seul ne dit pas si un vote est en cours
+        self.profile_lock.set_running(True)
+        try:
+            cooldown = await self.preflight_cooldown()
+            if cooldown:
+                result = VoteResult(False, cooldown=cooldown, outcome=ALREADY_VOTED)
+                return result
+
+            if session is not None:
+                run = self.run_vote_in_session(session)
+            else:
+                run = self.run_vote_in_new_browser(headless)
+            try:
+                # L'annulation déclenche la fermeture du navigateur dans les étapes appelées
+                result = await asyncio.wait_for(run, timeout=self.run_timeout)
+            except asyncio.TimeoutError as e:
+                phase = self.metrics.cancelled_phase
+                self.metrics.record_timeout(phase, self.run_timeout, "run")
+                self.metrics.record_error(e)
+                self.logger.error(f"Délai global de {self.run_timeout}s dépassé (phase en cours: {phase}), exécution annulée")
+                result = VoteResult(False, outcome=TIMEOUT)
+                if session is not None:
+                    await session.discard()
+            return result
+        finally:
+            self.profile_lock.set_running(False)
+            self.metrics.browser = await sampler.stop()
+            # Sélecteurs appris pendant l'exécution: une seule écriture, hors de la boucle asyncio
+            await asyncio.get_running_loop().run_in_executor(None, self.selector_cache.flush)
+            self.metrics.finish(result, self.router.stats if self.router else None)
+            if self.metrics_path:
+                await asyncio.get_running_loop().run_in_executor(None, self.metrics.write, self.metrics_path)
+            if self.history is not None:
+                # Écriture SQLite (jusqu'à 5 s si la base est verrouillée) hors de la boucle asyncio
+                await asyncio.get_running_loop().run_in_executor(None, self.history.add, self.metrics.record)
+
+    async def preflight_cooldown(self):
+        """Délai restant lu par une simple requête HTTP (None: lancer le navigateur)"""
+        # En rejeu HAR, le site réel ne doit pas être contacté
+        if not self.preflight or self.har is not None:
+            return None
+        with self.metrics.span("preflight"):
+            check = await check_vote_status(self.vote_url, self.storage_state_path, user_agent=USER_AGENT)
+        self.metrics.preflight = check.status
+        self.logger.info(f"Vérification HTTP: {check.status} ({check.elapsed_ms} ms, {check.size} octets)")
+        if check.status != COOLDOWN:
+            return None
+        self.logger.info(f"Vote pas encore disponible, prochain vote possible dans {check.cooldown} (sans navigateur)")
+        print(f"{Fore.YELLOW}⏳ Vote pas encore disponible (encore {check.cooldown}), navigateur non lancé{Style.RESET_ALL}")
+        return check.cooldown
+
+    async def save_storage_state(self, context):
+        """Exporte les cookies de la session pour la vérification HTTP préalable"""
+        if not self.preflight:
+            return
+        try:
+            self.storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.wait_for(context.storage_state(path=str(self.storage_state_path)), timeout=10)
+        except Exception as e:
+            self.logger.warning(f"Impossible d'exporter les cookies: {e}")
+
+    async def run_vote_in_new_browser(self, headless):
+        """Lance un navigateur dédié à ce vote et le ferme à la fin"""
+        try:
+            self.profile_lock.acquire()
+        except ProfileBusy as e:
+            return self.busy_result(e)
+
         try:
             async with async_playwright() as p:
-                # Créer un dossier pour le profil utilisateur
-                user_data_dir = Path("data/browser_profile")
-                user_data_dir.mkdir(parents=True, exist_ok=True)
-
-                # Lancement du navigateur avec profil persistant et configuration anti-détection
-                context = await p.chromium.launch_persistent_context(
-                    str(user_data_dir),
-                    headless=headless,
-                    args=[
-                        '--no-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-blink-features=AutomationControlled',
-                        '--disable-web-security',
-                        '--disable-features=IsolateOrigins,site-per-process',
-                        '--disable-setuid-sandbox'
-                    ],
-                    viewport={'width': 1280, 'height': 720},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-                    locale='fr-FR',
-                    timezone_id='Europe/Paris',
-                    permissions=['geolocation', 'notifications']
-                )
+                # Processus déjà présents (dont le pilote Playwright): les nouveaux seront ceux de Chromium
+                existing_pids = set(descendants())
+                context = None
+                result = None
+                try:
+                    context = await self.phase("launch", self.launch_context(p, headless=headless))
+                    with self.metrics.span("launch"):
+                        await self.prepare_context(context)
+                    if self.artifacts is not None:
+                        await self.artifacts.start_trace(context)
 
-                page = context.pages[0]  # Utiliser la page déjà ouverte
-                captcha_detected = False  # Initialisation de la variable
-
-                # Injecter des scripts pour masquer l'automatisation
-                await page.add_init_script("""
-                    // Masquer webdriver
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    });
-
-                    // Masquer les propriétés de détection de bot
-                    window.navigator.chrome = {
-                        runtime: {}
-                    };
-
-                    // Override des permissions
-                    const originalQuery = window.navigator.permissions.query;
-                    window.navigator.permissions.query = (parameters) => (
-                        parameters.name === 'notifications' ?
-                            Promise.resolve({ state: Notification.permission }) :
-                            originalQuery(parameters)
-                    );
-                """)
+                    # Utiliser la page déjà ouverte
+                    page = context.pages[0] if context.pages else await context.new_page()
 
+                    result = await self.vote_flow(context, page, headless)
+                    return result
+                finally:
+                    try:
+                        if context is not None:
+                            await self.finish_artifacts(context, result)
+                    finally:
+                        # Toujours fermer à la fin, même après annulation ou lancement bloqué
+                        browser_pids = [pid for pid in descendants() if pid not in existing_pids]
+                        await self.close_context(context, browser_pids)
+
+        except PhaseTimeout as e:
+            self.logger.error(f"Exécution interrompue: {e}")
+            self.metrics.record_error(e)
+            return VoteResult(False, outcome=TIMEOUT)
+
+        except Exception as e:
+            self.logger.error(f"Erreur critique: {e}")
+            self.metrics.record_error(e)
+            return VoteResult(False)
+
+        finally:
+            self.profile_lock.release()
+
+    def busy_result(self, error):
+        """Résultat d'une exécution refusée car le profil est déjà utilisé"""
+        self.logger.warning(f"Vote annulé: {error}")
+        print(f"{Fore.YELLOW}🔒 Une autre instance du bot utilise déjà le navigateur{Style.RESET_ALL}")
+        return VoteResult(False, outcome=BUSY)
+
+    async def close_context(self, context, browser_pids):
+        """Ferme le contexte puis termine les processus Chromium qui auraient survécu"""
+        if context is not None:
+            try:
+                await asyncio.wait_for(context.close(), timeout=10)
+            except Exception as e:
+                self.logger.warning(f"Fermeture du navigateur impossible: {e}")
+
+        killed = await kill_processes(browser_pids)
+        if killed:
+            self.logger.warning(f"{killed} processus du navigateur terminés de force")
+
+    async def run_vote_in_session(self, session):
+        """Exécute le vote dans une page neuve d'un navigateur déjà lancé (mode démon)"""
+        try:
+            page = await self.phase("launch", session.new_page())
+            # Filtrage installé au lancement du navigateur (éventuellement relancé par new_page)
+            self.router = session.router
+        except PhaseTimeout as e:
+            self.logger.error(f"Exécution interrompue: {e}")
+            self.metrics.record_error(e)
+            await session.discard()
+            return VoteResult(False, outcome=TIMEOUT)
+        except ProfileBusy as e:
+            return self.busy_result(e)
+        except Exception as e:
+            self.logger.error(f"Erreur critique: navigateur indisponible: {e}")
+            self.metrics.record_error(e)
+            return VoteResult(False)
+
+        if self.artifacts is not None:
+            await self.artifacts.start_trace(session.context)
+
+        stuck = True
+        result = None
+        try:
+            result = await self.vote_flow(session.context, page, session.headless)
+            stuck = result.outcome == TIMEOUT
+            return result
+        finally:
+            try:
+                await self.finish_artifacts(session.context, result)
+            finally:
+                if stuck:
+                    # Exécution annulée ou page bloquée: navigateur neuf au prochain vote
+                    await session.discard()
+                else:
+                    # Fermer les pages de cette exécution, le navigateur reste ouvert
+                    await session.release_pages()
+
+    async def finish_artifacts(self, context, result):
+        """Traces de fin d'exécution; une erreur ici ne doit jamais empêcher la fermeture du navigateur"""
+        if self.artifacts is None:
+            return
+        try:
+            await self.artifacts.finish(context, result, self.metrics)
+        except Exception as e:
+            self.logger.warning(f"Traces de diagnostic impossibles: {e}")
+
+    async def open_serverprive(self, context, page):
+        """Clique sur le lien serveur-prive.net et renvoie la page où il s'ouvre"""
+        # Chercher le lien serveur-prive.net
+        serverprive_selectors = [
+            'a[href*="serveur-prive.net"]',
+            'a[href*="serveur-prive"]',
+            'a:has-text("Serveur privé")',
+            'a:has-text("serveur-prive")',
+        ]
+
+        link_clicked = False
+        popup = None
+        serverprive_link, selector = await self.find_element(page, "serverprive_link", serverprive_selectors, timeout=10000)
+        if serverprive_link:
+            try:
+                link_text = await serverprive_link.inner_text()
+                self.logger.info(f"Lien serveur-prive.net trouvé: {link_text.strip()}")
+
+                # Attendre un éventuel nouvel onglet (max 5 secondes), écoute armée avant le clic
+                new_page_event = asyncio.ensure_future(context.wait_for_event("page", timeout=5000))
                 try:
-                    # Étape 1: Connexion
-                    login_success = await self.login(page)
-                    if not login_success:
-                        self.show_notification(
-                            "Vanadia Vote Bot - Erreur",
-                            "Échec de la connexion. Vérifiez vos identifiants."
-                        )
-                        return False
+                    await serverprive_link.click()
+                except Exception:
+                    new_page_event.cancel()
+                    raise
+                self.logger.info("Clic effectué sur le lien serveur-prive.net")
 
-                    # Étape 2: Navigation vers vote
-                    nav_success = await self.navigate_to_vote(page)
-                    if not nav_success:
-                        self.show_notification(
-                            "Vanadia Vote Bot - Erreur",
-                            "Impossible d'accéder à la page de vote."
-                        )
-                        return False
-
-                    # Attendre que la page de vote soit complètement chargée
-                    await asyncio.sleep(3)
-                    self.logger.info("Attente pour que la page de vote se charge complètement...")
-
-                    # Sauvegarder la page Vanadia originale
-                    vanadia_page = page
-                    serverprive_page = None
-
-                    # Chercher le lien serveur-prive.net
-                    serverprive_selectors = [
-                        'a[href*="serveur-prive.net"]',
-                        'a[href*="serveur-prive"]',
-                        'a:has-text("Serveur privé")',
-                        'a:has-text("serveur-prive")',
-                    ]
-
-                    link_clicked = False
-                    for selector in serverprive_selectors:
+                try:
+                    popup = page = await new_page_event
+                    self.logger.info("Nouvel onglet détecté, basculement vers celui-ci")
+                except PlaywrightTimeoutError:
+                    # Pas de nouvel onglet, rester sur la page actuelle
+                    self.logger.info("Pas de nouvel onglet, navigation dans la même page")
+                await page.wait_for_load_state("domcontentloaded")
+
+                link_clicked = True
+                # Attendre le chargement complet (borné)
+                await wait_for_load(page, "load", timeout=10000)
+            except Exception as e:
+                if is_transient(e):
+                    # La reprise cliquera de nouveau: fermer cet onglet pour ne pas en ouvrir un second
+                    if popup is not None:
                         try:
-                            serverprive_link = await page.wait_for_selector(selector, timeout=3000)
-                            if serverprive_link:
-                                link_text = await serverprive_link.inner_text()
-                                self.logger.info(f"Lien serveur-prive.net trouvé: {link_text.strip()}")
-
-                                # Vérifier si le lien ouvre un nouvel onglet
-                                target = await serverprive_link.get_attribute("target")
-
-                                # Attendre un éventuel nouvel onglet
-                                async with context.expect_page() as new_page_info:
-                                    await serverprive_link.click()
-                                    self.logger.info("Clic effectué sur le lien serveur-prive.net")
-
-                                    try:
-                                        # Attendre max 5 secondes pour un nouvel onglet
-                                        new_page = await asyncio.wait_for(new_page_info.value, timeout=5.0)
-                                        self.logger.info("Nouvel onglet détecté, basculement vers celui-ci")
-                                        serverprive_page = new_page
-                                        page = new_page
-                                        await page.wait_for_load_state("domcontentloaded")
-                                    except asyncio.TimeoutError:
-                                        # Pas de nouvel onglet, rester sur la page actuelle
-                                        self.logger.info("Pas de nouvel onglet, navigation dans la même page")
-                                        await page.wait_for_load_state("domcontentloaded")
-
-                                link_clicked = True
-                                await asyncio.sleep(3)  # Attendre le chargement complet
-                                break
-                        except Exception as e:
-                            self.logger.debug(f"Erreur avec sélecteur {selector}: {e}")
-                            continue
-
-                    if not link_clicked:
-                        self.logger.warning("Lien serveur-prive.net non trouvé")
-
-                    # Étape 3: Détection captcha
-                    captcha_detected = await self.detect_captcha_and_notify(page)
-
-                    if captcha_detected:
-                        # Captcha détecté sur serveur-prive.net
-                        print(f"\n{Back.BLUE}{Fore.WHITE} 🔄 CAPTCHA DÉTECTÉ - Retour sur Vanadia {Style.RESET_ALL}")
-                        self.logger.info("Captcha détecté sur serveur-prive.net, retour vers Vanadia")
-
-                        # Retourner sur la page Vanadia
-                        await vanadia_page.bring_to_front()
-                        self.logger.info("Retour sur la page Vanadia")
-
-                        # Attendre 5 secondes
-                        print(f"{Fore.CYAN}⏳ Attente de 5 secondes avant validation...{Style.RESET_ALL}")
-                        await asyncio.sleep(5)
-
-                        # Chercher et cliquer sur le bouton "Valider le vote"
-                        validate_selectors = [
-                            'button:has-text("Valider")',
-                            'button:has-text("Valider le vote")',
-                            'button:has-text("Confirmer")',
-                            'button:has-text("Confirmer le vote")',
-                            'input[type="submit"][value*="Valider"]',
-                            'input[type="submit"][value*="Confirmer"]',
-                            '.btn-validate',
-                            '.validate-btn',
-                            '#validate-vote',
-                            'button[type="submit"]'
-                        ]
-
-                        validate_clicked = False
-                        for selector in validate_selectors:
-                            try:
-                                validate_button = await vanadia_page.wait_for_selector(selector, timeout=3000)
-                                if validate_button:
-                                    button_text = await validate_button.inner_text()
-                                    self.logger.info(f"Bouton de validation trouvé: {button_text.strip()}")
-                                    await validate_button.click()
-                                    self.logger.info("✅ Clic effectué sur le bouton de validation")
-                                    print(f"{Fore.GREEN}✅ Vote validé sur Vanadia!{Style.RESET_ALL}")
-                                    validate_clicked = True
-                                    await asyncio.sleep(2)
-                                    break
-                            except:
-                                continue
-
-                        if not validate_clicked:
-                            self.logger.warning("⚠️ Bouton de validation non trouvé sur Vanadia")
-                            print(f"{Fore.YELLOW}⚠️ Bouton de validation non trouvé automatiquement{Style.RESET_ALL}")
-
-                        # Vérifier le succès
-                        await asyncio.sleep(2)
-                        page_content = await vanadia_page.content()
-
-                        if any(keyword in page_content.lower() for keyword in
-                               ['merci', 'vote réussi', 'vote enregistré', 'success', 'validé']):
-                            self.logger.info("✅ Vote réussi!")
-                            self.show_notification(
-                                "Vanadia Vote Bot",
-                                "Vote complété avec succès! ✅"
-                            )
-                            return True
-                        else:
-                            self.logger.info("Vote validé (vérification incertaine)")
-                            return True
-
-                    else:
-                        # Pas de captcha détecté, essayer de voter automatiquement
-                        self.logger.info("Aucun captcha - tentative de vote automatique")
-
-                        # Chercher et cliquer sur les boutons de vote
-                        vote_selectors = [
-                            'button:has-text("Voter")',
-                            '.vote-btn',
-                            '.btn-vote'
-                        ]
-
-                        for selector in vote_selectors:
-                            try:
-                                vote_btn = await page.wait_for_selector(selector, timeout=3000)
-                                if vote_btn:
-                                    await vote_btn.click()
-                                    await asyncio.sleep(3)
-                                    break
-                            except:
-                                continue
-
-                        # Vérifier le succès
-                        page_content = await page.content()
-                        if any(keyword in page_content.lower() for keyword in
-                               ['merci', 'vote réussi', 'vote enregistré', 'success']):
-                            self.logger.info("✅ Vote automatique réussi!")
-                            self.show_notification(
-                                "Vanadia Vote Bot",
-                                "Vote automatique complété! ✅"
-                            )
-                            return True
-
-                        self.logger.info("Vote automatique incertain")
-                        return False
+                            await popup.close()
+                        except Exception as close_error:
+                            self.logger.debug(f"Erreur fermeture de l'onglet serveur-prive.net: {close_error}")
+                    raise
+                self.logger.debug(f"Erreur avec sélecteur {selector}: {e}")
+
+        if not link_clicked:
+            self.logger.warning("Lien serveur-prive.net non trouvé")
+
+        return page
+
+    async def validate_vote(self, vanadia_page):
+        """Clique sur "Valider le vote" côté Vanadia et renvoie l'issue détectée"""
+        # Chercher et cliquer sur le bouton "Valider le vote"
+        validate_selectors = [
+            'button:has-text("Valider")',
+            'button:has-text("Valider le vote")',
+            'button:has-text("Confirmer")',
+            'button:has-text("Confirmer le vote")',
+            'input[type="submit"][value*="Valider"]',
+            'input[type="submit"][value*="Confirmer"]',
+            '.btn-validate',
+            '.validate-btn',
+            '#validate-vote',
+            'button[type="submit"]'
+        ]
+
+        detector = ResultDetector(vanadia_page)
+        validate_clicked = False
+        validate_button, selector = await self.find_element(vanadia_page, "validate_button", validate_selectors, timeout=10000)
+        if validate_button:
+            try:
+                button_text = await validate_button.inner_text()
+                self.logger.info(f"Bouton de validation trouvé: {button_text.strip()}")
+                # Attendre que le bouton soit activable plutôt qu'un délai fixe
+                await wait_for_element_state(validate_button, "enabled", timeout=10000)
+                await detector.arm()
+                await validate_button.click()
+                self.logger.info("✅ Clic effectué sur le bouton de validation")
+                print(f"{Fore.GREEN}✅ Vote validé sur Vanadia!{Style.RESET_ALL}")
+                validate_clicked = True
+            except Exception as e:
+                self.logger.debug(f"Erreur avec sélecteur {selector}: {e}")
+
+        if not validate_clicked:
+            self.logger.warning("⚠️ Bouton de validation non trouvé sur Vanadia")
+            print(f"{Fore.YELLOW}⚠️ Bouton de validation non trouvé automatiquement{Style.RESET_ALL}")
+
+        # Vérifier le résultat (réponse de la soumission ou élément de confirmation)
+        return await detector.wait()
+
+    async def auto_vote(self, page):
+        """Vote sans captcha en cliquant sur le bouton de vote, renvoie l'issue détectée"""
+        # Chercher et cliquer sur les boutons de vote
+        vote_selectors = [
+            'button:has-text("Voter")',
+            '.vote-btn',
+            '.btn-vote'
+        ]
+
+        detector = ResultDetector(page)
+        vote_btn, selector = await self.find_element(page, "vote_button", vote_selectors, timeout=3000)
+        if vote_btn:
+            try:
+                await detector.arm()
+                await vote_btn.click()
+            except Exception as e:
+                self.logger.debug(f"Erreur avec sélecteur {selector}: {e}")
 
-                except Exception as e:
-                    self.logger.error(f"Erreur durant le processus: {e}")
-                    return False
+        # Vérifier le résultat (réponse de la soumission ou élément de confirmation)
+        return await detector.wait()
 
-                finally:
-                    if captcha_detected and not headless:
-                        # Si captcha détecté en mode visible, on laisse le navigateur ouvert plus longtemps
-                        self.logger.info("Fenêtre laissée ouverte pour compléter le captcha...")
-                    else:
-                        await asyncio.sleep(3)  # Court délai avant de fermer
+    async def vote_flow(self, context, page, headless):
+        """Enchaîne connexion, navigation, serveur-prive.net, captcha et validation"""
+        # None tant que la détection du captcha n'a pas eu lieu (pas compté dans le taux de captcha)
+        captcha_detected = None
+        if self.router:
+            self.router.reset_stats()
 
-                    # Toujours fermer à la fin
-                    await context.close()
+        try:
+            # Étape 0: Session persistée encore valide ? (on arrive alors directement sur /vote)
+            session_valid = await self.phase("session_check", self.check_session(page))
+
+            if not session_valid:
+                # Étape 1: Connexion (sans recharger le formulaire si /vote y a déjà redirigé;
+                # une nouvelle tentative repart toujours d'une navigation)
+                on_login_form = "login" in page.url.lower()
+
+                def login_attempt():
+                    nonlocal on_login_form
+                    skip_navigation, on_login_form = on_login_form, False
+                    return self.login(page, on_login_form=skip_navigation)
+
+                login_success = await self.step("login", login_attempt)
+                if not login_success:
+                    self.show_notification(
+                        "Vanadia Vote Bot - Erreur",
+                        "Échec de la connexion. Vérifiez vos identifiants."
+                    )
+                    return VoteResult(False)
+
+                # Étape 2: Navigation vers vote
+                nav_success = await self.step("vote_navigation", lambda: self.navigate_to_vote(page))
+                if not nav_success:
+                    self.show_notification(
+                        "Vanadia Vote Bot - Erreur",
+                        "Impossible d'accéder à la page de vote."
+                    )
+                    return VoteResult(False)
+
+            # Session établie: cookies à jour pour la prochaine vérification HTTP
+            await self.save_storage_state(context)
+
+            # Le site affiche-t-il un délai avant le prochain vote ?
+            cooldown = await self.phase("cooldown_check", self.read_cooldown(page))
+            if cooldown:
+                self.logger.info(f"Vote pas encore disponible, prochain vote possible dans {cooldown}")
+                print(f"{Fore.YELLOW}⏳ Vote pas encore disponible (encore {cooldown}){Style.RESET_ALL}")
+                return VoteResult(False, cooldown=cooldown, outcome=ALREADY_VOTED)
+
+            # Sauvegarder la page Vanadia originale
+            vanadia_page = page
+
+            page = await self.step("serverprive_popup", lambda: self.open_serverprive(context, vanadia_page))
+
+            # Étape 3: Détection captcha
+            captcha_detected = bool(await self.phase("captcha_detection", self.detect_captcha_and_notify(page)))
+
+            if captcha_detected:
+                # Captcha détecté sur serveur-prive.net
+                print(f"\n{Back.BLUE}{Fore.WHITE} 🔄 CAPTCHA DÉTECTÉ - Retour sur Vanadia {Style.RESET_ALL}")
+                self.logger.info("Captcha détecté sur serveur-prive.net, retour vers Vanadia")
+
+                # Retourner sur la page Vanadia
+                await vanadia_page.bring_to_front()
+                self.logger.info("Retour sur la page Vanadia")
+
+                print(f"{Fore.CYAN}⏳ Attente du bouton de validation...{Style.RESET_ALL}")
+
+                outcome = await self.phase("validation", self.validate_vote(vanadia_page))
+                return await self.build_result(
+                    vanadia_page, outcome, "Vote complété avec succès! ✅", uncertain_success=True
+                )
+
+            else:
+                # Pas de captcha détecté, essayer de voter automatiquement
+                self.logger.info("Aucun captcha - tentative de vote automatique")
+
+                outcome = await self.phase("validation", self.auto_vote(page))
+                return await self.build_result(
+                    page, outcome, "Vote automatique complété! ✅", uncertain_success=False
+                )
+
+        except PhaseTimeout as e:
+            self.logger.error(f"Exécution interrompue: {e}")
+            self.metrics.record_error(e)
+            return VoteResult(False, outcome=TIMEOUT)
 
         except Exception as e:
-            self.logger.error(f"Erreur critique: {e}")
-            return False
+            self.logger.error(f"Erreur durant le processus: {e}")
+            self.metrics.record_error(e)
+            return VoteResult(False)
+
+        finally:
+            self.metrics.captcha = captcha_detected
+            if captcha_detected and not headless:
+                # Si captcha détecté en mode visible, on laisse le navigateur ouvert plus longtemps
+                self.logger.info("Fenêtre laissée ouverte pour compléter le captcha...")
+
+            if self.router:
+                self.logger.info(f"Routage: {self.router.summary()}")
 
-    async def main(self, headless=False):
+    async def main(self, headless=False, session=None):
         """Fonction principale"""
+        if session is not None:
+            headless = session.headless
         print(f"{Fore.CYAN}🤖 Vanadia Vote Bot - Démarrage{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}Lancement du processus de vote en mode {'invisible' if headless else 'visible'}...{Style.RESET_ALL}")
 
-        success = await self.run_vote_process(headless=headless)
+        result = await self.run_vote_process(headless=headless, session=session)
+        # Laisser partir les notifications de fin avant la fermeture de la boucle
+        await self.notifier.drain()
+        if self.artifacts is not None:
+            await self.artifacts.drain()
 
-        if success:
+        if result:
             print(f"{Fore.GREEN}✅ Processus terminé avec succès!{Style.RESET_ALL}")
+        elif result.cooldown:
+            print(f"{Fore.YELLOW}⏳ Vote pas encore disponible{Style.RESET_ALL}")
+        elif result.outcome == BUSY:
+            print(f"{Fore.YELLOW}🔒 Vote non lancé: profil déjà utilisé{Style.RESET_ALL}")
         else:
             print(f"{Fore.RED}❌ Erreur durant le processus{Style.RESET_ALL}")
 
-        return success
+        return result
 
 if __name__ == "__main__":
     bot = VanadiaVoteBot()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Résultat d'une exécution du bot de vote Vanadia
+"""
+
+# Issues possibles d'un vote
+SUCCESS = "success"
+ALREADY_VOTED = "already_voted"
+ERROR = "error"
+UNKNOWN = "unknown"
+TIMEOUT = "timeout"  # Budget d'une phase ou délai global dépassé
+BUSY = "busy"  # Profil navigateur déjà utilisé par une autre instance
+
+
+class VoteResult:
+    """Résultat d'un vote, évalué comme un booléen (succès) pour rester compatible"""
+
+    def __init__(self, success, cooldown=None, outcome=None):
+        self.success = bool(success)
+        self.cooldown = cooldown  # timedelta avant le prochain vote possible, si le site l'indique
+        if outcome is None:
+            outcome = SUCCESS if self.success else ERROR
+        self.outcome = outcome
+
+    def __bool__(self):
+        return self.success
+
+    def __repr__(self):
+        return f"VoteResult(success={self.success}, outcome={self.outcome}, cooldown={self.cooldown})"